@@ -1,11 +1,11 @@
 """Export API: email only."""
-import os
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException
 
+from api.services import outbox
 from api.services import storage
-from api.services.email_sender import send_meeting_pdf
+from api.services.email_sender import send_meeting_notes
 
 router = APIRouter(prefix="/export", tags=["export"])
 
@@ -15,17 +15,8 @@ def email_meeting(meeting_id: str):
     meeting = storage.get_meeting(meeting_id)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    pdf_path = meeting.get("pdfPath")
-    if not pdf_path or not os.path.isfile(pdf_path):
-        raise HTTPException(status_code=404, detail="PDF file not found")
     try:
-        send_meeting_pdf(
-            meeting.get("title") or "Meeting Notes",
-            pdf_path,
-            storage.get_setting("email_address") or "",
-            meeting_created_at=meeting.get("createdAt"),
-            meeting_duration=meeting.get("duration"),
-        )
+        send_meeting_notes(meeting, storage.get_setting("email_address") or "")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -33,4 +24,17 @@ def email_meeting(meeting_id: str):
     emailed_at = datetime.now().isoformat()
     storage.update_meeting_emailed(meeting_id, True, emailed_at=emailed_at)
     storage.delete_meeting_files(meeting_id)
+    storage.cancel_meeting_emails(meeting_id)
     return {"status": "sent"}
+
+
+@router.get("/outbox")
+def list_outbox():
+    """Queued and failed outgoing emails."""
+    return {"emails": storage.list_outbox()}
+
+
+@router.post("/outbox/retry")
+def retry_outbox():
+    outbox.retry_now()
+    return {"status": "retrying"}
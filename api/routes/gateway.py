@@ -0,0 +1,96 @@
+"""Gateway API: thin room devices stream audio here over WebSocket (SAFESCRIBE_GATEWAY=1).
+
+    ws /api/gateway/stream?room=Boardroom&samplerate=16000
+      client -> server: binary frames of little-endian int16 mono PCM;
+                        text {"type": "pause" | "resume" | "stop"}
+      server -> client: {"type": "started", "sessionId"}, {"type": "transcript", "text"} (new text only),
+                        {"type": "stopped", "jobId"}, {"type": "error", "detail"}
+
+A connection that drops without "stop" is stopped and processed like a normal meeting.
+"""
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+from api.services import gateway
+
+router = APIRouter(prefix="/gateway", tags=["gateway"])
+
+MIN_SAMPLERATE = 8000
+MAX_SAMPLERATE = 48000
+
+
+@router.get("/sessions")
+def list_sessions():
+    return {"sessions": gateway.list_sessions()}
+
+
+@router.get("/sessions/{session_id}/transcript")
+def get_transcript(session_id: str, after: int | None = None):
+    session = gateway.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if after is None:
+        return {"transcript": gateway.get_transcript(session_id)}
+    segments = gateway.get_segments(session_id, after)
+    return {"segments": segments, "lastSeq": segments[-1]["seq"] if segments else after}
+
+
+@router.websocket("/stream")
+async def stream(websocket: WebSocket, room: str = "", samplerate: int = 16000):
+    await websocket.accept()
+    if not MIN_SAMPLERATE <= samplerate <= MAX_SAMPLERATE:
+        await websocket.send_json({"type": "error", "detail": f"Unsupported samplerate {samplerate}"})
+        await websocket.close(code=1003)
+        return
+    try:
+        session = await run_in_threadpool(gateway.open_session, room, samplerate)
+    except gateway.GatewayUnavailable as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1013)  # try again later
+        return
+
+    # Transcript updates come from the session's transcription thread
+    loop = asyncio.get_running_loop()
+    updates: asyncio.Queue = asyncio.Queue()
+
+    def _on_update(text: str) -> None:
+        loop.call_soon_threadsafe(updates.put_nowait, text)
+
+    async def _forward_updates():
+        while True:
+            await websocket.send_json({"type": "transcript", "text": await updates.get()})
+
+    session.on_transcript_update = _on_update
+    forwarder = asyncio.create_task(_forward_updates())
+    recorder = session.recorder
+    stopped = False
+    try:
+        await websocket.send_json({"type": "started", "sessionId": session.id})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                recorder.feed(message["bytes"])
+                continue
+            command = json.loads(message.get("text") or "{}").get("type")
+            if command == "pause":
+                gateway.set_paused(session.id, True)
+            elif command == "resume":
+                gateway.set_paused(session.id, False)
+            elif command == "stop":
+                job_id = await run_in_threadpool(gateway.close_session, session.id)
+                stopped = True
+                await websocket.send_json({"type": "stopped", "jobId": job_id})
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        forwarder.cancel()
+        session.on_transcript_update = None
+        if not stopped:
+            await run_in_threadpool(gateway.close_session, session.id)
@@ -0,0 +1,39 @@
+"""Processing job API: per-stage timings."""
+from fastapi import APIRouter, HTTPException
+
+from api.services import storage
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}/timings")
+def job_timings(job_id: str):
+    """Stage spans for a job (job id from /recording/stop, or the meeting id it produced).
+
+    stages sums durationMs per span name; spans nest (e.g. llm.* inside summarize inside job.total).
+    """
+    spans = storage.get_job_spans(job_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="No timings for this job")
+    origin = spans[0]["startedAt"]
+    stages: dict = {}
+    for sp in spans:
+        stage = stages.setdefault(sp["name"], {"count": 0, "totalMs": 0.0})
+        stage["count"] += 1
+        stage["totalMs"] = round(stage["totalMs"] + sp["durationMs"], 1)
+    total = next((sp["durationMs"] for sp in spans if sp["name"] == "job.total"), None)
+    return {
+        "jobId": spans[0]["jobId"],
+        "meetingId": next((sp["meetingId"] for sp in spans if sp["meetingId"]), None),
+        "totalMs": total,
+        "stages": stages,
+        "spans": [
+            {
+                "name": sp["name"],
+                "offsetMs": round((sp["startedAt"] - origin) * 1000, 1),
+                "durationMs": sp["durationMs"],
+                "attrs": sp["attrs"],
+            }
+            for sp in spans
+        ],
+    }
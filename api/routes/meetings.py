@@ -1,11 +1,17 @@
 """Meetings API."""
 from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
 
+from api.routes.recording import recorder_service
 from api.services import storage
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
 
+class ActionItemBody(BaseModel):
+    done: bool
+
+
 @router.get("")
 def list_meetings():
     meetings = storage.list_meetings()
@@ -14,17 +20,74 @@ def list_meetings():
     merged = list(jobs) + meetings
     merged.sort(key=lambda m: m["createdAt"], reverse=True)
     stats = storage.get_storage_stats()
-    return {"meetings": merged, "storageUsedMB": stats["usedMB"], "storageTotalMB": stats["totalMB"]}
+    return {
+        "meetings": merged,
+        "storageUsedMB": stats["usedMB"],
+        "storageTotalMB": stats["totalMB"],
+        "storageFreeMB": stats["freeMB"],
+    }
+
+
+@router.get("/stats/weekly")
+def weekly_stats(weeks: int = 12):
+    return {"weeks": storage.get_weekly_stats(weeks)}
+
+
+@router.get("/action-items/open")
+def open_action_items(days: int | None = None):
+    return {"actionItems": storage.list_open_action_items(days)}
+
+
+@router.patch("/action-items/{item_id}")
+def update_action_item(item_id: int, body: ActionItemBody):
+    if not storage.update_action_item_done(item_id, body.done):
+        raise HTTPException(status_code=404, detail="Action item not found")
+    return {"status": "updated"}
 
 
 @router.get("/{meeting_id}")
-def get_meeting(meeting_id: str):
-    meeting = storage.get_meeting(meeting_id)
+def get_meeting(meeting_id: str, transcript: bool = False):
+    meeting = storage.get_meeting(meeting_id, include_transcript=transcript)
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
     return meeting
 
 
+@router.get("/{meeting_id}/transcript")
+def get_transcript_range(meeting_id: str, start: float | None = None, end: float | None = None):
+    """Timed transcript segments (with word timestamps when kept) overlapping [start, end) seconds
+    of the recording; the whole meeting without bounds."""
+    segments = storage.get_meeting_timeline(meeting_id, start, end)
+    if segments is None:
+        if not storage.get_meeting(meeting_id):
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        raise HTTPException(status_code=404, detail="No timestamps stored for this meeting.")
+    return {
+        "segments": segments,
+        "text": " ".join(seg["text"] for seg in segments if seg["text"]),
+    }
+
+
+@router.post("/{meeting_id}/retranscribe")
+def retranscribe_meeting(meeting_id: str):
+    """Re-run transcription over the meeting's stored recording (batched; replaces the transcript).
+
+    409 once the recording is gone: it is deleted with the meeting's other files when the notes
+    are emailed, or by the retention sweep.
+    """
+    meeting = storage.get_meeting(meeting_id)
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    try:
+        job_id = recorder_service.retranscribe(meeting_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e) or "Whisper model unavailable")
+    if not job_id:
+        reason = "was deleted once the notes were emailed" if meeting.get("emailed") else "is no longer kept"
+        raise HTTPException(status_code=409, detail=f"The recording of this meeting {reason}.")
+    return {"jobId": job_id}
+
+
 @router.delete("/{meeting_id}")
 def delete_meeting(meeting_id: str):
     if not storage.delete_meeting(meeting_id):
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, HTTPException, Body
 from pydantic import BaseModel
 
-from api.services.recorder_service import RecorderService
+from api.services.recorder_service import RecorderService, RecordingStateError
 
 router = APIRouter(prefix="/recording", tags=["recording"])
 recorder_service = RecorderService()
@@ -14,19 +14,16 @@ class StopRecordingBody(BaseModel):
 
 @router.post("/start")
 def start_recording():
-    if recorder_service.state == "RECORDING":
-        raise HTTPException(status_code=400, detail="Already recording")
-    if recorder_service.state == "PAUSED":
-        raise HTTPException(status_code=400, detail="Already recording")
     try:
-        recorder_service.start_recording()
+        session = recorder_service.start_recording()
+    except RecordingStateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        recorder_service.abort_recording()
         raise HTTPException(
             status_code=500,
             detail=str(e) or "Failed to start recording. Check audio device and Whisper model."
         )
-    return {"status": "recording"}
+    return {"status": "recording", "sessionId": session.id}
 
 
 @router.post("/abort")
@@ -52,11 +49,11 @@ def resume_recording():
 def stop_recording(body: StopRecordingBody = Body(default_factory=StopRecordingBody)):
     import time
     start_time = body.start_time if body else None
-    if recorder_service.state not in ("RECORDING", "PAUSED"):
-        raise HTTPException(status_code=400, detail="Not recording")
     duration_seconds = max(1, int((time.time() * 1000 - start_time) / 1000)) if start_time else 60
     try:
         meeting_id = recorder_service.stop_recording(duration_seconds)
+    except RecordingStateError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -68,10 +65,21 @@ def stop_recording(body: StopRecordingBody = Body(default_factory=StopRecordingB
 
 
 @router.get("/transcript")
-def get_transcript():
-    return {"transcript": recorder_service.get_live_transcript()}
+def get_transcript(after: int | None = None):
+    """Whole live transcript, or with ?after=N only segments with seq > N (poll with the last seq seen)."""
+    if after is None:
+        return {"transcript": recorder_service.get_live_transcript()}
+    segments = recorder_service.get_live_segments(after)
+    return {"segments": segments, "lastSeq": segments[-1]["seq"] if segments else after}
 
 
 @router.get("/status")
 def get_status():
-    return {"state": recorder_service.state}
+    """State plus lagSeconds (recorded audio not yet transcribed), rtf and degradation level."""
+    return recorder_service.get_status()
+
+
+@router.get("/sessions")
+def list_sessions():
+    """Sessions still recording or being processed (a stopped meeting is processed in background)."""
+    return {"sessions": recorder_service.list_sessions()}
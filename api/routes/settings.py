@@ -1,11 +1,12 @@
 """Settings API."""
 from fastapi import APIRouter, HTTPException, Body
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from api.services import outbox
+from api.services import retention
 from api.services import storage
 from api.services import wifi as wifi_service
 from api.services import email_sender
-from config import DB_PATH
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
@@ -24,14 +25,28 @@ class SetupCompleteBody(BaseModel):
     complete: bool = True
 
 
+class EmailFormatBody(BaseModel):
+    format: str
+
+
+class EmailDigestBody(BaseModel):
+    minutes: int = Field(ge=0)
+
+
+class RetentionBody(BaseModel):
+    max_age_days: int | None = Field(default=None, ge=1)
+    max_mb: float | None = Field(default=None, gt=0)
+    emailed_metadata_only: bool = False
+
+
 @router.get("/wifi/status")
 def wifi_status():
-    return wifi_service.wifi_status()
+    return wifi_service.cached_status()
 
 
 @router.get("/wifi/scan")
 def wifi_scan():
-    return {"networks": wifi_service.wifi_scan()}
+    return {"networks": wifi_service.cached_scan()}
 
 
 @router.post("/wifi/connect")
@@ -39,6 +54,8 @@ def wifi_connect(body: WifiConnectBody):
     ok, message = wifi_service.wifi_connect(body.ssid, body.password or "")
     if not ok:
         raise HTTPException(status_code=400, detail=message)
+    wifi_service.refresh_status()  # status listeners (e.g. outbox retry) fire on the change
+    wifi_service.request_scan()
     return {"status": "connected", "message": message}
 
 
@@ -49,6 +66,9 @@ def get_settings():
         "emailConfigured": bool(email),
         "emailAddress": email,
         "setupComplete": storage.get_setting("setup_complete") == "true",
+        "emailFormat": email_sender.get_email_format(),
+        "emailDigestMinutes": outbox.get_digest_minutes(),
+        "retention": retention.get_policy(),
     }
 
 
@@ -60,9 +80,26 @@ def save_email(data: EmailSettings):
     storage.set_setting("email_address", data.email.strip().lower())
     storage.set_setting("email_password", data.password)
     storage.set_setting("setup_complete", "true")
+    outbox.retry_now()
     return {"status": "saved"}
 
 
+@router.post("/email-format")
+def set_email_format(body: EmailFormatBody):
+    """pdf: notes attached as PDF; inline: notes in the email body, no PDF rendered; both."""
+    if body.format not in email_sender.EMAIL_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {', '.join(email_sender.EMAIL_FORMATS)}")
+    storage.set_setting("email_format", body.format)
+    return {"status": "saved", "emailFormat": body.format}
+
+
+@router.post("/email-digest")
+def set_email_digest(body: EmailDigestBody):
+    """Batch meeting emails into one digest per interval; 0 sends each meeting on its own."""
+    outbox.set_digest_minutes(body.minutes)
+    return {"status": "saved", "emailDigestMinutes": body.minutes}
+
+
 @router.post("/setup-complete")
 def set_setup_complete(body: SetupCompleteBody | None = Body(default=None)):
     complete = body.complete if body else True
@@ -70,14 +107,30 @@ def set_setup_complete(body: SetupCompleteBody | None = Body(default=None)):
     return {"status": "updated"}
 
 
+@router.get("/retention")
+def get_retention():
+    return retention.get_policy()
+
+
+@router.put("/retention")
+def set_retention(body: RetentionBody):
+    policy = retention.set_policy(body.max_age_days, body.max_mb, body.emailed_metadata_only)
+    return {"status": "updated", "retention": policy}
+
+
+@router.post("/retention/sweep")
+def run_retention_sweep():
+    """Apply the retention policy now instead of waiting for the background sweeper."""
+    return retention.sweep()
+
+
+@router.post("/storage/compact")
+def compact_storage():
+    """Compress leftover transcripts and VACUUM the database to reclaim space."""
+    return storage.compact_db()
+
+
 @router.post("/factory-reset")
 def factory_reset():
-    import sqlite3
-    conn = sqlite3.connect(DB_PATH)
-    try:
-        conn.execute("DELETE FROM meetings")
-        conn.execute("DELETE FROM settings")
-        conn.commit()
-    finally:
-        conn.close()
+    storage.factory_reset()
     return {"status": "reset"}
@@ -4,8 +4,15 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
-from api.routes import recording, meetings, export, settings, auth
+import renderer
+import tracing
+from config import GATEWAY_ENABLED, METRICS_ENABLED
+from api.routes import recording, meetings, export, settings, auth, jobs
+from api.services import outbox, readiness, retention, storage, wifi
+
+_FRONTEND_BUILD = Path(__file__).resolve().parent.parent / "frontend" / "build"
 
 app = FastAPI(
     title="SafeScribe API",
@@ -26,26 +33,89 @@ app.include_router(meetings.router, prefix="/api")
 app.include_router(export.router, prefix="/api")
 app.include_router(settings.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+if GATEWAY_ENABLED:
+    from api.routes import gateway as gateway_routes
+    app.include_router(gateway_routes.router, prefix="/api")
+
+# Finished jobs' timing spans go to SQLite (GET /api/jobs/{id}/timings)
+tracing.set_sink(lambda trace: storage.save_job_spans(trace.job_id, trace.meeting_id, trace.spans))
+
+
+@app.on_event("startup")
+def startup_readiness_probes():
+    """Report ui/db/audio/ollama state on /ready while heavy components load."""
+    readiness.start_probes(_FRONTEND_BUILD)
 
 
 @app.on_event("startup")
 def startup_preload_whisper():
-    """Preload Whisper in background so Start Listening is responsive on first click."""
+    """Preload Whisper, then the PDF render worker, then recover recordings interrupted by a
+    crash, in background so the UI is served first.
+
+    Staged one after the other so the Pi isn't loading both while the kiosk boots.
+    """
     def _preload():
         try:
             recording.recorder_service.preload_whisper()
         except Exception:
             pass  # Will load on first start_recording if preload fails
+        if GATEWAY_ENABLED:
+            from api.services import gateway
+            gateway.attach(recording.recorder_service)  # room devices share this model
+        try:
+            renderer.start_worker()
+        except Exception:
+            pass  # render_pdf_in_worker starts it, or renders in-process if it cannot
+        if recording.recorder_service.stt is not None:
+            recording.recorder_service.recover_interrupted()
 
     threading.Thread(target=_preload, daemon=True).start()
 
 
+@app.on_event("startup")
+def startup_storage_stats():
+    """Keep storage stats cached so /api/meetings never stats the filesystem in-request."""
+    storage.start_storage_stats_refresher()
+
+
+@app.on_event("startup")
+def startup_retention_sweeper():
+    """Apply the retention policy periodically so shared-room devices don't fill up."""
+    retention.start_sweeper()
+
+
+@app.on_event("startup")
+def startup_outbox_sender():
+    """Deliver queued emails in the background, retrying with backoff while offline."""
+    outbox.start_sender()
+
+
+@app.on_event("startup")
+def startup_network_monitor():
+    """Serve Wi-Fi status/scans from a cache; retry queued emails when the connection comes back."""
+    wifi.add_status_listener(lambda status: outbox.retry_now() if status["connected"] else None)
+    wifi.start_monitor()
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
-_FRONTEND_BUILD = Path(__file__).resolve().parent.parent / "frontend" / "build"
+@app.get("/ready")
+def ready():
+    """Per-component readiness: ui, db, whisper, ollama, audio (pending/loading/ready/error/unavailable)."""
+    return readiness.snapshot()
+
+
+if METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def metrics():
+        """Stage duration histograms since startup, for a Prometheus scraper on the LAN."""
+        return tracing.prometheus_text()
+
+
 if _FRONTEND_BUILD.exists():
     from fastapi.staticfiles import StaticFiles
     app.mount("/", StaticFiles(directory=str(_FRONTEND_BUILD), html=True), name="frontend")
@@ -1,14 +1,28 @@
 """Email sending via SMTP - meeting PDFs. Use your email + 16-char app password."""
+import base64
 import os
 import smtplib
+import tempfile
+import time
+import uuid
+from email.header import Header
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
+from email.utils import formatdate, make_msgid
+from typing import Callable
 
-from config import SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_APP_PASSWORD, SMTP_FROM
+import renderer
+from config import SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_APP_PASSWORD, SMTP_FROM, EMAIL_MAX_ATTACHMENT_MB
 
 from api.services import storage
 
+SMTP_TIMEOUT_SECONDS = 30
+# Probe a reused session with NOOP once it has been idle this long.
+SMTP_SESSION_IDLE_SECONDS = 30
+# Raw bytes read per attachment chunk; a multiple of 57 so every base64 line is a full 76 chars.
+ATTACHMENT_READ_BYTES = 57 * 1024
+
 
 def _get_smtp_config() -> dict | None:
     """Return SMTP config from storage (UI setup) or env. User and app password must be set."""
@@ -32,8 +46,8 @@ def _get_smtp_config() -> dict | None:
     return None
 
 
-def _from_address() -> str:
-    cfg = _get_smtp_config()
+def _from_address(cfg: dict | None = None) -> str:
+    cfg = cfg or _get_smtp_config()
     if cfg:
         return SMTP_FROM.strip() or cfg["login"]
     return SMTP_FROM.strip() or SMTP_USER or ""
@@ -57,14 +71,82 @@ def validate_smtp_login(email: str, password: str) -> tuple[bool, str]:
         return False, str(e) if str(e) else "Could not verify credentials."
 
 
-def _send_email(to_email: str, subject: str, body_text: str, attachments: list[tuple[str, bytes, str]] | None = None) -> bool:
-    """Send email via SMTP (Gmail, Outlook, etc. with app password)."""
-    cfg = _get_smtp_config()
-    if not cfg:
-        raise ValueError("Email not configured. Set SMTP_USER and SMTP_APP_PASSWORD in /etc/safescribe/env (use a 16-character app password, not your normal password).")
+class SmtpSession:
+    """One authenticated SMTP connection reused across messages (e.g. by the outbox sender).
+
+    Reconnects when the server dropped the connection, the credentials changed, or the
+    session sat idle longer than SMTP_SESSION_IDLE_SECONDS.
+    """
+
+    def __init__(self):
+        self._server: smtplib.SMTP | None = None
+        self._cfg: dict | None = None
+        self._last_used = 0.0
+
+    def _connect(self, cfg: dict) -> smtplib.SMTP:
+        server = smtplib.SMTP(cfg["host"], cfg["port"], timeout=SMTP_TIMEOUT_SECONDS)
+        try:
+            server.starttls()
+            server.login(cfg["login"], cfg["password"])
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _alive(self) -> bool:
+        if self._server is None:
+            return False
+        if time.monotonic() - self._last_used < SMTP_SESSION_IDLE_SECONDS:
+            return True
+        try:
+            return self._server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def run(self, cfg: dict, deliver: Callable[[smtplib.SMTP], None]) -> None:
+        """Call deliver(server) on the logged-in connection, reconnecting once if it was dropped."""
+        if self._cfg != cfg or not self._alive():
+            self.close()
+            self._server = self._connect(cfg)
+            self._cfg = dict(cfg)
+        try:
+            deliver(self._server)
+        except smtplib.SMTPServerDisconnected:
+            # Server closed an otherwise healthy session; retry once on a fresh one
+            self.close()
+            self._server = self._connect(cfg)
+            self._cfg = dict(cfg)
+            deliver(self._server)
+        self._last_used = time.monotonic()
+
+    def send(self, cfg: dict, msg: MIMEMultipart) -> None:
+        self.run(cfg, lambda server: server.send_message(msg))
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self._last_used if self._server else 0.0
+
+    def close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                self._server.close()
+        self._server = None
+        self._cfg = None
+
+
+def _build_message(
+    cfg: dict,
+    to_email: str,
+    subject: str,
+    body_text: str,
+    attachments: list[tuple[str, bytes, str]] | None = None,
+) -> MIMEMultipart:
     msg = MIMEMultipart()
     msg["Subject"] = subject
-    msg["From"] = _from_address()
+    msg["From"] = _from_address(cfg)
     msg["To"] = to_email
     msg.attach(MIMEText(body_text, "plain"))
     if attachments:
@@ -72,13 +154,202 @@ def _send_email(to_email: str, subject: str, body_text: str, attachments: list[t
             part = MIMEApplication(data, _subtype=ctype.split("/")[-1] if "/" in ctype else "octet-stream")
             part.add_header("Content-Disposition", "attachment", filename=name)
             msg.attach(part)
-    with smtplib.SMTP(cfg["host"], cfg["port"]) as server:
+    return msg
+
+
+def _send_email(
+    to_email: str,
+    subject: str,
+    body_text: str,
+    attachments: list[tuple[str, bytes, str]] | None = None,
+    session: SmtpSession | None = None,
+) -> bool:
+    """Send email via SMTP (Gmail, Outlook, etc. with app password). Reuses `session` when given."""
+    cfg = _get_smtp_config()
+    if not cfg:
+        raise ValueError("Email not configured. Set SMTP_USER and SMTP_APP_PASSWORD in /etc/safescribe/env (use a 16-character app password, not your normal password).")
+    msg = _build_message(cfg, to_email, subject, body_text, attachments)
+    if session is not None:
+        session.send(cfg, msg)
+        return True
+    with smtplib.SMTP(cfg["host"], cfg["port"], timeout=SMTP_TIMEOUT_SECONDS) as server:
         server.starttls()
         server.login(cfg["login"], cfg["password"])
         server.send_message(msg)
     return True
 
 
+def _write_base64_lines(write: Callable[[bytes], None], stream) -> None:
+    while True:
+        chunk = stream.read(ATTACHMENT_READ_BYTES)
+        if not chunk:
+            return
+        encoded = base64.b64encode(chunk)
+        for i in range(0, len(encoded), 76):
+            write(encoded[i:i + 76] + b"\r\n")
+
+
+def _write_text_part(write: Callable[[bytes], None], subtype: str, text: str) -> None:
+    write(f'Content-Type: text/{subtype}; charset="utf-8"\r\nContent-Transfer-Encoding: base64\r\n\r\n'.encode())
+    encoded = base64.b64encode(text.encode("utf-8"))
+    for i in range(0, len(encoded), 76):
+        write(encoded[i:i + 76] + b"\r\n")
+
+
+def _write_mime(
+    write: Callable[[bytes], None],
+    from_addr: str,
+    to_email: str,
+    subject: str,
+    body_text: str,
+    files: list[tuple[str, str, str]],
+    body_html: str | None = None,
+) -> None:
+    """Write a multipart/mixed message line by line, base64-encoding files from disk in bounded chunks.
+
+    With body_html the text part becomes a multipart/alternative of plain text and HTML.
+
+    Every emitted line is base64 or a header/boundary we generate, so none starts with "." and the
+    output can go straight into SMTP DATA without dot-stuffing.
+    """
+    boundary = f"=_safescribe_{uuid.uuid4().hex}"
+    headers = [
+        ("Subject", subject if subject.isascii() else Header(subject, "utf-8").encode(linesep="\r\n")),
+        ("From", from_addr),
+        ("To", to_email),
+        ("Date", formatdate(localtime=True)),
+        ("Message-ID", make_msgid(domain="safescribe")),
+        ("MIME-Version", "1.0"),
+        ("Content-Type", f'multipart/mixed; boundary="{boundary}"'),
+    ]
+    for name, value in headers:
+        write(f"{name}: {value}\r\n".encode("utf-8"))
+    write(b"\r\n")
+    write(f"--{boundary}\r\n".encode())
+    if body_html is None:
+        _write_text_part(write, "plain", body_text)
+    else:
+        alt_boundary = f"=_safescribe_alt_{uuid.uuid4().hex}"
+        write(f'Content-Type: multipart/alternative; boundary="{alt_boundary}"\r\n\r\n'.encode())
+        write(f"--{alt_boundary}\r\n".encode())
+        _write_text_part(write, "plain", body_text)
+        write(f"--{alt_boundary}\r\n".encode())
+        _write_text_part(write, "html", body_html)
+        write(f"--{alt_boundary}--\r\n".encode())
+    for name, path, ctype in files:
+        filename = name.encode("ascii", "ignore").decode().replace('"', "")
+        write(f"--{boundary}\r\n".encode())
+        write(
+            f"Content-Type: {ctype}\r\nContent-Transfer-Encoding: base64\r\n"
+            f'Content-Disposition: attachment; filename="{filename}"\r\n\r\n'.encode("utf-8")
+        )
+        with open(path, "rb") as f:
+            _write_base64_lines(write, f)
+    write(f"--{boundary}--\r\n".encode())
+
+
+def _stream_data(server: smtplib.SMTP, from_addr: str, to_email: str, write_message: Callable) -> None:
+    """SMTP MAIL/RCPT/DATA with the message body written straight to the socket."""
+    server.ehlo_or_helo_if_needed()
+    code, resp = server.mail(from_addr)
+    if code != 250:
+        raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+    code, resp = server.rcpt(to_email)
+    if code not in (250, 251):
+        raise smtplib.SMTPRecipientsRefused({to_email: (code, resp)})
+    server.putcmd("data")
+    code, resp = server.getreply()
+    if code != 354:
+        raise smtplib.SMTPDataError(code, resp)
+    write_message(server.send)
+    server.send(b".\r\n")
+    code, resp = server.getreply()
+    if code != 250:
+        raise smtplib.SMTPDataError(code, resp)
+
+
+def _send_files_email(
+    to_email: str,
+    subject: str,
+    body_text: str,
+    files: list[tuple[str, str, str]],
+    session: SmtpSession | None = None,
+    cfg: dict | None = None,
+    from_addr: str | None = None,
+    body_html: str | None = None,
+) -> bool:
+    """Send email with file attachments (name, path, content type) streamed from disk."""
+    cfg = cfg or _get_smtp_config()
+    if not cfg:
+        raise ValueError("Email not configured. Set SMTP_USER and SMTP_APP_PASSWORD in /etc/safescribe/env (use a 16-character app password).")
+    from_addr = from_addr or _from_address(cfg)
+
+    def deliver(server: smtplib.SMTP) -> None:
+        _stream_data(
+            server, from_addr, to_email,
+            lambda write: _write_mime(write, from_addr, to_email, subject, body_text, files, body_html),
+        )
+
+    if session is not None:
+        session.run(cfg, deliver)
+        return True
+    with smtplib.SMTP(cfg["host"], cfg["port"], timeout=SMTP_TIMEOUT_SECONDS) as server:
+        server.starttls()
+        server.login(cfg["login"], cfg["password"])
+        deliver(server)
+    return True
+
+
+def _compress_pdf(pdf_path: str, out_dir: str) -> str:
+    """Rewrite the PDF with deflate + garbage collection (PyMuPDF, as used by renderer); returns pdf_path if unavailable."""
+    try:
+        import pymupdf
+    except ImportError:
+        return pdf_path
+    stem, ext = os.path.splitext(os.path.basename(pdf_path))
+    out_path = os.path.join(out_dir, f"{stem}_compressed{ext}")
+    with pymupdf.open(pdf_path) as doc:
+        doc.save(out_path, garbage=4, deflate=True, clean=True)
+    return out_path if os.path.getsize(out_path) < os.path.getsize(pdf_path) else pdf_path
+
+
+def _split_pdf(pdf_path: str, out_dir: str, max_bytes: int) -> list[str]:
+    """Split the PDF into page ranges that each fit in max_bytes (PyMuPDF); [pdf_path] if it can't."""
+    try:
+        import pymupdf
+    except ImportError:
+        return [pdf_path]
+    stem, ext = os.path.splitext(os.path.basename(pdf_path))
+    with pymupdf.open(pdf_path) as doc:
+        n_pages = len(doc)
+        if n_pages < 2:
+            return [pdf_path]
+        pages_per_part = max(1, int(n_pages * max_bytes / os.path.getsize(pdf_path)))
+        while True:
+            parts = []
+            for start in range(0, n_pages, pages_per_part):
+                part = pymupdf.open()
+                part.insert_pdf(doc, from_page=start, to_page=min(start + pages_per_part, n_pages) - 1)
+                part_path = os.path.join(out_dir, f"{stem}_part{len(parts) + 1}{ext}")
+                part.save(part_path, garbage=4, deflate=True)
+                part.close()
+                parts.append(part_path)
+            if pages_per_part == 1 or all(os.path.getsize(p) <= max_bytes for p in parts):
+                return parts
+            pages_per_part //= 2
+
+
+def _pdf_attachments(pdf_path: str, out_dir: str) -> list[str]:
+    """PDF paths to send: the original, a compressed copy, or split parts when over EMAIL_MAX_ATTACHMENT_MB."""
+    max_bytes = int(EMAIL_MAX_ATTACHMENT_MB * 1024 * 1024)
+    if os.path.getsize(pdf_path) <= max_bytes:
+        return [pdf_path]
+    compressed = _compress_pdf(pdf_path, out_dir)
+    if os.path.getsize(compressed) <= max_bytes:
+        return [compressed]
+    return _split_pdf(compressed, out_dir, max_bytes)
+
+
 def send_otp_email(to_email: str, code: str) -> bool:
     """Send 4-digit OTP code to verify email address."""
     body = f"Your SafeScribe verification code is: {code}\n\nThis code expires in 10 minutes."
@@ -112,8 +383,9 @@ def _build_meeting_email_body(
     meeting_title: str,
     meeting_time: str | None = None,
     meeting_duration: int | None = None,
+    notes_text: str | None = None,
 ) -> str:
-    """Build professional, concise email body for meeting notes."""
+    """Build professional, concise email body for meeting notes (inline when notes_text is given)."""
     lines = [
         meeting_title or "Meeting Notes",
         "",
@@ -122,9 +394,12 @@ def _build_meeting_email_body(
         lines.extend(["Time: " + meeting_time, ""])
     if meeting_duration is not None:
         lines.extend(["Length: " + _format_duration(meeting_duration), ""])
+    if notes_text:
+        lines.extend(["Your meeting notes:", "", notes_text.strip(), ""])
+    else:
+        lines.append("Your meeting notes are attached.")
+        lines.append("")
     lines.extend([
-        "Your meeting notes are attached.",
-        "",
         "Questions? Visit safescribe.site",
         "",
         "Please keep this email—your device does not retain notes or transcripts.",
@@ -132,45 +407,181 @@ def _build_meeting_email_body(
     return "\n".join(lines)
 
 
-def send_meeting_pdf(
-    meeting_title: str,
-    pdf_path: str,
+def _send_meeting_email(
     recipient_email: str,
-    meeting_created_at: str | None = None,
-    meeting_duration: int | None = None,
-    smtp_config: dict | None = None,
+    subject: str,
+    body_text: str,
+    pdf_path: str | None,
+    session: SmtpSession | None = None,
+    body_html: str | None = None,
+    skip_parts: int = 0,
+    on_part_sent: Callable[[int], None] | None = None,
+) -> None:
+    """Send the notes email, splitting into "part N of M" messages when the PDF is over the size cap.
+
+    The first skip_parts messages were delivered by an earlier attempt; on_part_sent(n) is called
+    once the first n are.
+    """
+    if not pdf_path:
+        _send_files_email(recipient_email, subject, body_text, [], session=session, body_html=body_html)
+        return
+    with tempfile.TemporaryDirectory(prefix="safescribe-mail-") as tmp:
+        parts = _pdf_attachments(pdf_path, tmp)
+        for i, part_path in enumerate(parts):
+            if i < skip_parts:
+                continue
+            name = os.path.basename(pdf_path)
+            if len(parts) > 1:
+                stem, ext = os.path.splitext(name)
+                name = f"{stem}_part{i + 1}{ext}"
+            _send_files_email(
+                recipient_email,
+                subject if len(parts) == 1 else f"{subject} (part {i + 1} of {len(parts)})",
+                body_text,
+                [(name, part_path, "application/pdf")],
+                session=session,
+                body_html=body_html,
+            )
+            if on_part_sent:
+                on_part_sent(i + 1)
+
+
+# "pdf": notes attached as PDF; "inline": notes in the email body (HTML + text), no PDF; "both".
+EMAIL_FORMATS = ("pdf", "inline", "both")
+
+
+def get_email_format() -> str:
+    fmt = storage.get_setting("email_format")
+    return fmt if fmt in EMAIL_FORMATS else "pdf"
+
+
+def _meeting_notes_markdown(meeting: dict) -> str:
+    """Notes sections (summary, action items, decisions, topics) rebuilt from the meeting record."""
+    from summarizer import assemble
+    return assemble(meeting.get("summary") or "", {
+        "action_items": list(meeting.get("actionItems") or []),
+        "decisions": list(meeting.get("decisions") or []),
+        "topics": list(meeting.get("topics") or []),
+    })
+
+
+def send_meeting_notes(
+    meeting: dict,
+    recipient_email: str,
+    email_format: str | None = None,
+    session: SmtpSession | None = None,
+    skip_parts: int = 0,
+    on_part_sent: Callable[[int], None] | None = None,
 ) -> bool:
-    """Send meeting PDF to recipient via SMTP (email + app password)."""
-    body = _build_meeting_email_body(
-        meeting_title,
-        meeting_time=_format_datetime(meeting_created_at) if meeting_created_at else None,
-        meeting_duration=meeting_duration,
-    )
-    if smtp_config:
-        # Legacy/test path
-        msg = MIMEMultipart()
-        msg["Subject"] = f"SafeScribe: {meeting_title or 'Meeting Notes'}"
-        msg["From"] = smtp_config["email"]
-        msg["To"] = recipient_email
-        msg.attach(MIMEText(body, "plain"))
-        with open(pdf_path, "rb") as f:
-            part = MIMEApplication(f.read(), _subtype="pdf")
-            part.add_header("Content-Disposition", "attachment", filename=os.path.basename(pdf_path))
-            msg.attach(part)
-        with smtplib.SMTP(smtp_config["host"], smtp_config["port"]) as server:
-            server.starttls()
-            server.login(smtp_config["email"], smtp_config["password"])
-            server.send_message(msg)
-        return True
-    # SMTP path (app password)
+    """Send a stored meeting per the email format; falls back to inline notes when there is no PDF.
+
+    skip_parts and on_part_sent resume a split email, see _send_meeting_email.
+    """
+    fmt = email_format or get_email_format()
+    pdf_path = meeting.get("pdfPath")
+    has_pdf = bool(pdf_path and os.path.isfile(pdf_path))
+    attach = has_pdf and fmt in ("pdf", "both")
+    inline = not attach or fmt in ("inline", "both")
     if not _get_smtp_config():
         raise ValueError("Email not configured. Set SMTP_USER and SMTP_APP_PASSWORD in /etc/safescribe/env (use a 16-character app password).")
-    with open(pdf_path, "rb") as f:
-        pdf_data = f.read()
-    _send_email(
+    from summarizer import notes_document
+    title = meeting.get("title") or "Meeting Notes"
+    notes_md = _meeting_notes_markdown(meeting) if inline else None
+    meeting_time = _format_datetime(meeting["createdAt"]) if meeting.get("createdAt") else None
+    body = _build_meeting_email_body(
+        title,
+        meeting_time=meeting_time,
+        meeting_duration=meeting.get("duration"),
+        notes_text=renderer.render_text(notes_md) if notes_md else None,
+    )
+    _send_meeting_email(
         recipient_email,
-        f"SafeScribe: {meeting_title or 'Meeting Notes'}",
+        f"SafeScribe: {title}",
         body,
-        attachments=[(os.path.basename(pdf_path), pdf_data, "application/pdf")],
+        pdf_path if attach else None,
+        session=session,
+        body_html=renderer.render_html_document(
+            notes_document(notes_md, title, meeting_time or ""), title
+        ) if notes_md else None,
+        skip_parts=skip_parts,
+        on_part_sent=on_part_sent,
     )
     return True
+
+
+def send_digest(
+    meetings: list[dict],
+    recipient_email: str,
+    email_format: str | None = None,
+    session: SmtpSession | None = None,
+    skip_parts: int = 0,
+    on_part_sent: Callable[[int], None] | None = None,
+) -> bool:
+    """Send several meetings in one email: a list in the body plus each meeting's PDF and/or inline notes.
+
+    Attachments are packed greedily so no single message exceeds EMAIL_MAX_ATTACHMENT_MB.
+    skip_parts and on_part_sent resume a split email, see _send_meeting_email.
+    """
+    from summarizer import notes_document
+    if not _get_smtp_config():
+        raise ValueError("Email not configured. Set SMTP_USER and SMTP_APP_PASSWORD in /etc/safescribe/env (use a 16-character app password).")
+    fmt = email_format or get_email_format()
+    meetings = sorted(meetings, key=lambda m: m.get("createdAt") or "")
+    lines = [f"SafeScribe digest: {len(meetings)} meeting{'s' if len(meetings) != 1 else ''}", ""]
+    notes_docs = []
+    pdfs = []
+    for meeting in meetings:
+        title = meeting.get("title") or "Meeting Notes"
+        meeting_time = _format_datetime(meeting["createdAt"]) if meeting.get("createdAt") else ""
+        pdf_path = meeting.get("pdfPath")
+        attach = bool(pdf_path and os.path.isfile(pdf_path)) and fmt in ("pdf", "both")
+        lines.append(f"- {title} ({meeting_time}, {_format_duration(meeting.get('duration') or 0)})")
+        if attach:
+            pdfs.append(pdf_path)
+        if not attach or fmt in ("inline", "both"):
+            notes_docs.append(notes_document(_meeting_notes_markdown(meeting), title, meeting_time))
+    lines.append("")
+    if pdfs:
+        lines.extend(["PDF notes are attached.", ""])
+    for doc in notes_docs:
+        lines.extend([renderer.render_text(doc).strip(), ""])
+    lines.extend([
+        "Questions? Visit safescribe.site",
+        "",
+        "Please keep this email—your device does not retain notes or transcripts.",
+    ])
+    body = "\n".join(lines)
+    subject = f"SafeScribe: {len(meetings)} meeting notes"
+    body_html = renderer.render_html_document("\n\n---\n\n".join(notes_docs), subject) if notes_docs else None
+    max_bytes = int(EMAIL_MAX_ATTACHMENT_MB * 1024 * 1024)
+    with tempfile.TemporaryDirectory(prefix="safescribe-mail-") as tmp:
+        files = []
+        for pdf_path in pdfs:
+            parts = _pdf_attachments(pdf_path, tmp)
+            stem, ext = os.path.splitext(os.path.basename(pdf_path))
+            for i, part_path in enumerate(parts):
+                name = f"{stem}{ext}" if len(parts) == 1 else f"{stem}_part{i + 1}{ext}"
+                files.append((name, part_path, "application/pdf"))
+        messages: list[list[tuple[str, str, str]]] = [[]]
+        size = 0
+        for f in files:
+            f_size = os.path.getsize(f[1])
+            if messages[-1] and size + f_size > max_bytes:
+                messages.append([])
+                size = 0
+            messages[-1].append(f)
+            size += f_size
+        for i, attachments in enumerate(messages):
+            if i < skip_parts:
+                continue
+            _send_files_email(
+                recipient_email,
+                subject if len(messages) == 1 else f"{subject} (part {i + 1} of {len(messages)})",
+                body,
+                attachments,
+                session=session,
+                body_html=body_html,
+            )
+            if on_part_sent:
+                on_part_sent(i + 1)
+    return True
@@ -0,0 +1,163 @@
+"""Gateway mode: recording sessions for audio streamed from thin room devices.
+
+Each connected device gets its own session (own StreamRecorder, recording file, transcript
+buffer and degradation state) on the local RecorderService, next to the server's own mic.
+All sessions share its Whisper model through a FairGate, so every room's next chunk waits its
+turn rather than behind another room's backlog. Ollama calls from every meeting's notes share
+a second gate.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Optional
+
+from config import GATEWAY_LLM_SLOTS, GATEWAY_MAX_SESSIONS
+from fairqueue import FairGate
+from recorder import StreamRecorder
+from api.services.recorder_service import RecorderService, RecordingSession, RecordingStateError
+
+LOCAL_KEY = "local"  # the server's own mic, if it records too
+
+
+class GatewayUnavailable(Exception):
+    """No session can be opened right now (model still loading, or at GATEWAY_MAX_SESSIONS)."""
+
+
+class GatedSTT:
+    """One session's view of the shared model: every call waits for its turn at the gate.
+
+    With STT worker processes a session's tail still runs a chunk per worker, but each submitted
+    chunk holds its own slot, so another room's next chunk gets the first slot that frees up.
+    """
+
+    def __init__(self, stt, gate: FairGate, key: str):
+        self._stt = stt
+        self._gate = gate
+        self._key = key
+        self.model_name = stt.model_name
+        self.model_source = stt.model_source
+        self.load_seconds = stt.load_seconds
+        self.workers = getattr(stt, "workers", 1)
+
+    def submit(self, *args, **kwargs) -> Future:
+        """SttPool.submit once it's this session's turn; the slot is held until the chunk is done."""
+        self._gate.acquire(self._key)
+        try:
+            future = self._stt.submit(*args, **kwargs)
+        except BaseException:
+            self._gate.release()
+            raise
+        future.add_done_callback(lambda _: self._gate.release())
+        return future
+
+    def transcribe(self, *args, **kwargs) -> str:
+        with self._gate.slot(self._key):
+            return self._stt.transcribe(*args, **kwargs)
+
+    def transcribe_segments(self, *args, **kwargs) -> list:
+        with self._gate.slot(self._key):
+            return self._stt.transcribe_segments(*args, **kwargs)
+
+    def transcribe_batched(self, *args, **kwargs) -> dict:
+        """A slot per window rather than for the whole re-run, so live rooms interleave."""
+        return self._stt.transcribe_batched(*args, window_slot=lambda: self._gate.slot(self._key), **kwargs)
+
+
+_lock = threading.Lock()
+_session_ids: set[str] = set()  # sessions opened here (the service also holds the local mic's)
+_service: Optional[RecorderService] = None
+_stt = None
+_stt_gate: Optional[FairGate] = None
+
+
+def attach(local_service: RecorderService) -> None:
+    """Host gateway sessions on the local service and share its Whisper (call once it's loaded)."""
+    global _service, _stt, _stt_gate
+    import summarizer
+
+    with _lock:
+        if _stt is not None or local_service.stt is None:
+            return
+        _service = local_service
+        _stt = local_service.stt
+        _stt_gate = FairGate(getattr(_stt, "workers", 1))
+        local_service.stt = GatedSTT(_stt, _stt_gate, LOCAL_KEY)
+    summarizer.set_llm_gate(FairGate(GATEWAY_LLM_SLOTS))
+
+
+def open_session(room: str, samplerate: int) -> RecordingSession:
+    """Start recording a streamed session; feed it with session.recorder.feed()."""
+    with _lock:
+        if _stt is None:
+            raise GatewayUnavailable("Whisper is still loading")
+        if len(_session_ids) >= GATEWAY_MAX_SESSIONS:
+            raise GatewayUnavailable(f"Gateway is serving its maximum of {GATEWAY_MAX_SESSIONS} rooms")
+        session_id = f"session-{uuid.uuid4().hex[:12]}"
+        _session_ids.add(session_id)
+    try:
+        return _service.start_recording(
+            recorder=StreamRecorder(samplerate),
+            room=room,
+            stt=GatedSTT(_stt, _stt_gate, session_id),
+            session_id=session_id,
+        )
+    except Exception:
+        with _lock:
+            _session_ids.discard(session_id)
+        raise
+
+
+def close_session(session_id: str) -> Optional[str]:
+    """Stop a session and hand its recording to post-processing. Returns the job id."""
+    with _lock:
+        if session_id not in _session_ids:
+            return None
+        _session_ids.discard(session_id)
+    session = _service.sessions.get(session_id)
+    if session is None:
+        return None
+    duration = max(1, int(time.time() - session.started_at))
+    try:
+        return _service.stop_recording(duration, session_id)
+    except RecordingStateError:
+        return None
+
+
+def set_paused(session_id: str, paused: bool) -> None:
+    if paused:
+        _service.pause_recording(session_id)
+    else:
+        _service.resume_recording(session_id)
+
+
+def get_session(session_id: str) -> Optional[RecordingSession]:
+    with _lock:
+        if session_id not in _session_ids:
+            return None
+    return _service.sessions.get(session_id)
+
+
+def get_transcript(session_id: str) -> str:
+    return _service.get_live_transcript(session_id)
+
+
+def get_segments(session_id: str, after_seq: int) -> list:
+    return _service.get_live_segments(after_seq, session_id)
+
+
+def list_sessions() -> list:
+    with _lock:
+        session_ids = list(_session_ids)
+    sessions = [s for s in map(_service.sessions.get, session_ids) if s is not None] if _service else []
+    waiting = _stt_gate.waiting() if _stt_gate else {}
+    return [
+        {
+            "id": s.id,
+            "room": s.room,
+            "startedAt": s.started_at,
+            "sttQueued": waiting.get(s.id, 0),
+            **_service.get_status(s.id),
+        }
+        for s in sessions
+    ]
@@ -0,0 +1,194 @@
+"""Outbox: durable email queue drained by a background sender over one reused SMTP session."""
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import tracing
+from api.services import storage
+from api.services.email_sender import SmtpSession, send_digest, send_meeting_notes
+
+# Retry delay doubles per failed attempt, from OUTBOX_RETRY_BASE_SECONDS up to OUTBOX_RETRY_MAX_SECONDS.
+OUTBOX_RETRY_BASE_SECONDS = 30
+OUTBOX_RETRY_MAX_SECONDS = 3600
+# Longest the sender sleeps without being woken; also bounds how long an idle session stays open.
+OUTBOX_POLL_SECONDS = 60
+OUTBOX_BATCH_SIZE = 20
+
+_wake = threading.Event()
+_sender_thread: Optional[threading.Thread] = None
+
+
+class _PermanentFailure(Exception):
+    """The message can never be sent (e.g. meeting deleted); stop retrying."""
+
+
+def _backoff_seconds(attempts: int) -> float:
+    return min(OUTBOX_RETRY_MAX_SECONDS, OUTBOX_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)))
+
+
+def get_digest_minutes() -> int:
+    """Digest interval from settings; 0 means every meeting is emailed on its own."""
+    try:
+        return max(0, int(storage.get_setting("email_digest_minutes") or 0))
+    except ValueError:
+        return 0
+
+
+def set_digest_minutes(minutes: int) -> None:
+    storage.set_setting("email_digest_minutes", str(minutes))
+    if not minutes:
+        storage.release_emails("digest")
+        wake()
+
+
+def enqueue_meeting(meeting_id: str, recipient: str) -> int:
+    """Queue the meeting notes for delivery and wake the sender.
+
+    In digest mode the meeting joins the recipient's pending digest, or starts one due in
+    email_digest_minutes.
+    """
+    minutes = get_digest_minutes()
+    if minutes:
+        due_at = storage.next_email_due_at(kind="digest", recipient=recipient) or time.time() + minutes * 60
+        email_id = storage.enqueue_email("digest", recipient, meeting_id=meeting_id, next_attempt_at=due_at)
+    else:
+        email_id = storage.enqueue_email("meeting", recipient, meeting_id=meeting_id)
+    wake()
+    return email_id
+
+
+def wake() -> None:
+    _wake.set()
+
+
+def retry_now() -> None:
+    """Make pending messages due immediately (e.g. Wi-Fi reconnected, credentials changed)."""
+    storage.retry_emails_now()
+    wake()
+
+
+def _mark_emailed(meeting_ids: list[str]) -> None:
+    emailed_at = datetime.now().isoformat()
+    for meeting_id in meeting_ids:
+        storage.update_meeting_emailed(meeting_id, True, emailed_at=emailed_at)
+        storage.delete_meeting_files(meeting_id)  # audio too: retranscribe then answers 409
+
+
+def _record_parts(jobs: list[dict]):
+    """Callback storing delivered "part N of M" messages on the jobs, so a retry resumes after them."""
+    ids = [job["id"] for job in jobs]
+    return lambda parts_sent: storage.set_email_parts_sent(ids, parts_sent)
+
+
+def _send_meeting(jobs: list[dict], session: SmtpSession) -> None:
+    job = jobs[0]
+    meeting = storage.get_meeting(job["meetingId"])
+    if not meeting:
+        raise _PermanentFailure("Meeting was deleted")
+    if meeting.get("emailed"):
+        return  # Already delivered (e.g. manual send from Past Meetings)
+    # Timed under the job that produced the meeting, so its timings show the delivery too
+    job_id = storage.job_id_for_meeting(meeting["id"]) or meeting["id"]
+    with tracing.job(job_id, meeting_id=meeting["id"]):
+        with tracing.span("email.send"):
+            send_meeting_notes(
+                meeting, job["recipient"], session=session,
+                skip_parts=job["partsSent"], on_part_sent=_record_parts(jobs),
+            )
+        with tracing.span("db.mark_emailed"):
+            _mark_emailed([meeting["id"]])
+
+
+def _send_digest(jobs: list[dict], session: SmtpSession) -> None:
+    """One email for all of a recipient's queued meetings; deleted or already-sent ones are skipped."""
+    meetings = []
+    for job in jobs:
+        meeting = storage.get_meeting(job["meetingId"])
+        if meeting and not meeting.get("emailed"):
+            meetings.append(meeting)
+    if not meetings:
+        return
+    send_digest(
+        meetings, jobs[0]["recipient"], session=session,
+        skip_parts=jobs[0]["partsSent"], on_part_sent=_record_parts(jobs),
+    )
+    _mark_emailed([m["id"] for m in meetings])
+
+
+_SENDERS = {
+    "meeting": _send_meeting,
+    "digest": _send_digest,
+}
+
+
+def _group(due: list[dict]) -> list[list[dict]]:
+    """Digest jobs for the same recipient go out together; everything else is sent one by one.
+
+    A digest that was partly delivered keeps its own group, so its parts are numbered as before.
+    """
+    groups: list[list[dict]] = []
+    digests: dict[tuple[str, int], list[dict]] = {}
+    for job in due:
+        if job["kind"] == "digest":
+            key = (job["recipient"], job["partsSent"])
+            if key not in digests:
+                digests[key] = []
+                groups.append(digests[key])
+            digests[key].append(job)
+        else:
+            groups.append([job])
+    return groups
+
+
+def drain(session: SmtpSession) -> int:
+    """Send every due message. Stops at the first transient error so an offline device backs off."""
+    sent = 0
+    while True:
+        due = storage.list_due_emails(time.time(), OUTBOX_BATCH_SIZE)
+        if not due:
+            return sent
+        for jobs in _group(due):
+            attempts = max(job["attempts"] for job in jobs) + 1
+            try:
+                _SENDERS[jobs[0]["kind"]](jobs, session)
+            except _PermanentFailure as e:
+                for job in jobs:
+                    storage.reschedule_email(job["id"], attempts, 0, str(e), failed=True)
+                continue
+            except Exception as e:
+                session.close()
+                for job in jobs:
+                    storage.reschedule_email(
+                        job["id"], attempts, time.time() + _backoff_seconds(attempts), str(e) or type(e).__name__
+                    )
+                return sent
+            storage.complete_email([job["id"] for job in jobs])
+            sent += 1
+
+
+def _sender_loop() -> None:
+    session = SmtpSession()
+    while True:
+        _wake.clear()
+        try:
+            drain(session)
+        except Exception:
+            session.close()
+        if session.idle_seconds() >= OUTBOX_POLL_SECONDS:
+            session.close()
+        try:
+            next_due = storage.next_email_due_at()
+        except Exception:
+            next_due = None
+        timeout = OUTBOX_POLL_SECONDS if next_due is None else max(0.0, min(OUTBOX_POLL_SECONDS, next_due - time.time()))
+        _wake.wait(timeout=timeout)
+
+
+def start_sender() -> None:
+    """Start the background outbox sender (idempotent)."""
+    global _sender_thread
+    if _sender_thread and _sender_thread.is_alive():
+        return
+    _sender_thread = threading.Thread(target=_sender_loop, daemon=True)
+    _sender_thread.start()
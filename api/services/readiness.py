@@ -0,0 +1,89 @@
+"""Readiness: per-component startup state (ui, db, whisper, ollama, audio) for /ready."""
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+from config import OLLAMA_HOST
+
+# Seconds between Ollama probes until it answers (it often starts after the API on boot).
+OLLAMA_PROBE_SECONDS = 10
+OLLAMA_PROBE_TIMEOUT_SECONDS = 2
+
+COMPONENTS = ("ui", "db", "whisper", "ollama", "audio")
+
+_lock = threading.Lock()
+_state: dict = {name: {"state": "pending", "detail": None, "since": time.time()} for name in COMPONENTS}
+_started_at = time.time()
+_probe_thread: threading.Thread | None = None
+
+
+def set_state(component: str, state: str, detail: str | None = None) -> None:
+    """state: pending | loading | ready | error | unavailable."""
+    with _lock:
+        _state[component] = {"state": state, "detail": detail, "since": time.time()}
+
+
+def snapshot() -> dict:
+    with _lock:
+        components = {name: dict(info) for name, info in _state.items()}
+    return {
+        "ready": all(c["state"] in ("ready", "unavailable") for c in components.values()),
+        "uptimeSeconds": round(time.time() - _started_at, 1),
+        "components": components,
+    }
+
+
+def _probe_ui(frontend_build: Path) -> None:
+    if frontend_build.exists():
+        set_state("ui", "ready")
+    else:
+        set_state("ui", "unavailable", "Frontend build not found; API only")
+
+
+def _probe_db() -> None:
+    from api.services import storage
+    try:
+        storage.get_setting("setup_complete")
+        set_state("db", "ready")
+    except Exception as e:
+        set_state("db", "error", str(e))
+
+
+def _probe_audio() -> None:
+    try:
+        import sounddevice as sd
+        from recorder import audio_device, input_channels
+        device = audio_device()
+        info = sd.query_devices(device, "input")
+        set_state("audio", "ready", f"{info['name']} ({input_channels(sd, device)} ch)")
+    except Exception as e:
+        set_state("audio", "error", str(e) or "No input device")
+
+
+def _probe_ollama() -> bool:
+    try:
+        with urllib.request.urlopen(f"{OLLAMA_HOST}/api/tags", timeout=OLLAMA_PROBE_TIMEOUT_SECONDS):
+            pass
+        set_state("ollama", "ready")
+        return True
+    except Exception as e:
+        set_state("ollama", "error", str(e))
+        return False
+
+
+def start_probes(frontend_build: Path) -> None:
+    """Probe ui/db/audio once and Ollama until it answers, in a background thread."""
+    global _probe_thread
+    if _probe_thread and _probe_thread.is_alive():
+        return
+
+    def _run():
+        _probe_ui(frontend_build)
+        _probe_db()
+        _probe_audio()
+        while not _probe_ollama():
+            time.sleep(OLLAMA_PROBE_SECONDS)
+
+    _probe_thread = threading.Thread(target=_run, daemon=True)
+    _probe_thread.start()
@@ -1,22 +1,47 @@
-"""Recorder service: AudioRecorder + WhisperSTT + summarizer."""
+"""Recorder service: AudioRecorder + WhisperSTT + summarizer.
+
+recorder, stt and summarizer pull in sounddevice, faster_whisper, scipy, ollama and nltk, so
+they are imported on first use rather than at module import (keeps API startup fast).
+"""
+from __future__ import annotations
+
 import os
 import re
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import time
 import uuid
 from datetime import datetime
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
+
+import audiofile
+import tracing
+from config import (
+    DIARIZATION_ENABLED, MEETINGS_DIR, RECORDINGS_DIR, STT_WORKERS, TRANSCRIPT_FILTER, WHISPER_FALLBACK_MODEL,
+    WORD_TIMESTAMPS,
+)
+from transcript_filter import RepetitionFilter
+from api.services import outbox, readiness, storage
+from api.services.email_sender import get_email_format
 
-from recorder import AudioRecorder
-from stt import WhisperSTT
-from summarizer import save_summary_as_pdf
-from config import MEETINGS_DIR
-from api.services import storage
-from api.services.email_sender import send_meeting_pdf
+if TYPE_CHECKING:
+    from diarizer import Diarizer
+    from recorder import AudioRecorder
+    from stt import WhisperSTT
+    from stt_pool import SttPool
 
 TRANSCRIBE_CHUNK_SECONDS = 30
 TRANSCRIBE_LOOP_SLEEP_SECONDS = 0.2
 
+# Backpressure: when live transcription falls behind (backlog of recorded, untranscribed audio)
+# step down to greedy decoding, then to WHISPER_FALLBACK_MODEL; step back up once caught up.
+RTF_SMOOTHING = 0.3           # EMA weight of the newest chunk's real-time factor
+LAG_DEGRADE_SECONDS = 90      # ~3 chunks behind
+LAG_FALLBACK_SECONDS = 180
+LAG_RECOVER_SECONDS = 45
+DEGRADE_LEVELS = ("full", "greedy", "fallback-model")
+
 
 def _sanitize_filename(text: str) -> str:
     safe = re.sub(r"[^a-zA-Z0-9\s_-]", "", text)
@@ -24,92 +49,381 @@ def _sanitize_filename(text: str) -> str:
     return safe[:50]
 
 
+def _file_timestamp() -> str:
+    """Filename timestamp to the millisecond: concurrent sessions may finish in the same second."""
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
+
+
+def _label_speakers(diarizer: Diarizer, chunk, samplerate: int, segments: list) -> str:
+    with tracing.span("diarize", segments=len(segments)):
+        return "\n".join(diarizer.label(chunk, samplerate, segments))
+
+
+def _chunk_text(segments: list, diarizer: Optional[Diarizer], chunk, samplerate: int) -> str:
+    if diarizer is not None:
+        return _label_speakers(diarizer, chunk, samplerate, segments)
+    return " ".join(text for text in (segment[2].strip() for segment in segments) if text)
+
+
+def _timeline(segments: list, offset: float) -> list:
+    """A chunk's Whisper segments as (start, end, text, words), in seconds from the recording's start."""
+    timeline = []
+    for start, end, text, *rest in segments:
+        words = [(offset + ws, offset + we, word) for ws, we, word in rest[0]] if rest else []
+        timeline.append((offset + start, offset + end, text, words))
+    return timeline
+
+
+class RecordingStateError(Exception):
+    """The request doesn't fit the session's state (e.g. stop when nothing is recording)."""
+
+
+class RecordingSession:
+    """One recording, from start until its meeting is processed: capture, file, live transcript
+    and transcription health. Status changes are made under the service's lock:
+    recording <-> paused -> processing -> done, or -> aborted.
+    """
+
+    def __init__(self, recorder: Optional[AudioRecorder], stt=None, room: str = "",
+                 session_id: Optional[str] = None, diarizer: Optional[Diarizer] = None):
+        self.id = session_id or f"session-{uuid.uuid4().hex[:12]}"
+        self.recorder = recorder
+        self.stt = stt  # None = the service's model
+        self.room = room  # gateway sessions: the room the audio comes from, stored with the meeting
+        self.diarizer = diarizer
+        # Live chunks are speaker-labelled here, in order, while the loop transcribes the next one
+        self.labeller: Optional[ThreadPoolExecutor] = None
+        self.status = "recording"
+        self.started_at = time.time()
+        self.audio_path: Optional[str] = None
+        self.start_frame = 0  # where the post-processing tail starts reading (set once the live loop ends)
+        self.duration_seconds: Optional[int] = None  # None (crash recovery) = from the recording
+        self.job_id: Optional[str] = None
+        # Live transcript, one entry per transcribed chunk; entry i is segment seq i + 1, also
+        # appended to storage's live_segments so it survives a crash
+        self.transcript_buffer: list[str] = []
+        self.timeline: list = []  # (start, end, text, words) per Whisper segment, see _timeline()
+        # Whisper loops that span chunks (per-segment hallucinations are dropped by stt itself)
+        self.repeats = RepetitionFilter() if TRANSCRIPT_FILTER else None
+        self.running = threading.Event()
+        self.transcribe_thread: Optional[threading.Thread] = None
+        self.rtf: Optional[float] = None  # transcribe time / audio time, smoothed
+        self.degrade_level = 0
+        self.on_transcript_update: Optional[Callable[[str], None]] = None  # called with each new segment
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("recording", "paused")
+
+
 class RecorderService:
+    """Recording sessions sharing one Whisper model.
+
+    Sessions on the local mic (start_recording() without a recorder) are exclusive: one at a
+    time, tracked as `current`. Stop hands a session to post-processing and frees the mic, so
+    the next meeting can start while the last one is still being transcribed and summarized.
+    """
+
     def __init__(self):
-        self.recorder: Optional[AudioRecorder] = None
-        self.stt: Optional[WhisperSTT] = None
-        self.transcript_buffer: list = []
-        self.running_flag: list = [False]
-        self.transcribe_thread: Optional[threading.Thread] = None
+        self.fallback_model = WHISPER_FALLBACK_MODEL  # "" disables the step-down to it
+        self.stt: Optional[WhisperSTT | SttPool] = None
+        self.fallback_stt: Optional[WhisperSTT] = None
+        self._fallback_thread: Optional[threading.Thread] = None
         self.on_transcript_update: Optional[Callable[[str], None]] = None
+        self.sessions: dict[str, RecordingSession] = {}  # recording, paused or processing
+        self.current: Optional[RecordingSession] = None  # the session on the local mic
+        self._last_local: Optional[RecordingSession] = None  # its transcript stays readable after stop
+        self._lock = threading.Lock()
+        self._retranscribe_lock = threading.Lock()  # one archive re-run at a time
+
+    def _session(self, session_id: Optional[str]) -> Optional[RecordingSession]:
+        return self.sessions.get(session_id) if session_id else self.current
 
-    def _transcribe_loop(self) -> None:
-        while self.running_flag[0] and self.recorder and self.stt:
-            if self.recorder.state.name == "RECORDING":
-                chunk = self.recorder.pop_chunk(seconds=TRANSCRIBE_CHUNK_SECONDS)
+    def _transcribe_loop(self, session: RecordingSession) -> None:
+        """Live transcription for one session, until stop (its buffer then goes to the worker)."""
+        recorder = session.recorder
+        while session.running.is_set():
+            if recorder.state.name == "RECORDING":
+                chunk = recorder.pop_chunk(seconds=TRANSCRIBE_CHUNK_SECONDS)
                 if chunk is not None:
-                    text = self.stt.transcribe(chunk, samplerate=self.recorder.samplerate)
-                    text = text.strip()
-                    if text:
-                        self.transcript_buffer.append(text)
-                        if self.on_transcript_update:
-                            self.on_transcript_update("\n".join(self.transcript_buffer))
+                    end_frame = recorder.read_frame
+                    chunk_start, _ = recorder.last_chunk_times()
+                    diarizer = session.diarizer if session.degrade_level == 0 else None
+                    text, segments = self._transcribe_chunk(session, chunk, recorder.samplerate, diarize=False)
+                    self._adjust_degradation(session, recorder.backlog_seconds())
+                    timeline = _timeline(segments, chunk_start)
+                    if session.labeller is not None:
+                        session.labeller.submit(
+                            self._label_and_append, session, diarizer, chunk, recorder.samplerate, segments,
+                            text, end_frame, timeline,
+                        )
+                    elif text:
+                        self._append_segment(session, text, end_frame, timeline)
             time.sleep(TRANSCRIBE_LOOP_SLEEP_SECONDS)
 
-    def start_recording(self) -> None:
-        if self.recorder is None:
-            self.recorder = AudioRecorder()
-        if self.stt is None:
-            self.stt = WhisperSTT()
-        self.transcript_buffer = []
-        self.running_flag[0] = True
-        self.transcribe_thread = threading.Thread(target=self._transcribe_loop, daemon=True)
-        self.transcribe_thread.start()
-        self.recorder.start()
+    def _label_and_append(self, session: RecordingSession, diarizer: Optional[Diarizer], chunk, samplerate: int,
+                          segments: list, text: str, end_frame: int, timeline: list) -> None:
+        """Labeller job: a live chunk's speaker-labelled text (plain while degraded), then append it."""
+        if diarizer is not None:
+            try:
+                text = _label_speakers(diarizer, chunk, samplerate, segments)
+            except Exception as e:
+                print(f"Could not label speakers of {session.id}: {e}")  # keep the plain text
+        if text:
+            self._append_segment(session, text, end_frame, timeline)
+
+    def _append_segment(self, session: RecordingSession, text: str, end_frame: int, timeline: list) -> None:
+        session.transcript_buffer.append(text)
+        session.timeline.extend(timeline)
+        try:
+            storage.append_live_segment(session.id, len(session.transcript_buffer), end_frame, text, timeline)
+        except Exception as e:
+            print(f"Could not store live transcript of {session.id}: {e}")  # still in memory
+        on_update = session.on_transcript_update or self.on_transcript_update
+        if on_update:
+            on_update(text)
+
+    def _transcribe_chunk(
+        self, session: RecordingSession, chunk, samplerate: int, diarize: bool = True
+    ) -> tuple[str, list]:
+        """Transcribe at the session's degradation level and update its real-time factor.
+
+        Returns (text, Whisper segments). With a diarizer (unless diarize is False, and while
+        keeping up) the text is speaker-labelled lines; word timestamps are also only kept while
+        keeping up.
+        """
+        from stt import DEFAULT_BEAM_SIZE
+
+        level = session.degrade_level
+        stt = self.fallback_stt if level >= 2 and self.fallback_stt else (session.stt or self.stt)
+        beam_size = 1 if level >= 1 else DEFAULT_BEAM_SIZE
+        started = time.perf_counter()
+        segments = stt.transcribe_segments(
+            chunk, samplerate=samplerate, beam_size=beam_size, word_timestamps=WORD_TIMESTAMPS and level == 0
+        )
+        if session.repeats is not None:
+            segments = session.repeats.filter(segments)
+        text = _chunk_text(segments, session.diarizer if diarize and level == 0 else None, chunk, samplerate)
+        rtf = (time.perf_counter() - started) / (len(chunk) / samplerate)
+        session.rtf = rtf if session.rtf is None else session.rtf + RTF_SMOOTHING * (rtf - session.rtf)
+        return text, segments
+
+    def _adjust_degradation(self, session: RecordingSession, lag_seconds: float) -> None:
+        level = session.degrade_level
+        # The fallback stands in for the shared model only, not a session's own (e.g. gated) one
+        can_fall_back = self.fallback_model and session.stt is None
+        if lag_seconds > LAG_FALLBACK_SECONDS and level == 1 and can_fall_back and session.rtf > 1:
+            level = 2
+            self._load_fallback()
+        elif lag_seconds > LAG_DEGRADE_SECONDS and level == 0:
+            level = 1
+        elif lag_seconds < LAG_RECOVER_SECONDS and level > 0:
+            level -= 1
+        if level != session.degrade_level:
+            print(f"Transcription {lag_seconds:.0f}s behind (RTF {session.rtf:.2f}): {DEGRADE_LEVELS[level]}")
+            session.degrade_level = level
+
+    def _load_fallback(self) -> None:
+        """Load the fallback model in the background (store or hub cache only, never downloads)."""
+        if self.fallback_stt is not None or (self._fallback_thread and self._fallback_thread.is_alive()):
+            return
+
+        def _load():
+            from stt import WhisperSTT
+            try:
+                self.fallback_stt = WhisperSTT(self.fallback_model, allow_download=False)
+            except Exception as e:
+                print(f"Fallback model '{self.fallback_model}' unavailable: {e}")
+
+        self._fallback_thread = threading.Thread(target=_load, daemon=True)
+        self._fallback_thread.start()
+
+    def start_recording(
+        self,
+        recorder: Optional[AudioRecorder] = None,
+        room: str = "",
+        stt=None,
+        session_id: Optional[str] = None,
+    ) -> RecordingSession:
+        """Start a session: on the local mic by default, or on a given (e.g. streamed) recorder.
+
+        stt overrides the shared model for this session. Raises RecordingStateError if the local
+        mic is already recording.
+        """
+        if self.stt is None and stt is None:
+            self.preload_whisper()
+        local = recorder is None
+        with self._lock:
+            if local and self.current is not None:
+                raise RecordingStateError("Already recording")
+            if local:
+                from recorder import AudioRecorder
+                recorder = AudioRecorder()
+            diarizer = None
+            if DIARIZATION_ENABLED:
+                from diarizer import Diarizer
+                diarizer = Diarizer()
+            session = RecordingSession(recorder, stt=stt, room=room, session_id=session_id, diarizer=diarizer)
+            if diarizer is not None:
+                session.labeller = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarize")
+            # Audio streams to disk as it is captured: survives a crash and bounds memory
+            session.audio_path = os.path.join(RECORDINGS_DIR, f"recording_{_file_timestamp()}.flac")
+            try:
+                recorder.start(audio_path=session.audio_path)
+                storage.create_live_session(session.id, session.audio_path, room, session.started_at)
+            except Exception:
+                recorder.stop()
+                if os.path.exists(session.audio_path):
+                    os.remove(session.audio_path)
+                raise
+            if not any(s.active for s in self.sessions.values()):
+                self.fallback_stt = None  # free its RAM; reloaded if this meeting falls behind too
+            self.sessions[session.id] = session
+            if local:
+                self.current = self._last_local = session
+            session.running.set()
+            session.transcribe_thread = threading.Thread(target=self._transcribe_loop, args=(session,), daemon=True)
+            session.transcribe_thread.start()
+        return session
 
     def preload_whisper(self) -> None:
         """Load Whisper model in background so recording can start immediately on first use."""
         if self.stt is None:
-            self.stt = WhisperSTT()
-
-    def abort_recording(self) -> None:
-        """Stop recording without processing. Use when start fails or to reset state."""
-        self.running_flag[0] = False
-        if self.recorder:
-            self.recorder.stop()
-        if self.transcribe_thread:
-            self.transcribe_thread.join(timeout=2.0)
-        self.transcribe_thread = None
-
-    def pause_recording(self) -> None:
-        if self.recorder:
-            self.recorder.pause()
-
-    def resume_recording(self) -> None:
-        if self.recorder:
-            self.recorder.resume()
-
-    def _process_and_email(
-        self,
-        remaining: bytes | None,
-        transcript_buffer_copy: list[str],
-        samplerate: int,
-        duration_seconds: int,
-        job_id: str,
-    ) -> None:
-        """Background worker: transcribe, summarize, create meeting, email, delete files."""
-        stt = self.stt
-        if not stt:
+            readiness.set_state("whisper", "loading")
+            try:
+                if STT_WORKERS > 0:
+                    from stt_pool import SttPool
+                    self.stt = SttPool(STT_WORKERS)
+                else:
+                    from stt import WhisperSTT
+                    self.stt = WhisperSTT()
+            except Exception as e:
+                readiness.set_state("whisper", "error", str(e))
+                raise
+            workers = f" x{STT_WORKERS} workers" if STT_WORKERS > 0 else ""
+            readiness.set_state(
+                "whisper", "ready",
+                f"{self.stt.model_name}{workers} from {self.stt.model_source} in {self.stt.load_seconds:.1f}s",
+            )
+
+    def abort_recording(self, session_id: Optional[str] = None) -> None:
+        """Stop a session without processing (default: the local one). Use when start fails or to reset."""
+        with self._lock:
+            session = self._session(session_id)
+            if session is None or not session.active:
+                return
+            session.status = "aborted"
+            self.sessions.pop(session.id, None)
+            if session is self.current:
+                self.current = None
+            session.running.clear()
+            session.recorder.stop()
+        if session.transcribe_thread:
+            session.transcribe_thread.join(timeout=2.0)
+            if session.transcribe_thread.is_alive():
+                # Mid-chunk: it may still read the file and store a segment, so clean up after it
+                threading.Thread(target=self._discard, args=(session,), daemon=True).start()
+                return
+        self._discard(session)
+
+    @staticmethod
+    def _discard(session: RecordingSession) -> None:
+        """Delete an aborted session's recording and live transcript once its live loop is done."""
+        if session.transcribe_thread:
+            session.transcribe_thread.join()
+        if session.labeller:
+            session.labeller.shutdown(wait=True, cancel_futures=True)
+        if session.audio_path and os.path.exists(session.audio_path):
+            os.remove(session.audio_path)
+        storage.delete_live_session(session.id)
+
+    def pause_recording(self, session_id: Optional[str] = None) -> None:
+        with self._lock:
+            session = self._session(session_id)
+            if session is not None and session.status == "recording":
+                session.recorder.pause()
+                session.status = "paused"
+
+    def resume_recording(self, session_id: Optional[str] = None) -> None:
+        with self._lock:
+            session = self._session(session_id)
+            if session is not None and session.status == "paused":
+                session.recorder.resume()
+                session.status = "recording"
+
+    def _process_and_email(self, session: RecordingSession, job_id: str) -> None:
+        """Background worker: transcribe the rest of the recording, summarize, create meeting, queue email.
+
+        The session's live loop may still be mid-chunk: it is waited for so that text isn't
+        lost. Stage timings are stored per job (see /api/jobs/{id}/timings).
+        """
+        try:
+            with tracing.job(job_id), tracing.span("job.total"):
+                self._process(session, job_id)
+        finally:
+            with self._lock:
+                session.status = "done"
+                self.sessions.pop(session.id, None)
+
+    def _process(self, session: RecordingSession, job_id: str) -> None:
+        if session.transcribe_thread:
+            with tracing.span("stt.wait_live"):
+                session.transcribe_thread.join()
+            # Only now: a chunk read in flight at stop moves read_frame past its audio
+            session.start_frame = session.recorder.read_frame
+        if session.labeller:
+            # Its queued chunks come before the tail's, and the diarizer labels in order
+            with tracing.span("diarize.wait_live"):
+                session.labeller.shutdown(wait=True)
+        # The tail has no real-time limit to keep up with: full model, beam search and word timestamps
+        session.degrade_level = 0
+        transcript_buffer_copy = list(session.transcript_buffer)
+        timeline = list(session.timeline)
+        audio_path = session.audio_path
+        if not (session.stt or self.stt):
             storage.delete_processing_job(job_id)
             return
-        if remaining is not None:
-            text = stt.transcribe(remaining, samplerate=samplerate)
-            if text.strip():
-                transcript_buffer_copy.append(text.strip())
+        frames = samplerate = 0
+        read_failed = False
+        try:
+            # Read what the live loop didn't get to in chunks, so memory stays bounded
+            with tracing.span("stt.tail") as attrs:
+                for text, segments, frames, samplerate in self._transcribe_file(session):
+                    if text:
+                        transcript_buffer_copy.append(text)
+                        timeline.extend(segments)
+                attrs["audioSeconds"] = round(frames / samplerate, 1) if samplerate else 0
+        except Exception as e:
+            read_failed = True
+            print(f"Could not transcribe recording {audio_path}: {e}")
+        duration_seconds = session.duration_seconds
+        if duration_seconds is None:
+            duration_seconds = max(1, int(frames / samplerate)) if samplerate else 1
         full_text = "\n".join(transcript_buffer_copy).strip()
         storage.delete_processing_job(job_id)
         if not full_text:
+            if not read_failed and os.path.exists(audio_path):
+                os.remove(audio_path)  # nothing was said; keep it only if we couldn't read it
+                storage.delete_live_session(session.id)
             return
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = _file_timestamp()
         meeting_id = f"meeting-{int(datetime.now().timestamp() * 1000)}"
         created_at = datetime.now().isoformat()
         transcript_path = os.path.join(MEETINGS_DIR, f"transcript_{timestamp}.txt")
         with open(transcript_path, "w", encoding="utf-8") as f:
             f.write(full_text)
 
+        from summarizer import save_summary_as_pdf, summarize_transcript
+
+        # Inline-only email skips PDF rendering entirely
+        render_pdf = get_email_format() != "inline"
         pdf_temp_path = os.path.join(MEETINGS_DIR, f"summary_{timestamp}.pdf")
-        raw_result = save_summary_as_pdf(full_text, pdf_temp_path)
+        with tracing.span("summarize", words=len(full_text.split()), pdf=render_pdf):
+            if render_pdf:
+                raw_result = save_summary_as_pdf(full_text, pdf_temp_path)
+            else:
+                raw_result = summarize_transcript(full_text)
         if isinstance(raw_result, str):
             title = raw_result
             summary = ""
@@ -123,76 +437,259 @@ class RecorderService:
             decisions = raw_result.get("decisions", [])
             topics = raw_result.get("topics", [])
 
-        safe_title = _sanitize_filename(title)
-        pdf_path = os.path.join(MEETINGS_DIR, f"summary_{safe_title}_{timestamp}.pdf")
-        if pdf_temp_path != pdf_path:
-            os.rename(pdf_temp_path, pdf_path)
+        if render_pdf:
+            safe_title = _sanitize_filename(title)
+            pdf_path = os.path.join(MEETINGS_DIR, f"summary_{safe_title}_{timestamp}.pdf")
+            if pdf_temp_path != pdf_path:
+                os.rename(pdf_temp_path, pdf_path)
+            pdf_size = os.path.getsize(pdf_path) / (1024 * 1024)
+        else:
+            pdf_path = ""
+            pdf_size = 0
 
         transcript_size = os.path.getsize(transcript_path) / (1024 * 1024)
-        pdf_size = os.path.getsize(pdf_path) / (1024 * 1024)
-        audio_size = duration_seconds * 0.01
-
-        storage.create_meeting(
-            meeting_id=meeting_id,
-            created_at=created_at,
-            duration=duration_seconds,
-            title=title,
-            transcript_path=transcript_path,
-            pdf_path=pdf_path,
-            transcript=full_text,
-            summary=summary,
-            action_items=action_items,
-            decisions=decisions,
-            topics=topics,
-            audio_size_mb=audio_size,
-            transcript_size_mb=transcript_size,
-            pdf_size_mb=pdf_size,
-        )
+        # The recording moves in with the meeting's other files (kept for re-transcription,
+        # deleted with them once emailed or expired)
+        meeting_audio_path = os.path.join(MEETINGS_DIR, f"audio_{timestamp}.flac")
+        try:
+            os.replace(audio_path, meeting_audio_path)
+            audio_size = os.path.getsize(meeting_audio_path) / (1024 * 1024)
+        except OSError:
+            meeting_audio_path = ""
+            audio_size = 0
 
-        # Auto-email and delete files after success
+        tracing.current().meeting_id = meeting_id
+        with tracing.span("db.create_meeting"):
+            storage.create_meeting(
+                meeting_id=meeting_id,
+                created_at=created_at,
+                duration=duration_seconds,
+                title=title,
+                transcript_path=transcript_path,
+                pdf_path=pdf_path,
+                audio_path=meeting_audio_path,
+                transcript=full_text,
+                summary=summary,
+                action_items=action_items,
+                decisions=decisions,
+                topics=topics,
+                audio_size_mb=audio_size,
+                transcript_size_mb=transcript_size,
+                pdf_size_mb=pdf_size,
+                room=session.room,
+                timeline=timeline,
+            )
+        storage.delete_live_session(session.id)
+
+        # Queue auto-email; the outbox sender retries until delivered, then deletes files
         email_addr = storage.get_setting("email_address")
-        if email_addr and os.path.isfile(pdf_path):
+        if email_addr:
+            outbox.enqueue_meeting(meeting_id, email_addr)
+
+    def _transcribe_file(self, session: RecordingSession):
+        """Yield (text, timeline segments, frames read so far, samplerate) per chunk of the
+        recording after session.start_frame, in order.
+
+        With STT worker processes, up to one chunk per worker is in flight at a time.
+        """
+        stt = session.stt or self.stt
+        frames = 0
+        in_flight = getattr(stt, "workers", 1)
+        pending: deque = deque()
+        for chunk, samplerate in audiofile.iter_chunks(session.audio_path, TRANSCRIBE_CHUNK_SECONDS, session.start_frame):
+            offset = (session.start_frame + frames) / samplerate
+            frames += len(chunk)
+            if in_flight <= 1:
+                text, segments = self._transcribe_chunk(session, chunk, samplerate)
+                yield text, _timeline(segments, offset), frames, samplerate
+                continue
+            # Only the tail submits, and it always runs undegraded (see _process)
+            future = stt.submit(chunk, samplerate, segments=True, word_timestamps=WORD_TIMESTAMPS)
+            pending.append((future, chunk, offset, frames, samplerate))
+            if len(pending) >= in_flight:
+                yield self._finish_submitted(session, pending.popleft())
+        while pending:
+            yield self._finish_submitted(session, pending.popleft())
+
+    @staticmethod
+    def _finish_submitted(session: RecordingSession, submitted: tuple) -> tuple:
+        future, chunk, offset, frames, samplerate = submitted
+        segments = future.result()
+        if session.repeats is not None:
+            segments = session.repeats.filter(segments)
+        text = _chunk_text(segments, session.diarizer, chunk, samplerate)
+        return text, _timeline(segments, offset), frames, samplerate
+
+    def stop_recording(self, duration_seconds: int, session_id: Optional[str] = None) -> str:
+        """Stop a session (default: the local one) and process it in background. Returns the job id.
+
+        Raises RecordingStateError if it isn't recording. The local mic is free again on return.
+        """
+        with self._lock:
+            session = self._session(session_id)
+            if session is None or not session.active:
+                raise RecordingStateError("Not recording")
+            session.status = "processing"
+            if session is self.current:
+                self.current = None
+            session.running.clear()
+            session.recorder.stop()
+            # The live loop may be mid-chunk; the worker waits for it rather than dropping its text
+            # and takes the tail's start_frame from where it ended
+            session.duration_seconds = duration_seconds
+            session.job_id = f"job-{uuid.uuid4().hex[:12]}"
+
+        storage.create_processing_job(session.job_id, datetime.now().isoformat(), duration_seconds)
+        thread = threading.Thread(target=self._process_and_email, args=(session, session.job_id), daemon=True)
+        thread.start()
+        return session.job_id
+
+    def recover_interrupted(self) -> int:
+        """Process recordings left in RECORDINGS_DIR by a crash or power loss. Call once Whisper is loaded.
+
+        Any processing job rows are stale at this point (their worker died with the process).
+        A recording's stored live transcript is reused: only the audio after it is transcribed.
+        Returns the number of recordings recovered.
+        """
+        storage.clear_processing_jobs()
+        with self._lock:
+            live = {s.audio_path for s in self.sessions.values()}
+        stored = {}
+        for row in storage.list_live_sessions():
+            if os.path.exists(row["audioPath"]):
+                stored[row["audioPath"]] = row
+            elif row["audioPath"] not in live:
+                storage.delete_live_session(row["id"])
+        recovered = 0
+        for name in sorted(os.listdir(RECORDINGS_DIR)):
+            path = os.path.join(RECORDINGS_DIR, name)
+            if not name.endswith(".flac") or path in live:
+                continue
+            diarizer = None
+            if DIARIZATION_ENABLED:
+                from diarizer import Diarizer
+                diarizer = Diarizer()
+            row = stored.get(path)
+            session = RecordingSession(
+                None,
+                room=row["room"] if row else "",
+                session_id=row["id"] if row else None,
+                diarizer=diarizer,
+            )
+            session.status = "processing"
+            session.audio_path = path
+            if row:
+                segments = storage.get_live_segments(row["id"])
+                session.transcript_buffer = [seg["text"] for seg in segments]
+                session.timeline = [timed for seg in segments for timed in seg["timeline"]]
+                session.start_frame = segments[-1]["endFrame"] if segments else 0
+                session.started_at = row["startedAt"]
+                session.duration_seconds = max(1, int(os.path.getmtime(path) - row["startedAt"]))
+            session.job_id = f"job-{uuid.uuid4().hex[:12]}"
+            with self._lock:
+                self.sessions[session.id] = session
+            storage.create_processing_job(session.job_id, datetime.now().isoformat(), 0)
             try:
-                send_meeting_pdf(
-                    title,
-                    pdf_path,
-                    email_addr,
-                    meeting_created_at=created_at,
-                    meeting_duration=duration_seconds,
-                )
-                emailed_at = datetime.now().isoformat()
-                storage.update_meeting_emailed(meeting_id, True, emailed_at=emailed_at)
-                storage.delete_meeting_files(meeting_id)
-            except Exception:
-                pass  # Keep files if email fails; user can retry from Past Meetings
+                self._process_and_email(session, session.job_id)
+                recovered += 1
+            except Exception as e:
+                storage.delete_processing_job(session.job_id)
+                print(f"Recovering {name} failed: {e}")
+        return recovered
 
-    def stop_recording(self, duration_seconds: int) -> Optional[str]:
-        """Stop recording and process in background. Returns job_id immediately."""
-        if not self.recorder or not self.stt:
-            return None
-        self.running_flag[0] = False
-        self.recorder.stop()
-        if self.transcribe_thread:
-            self.transcribe_thread.join(timeout=2.0)
-        remaining = self.recorder.pop_all()
-        transcript_buffer_copy = list(self.transcript_buffer)
-        samplerate = self.recorder.samplerate if self.recorder else 16000
+    def retranscribe(self, meeting_id: str) -> Optional[str]:
+        """Re-transcribe a meeting's stored recording with batched inference, in background.
 
+        Replaces the transcript (DB and file); notes are left as they are. Returns a job id whose
+        timings (incl. throughput) are at /api/jobs/{id}/timings, or None if there is no audio
+        (deleted with the other files once the notes are emailed, or by the retention sweep).
+        """
+        meeting = storage.get_meeting(meeting_id)
+        if not meeting or not meeting["audioPath"] or not os.path.exists(meeting["audioPath"]):
+            return None
+        if self.stt is None:
+            self.preload_whisper()
         job_id = f"job-{uuid.uuid4().hex[:12]}"
-        created_at = datetime.now().isoformat()
-        storage.create_processing_job(job_id, created_at, duration_seconds)
 
-        thread = threading.Thread(
-            target=self._process_and_email,
-            args=(remaining, transcript_buffer_copy, samplerate, duration_seconds, job_id),
-            daemon=True,
-        )
-        thread.start()
+        def _run():
+            with self._retranscribe_lock, tracing.job(job_id, meeting_id=meeting_id):
+                try:
+                    result = self.stt.transcribe_batched(meeting["audioPath"])
+                except Exception as e:
+                    print(f"Re-transcribing {meeting_id} failed: {e}")
+                    return
+                print(f"Re-transcribed {meeting_id}: {result['audioSeconds']:.0f}s of audio in "
+                      f"{result['wallSeconds']:.0f}s ({result['throughput']:.1f} audio-s/s)")
+                if not result["text"]:
+                    return  # keep the old transcript rather than blanking it
+                transcript_path = meeting["transcriptPath"] or os.path.join(
+                    MEETINGS_DIR, f"transcript_{meeting_id}.txt"
+                )
+                with open(transcript_path, "w", encoding="utf-8") as f:
+                    f.write(result["text"])
+                storage.update_meeting_transcript(
+                    meeting_id, result["text"], os.path.getsize(transcript_path) / (1024 * 1024),
+                    timeline=result["segments"],
+                )
+
+        threading.Thread(target=_run, daemon=True).start()
         return job_id
 
     @property
     def state(self) -> str:
-        return self.recorder.state.name if self.recorder else "IDLE"
+        """State of the local mic: IDLE, RECORDING or PAUSED."""
+        current = self.current
+        return current.recorder.state.name if current else "IDLE"
+
+    def list_sessions(self) -> list:
+        with self._lock:
+            sessions = list(self.sessions.values())
+        return [
+            {
+                "id": s.id,
+                "status": s.status,
+                "room": s.room,
+                "startedAt": s.started_at,
+                "jobId": s.job_id,
+            }
+            for s in sessions
+        ]
+
+    def get_status(self, session_id: Optional[str] = None) -> dict:
+        """Session state plus transcription health (default: the local mic, for /api/recording/status)."""
+        session = self._session(session_id)
+        recorder = session.recorder if session else None
+        recording = session is not None and session.active
+        with self._lock:
+            processing = sum(1 for s in self.sessions.values() if s.status == "processing")
+        return {
+            "state": recorder.state.name if recording else "IDLE",
+            "sessionId": session.id if session else None,
+            "lagSeconds": round(recorder.backlog_seconds(), 1) if recording else 0,
+            "rtf": round(session.rtf, 2) if session and session.rtf is not None else None,
+            "degraded": DEGRADE_LEVELS[session.degrade_level] if session else DEGRADE_LEVELS[0],
+            "inputOverflows": recorder.input_overflows if recorder else 0,
+            "droppedSeconds": round(recorder.dropped_frames / recorder.samplerate, 1) if recorder else 0,
+            "processing": processing,
+        }
+
+    def get_live_transcript(self, session_id: Optional[str] = None) -> str:
+        """A session's live transcript (default: the local one, or the last one after stop)."""
+        session = self._session(session_id) or (None if session_id else self._last_local)
+        return "\n".join(session.transcript_buffer).strip() if session else ""
+
+    def get_live_segments(self, after_seq: int = 0, session_id: Optional[str] = None) -> list:
+        """A session's live segments after after_seq, as [{seq, text}] (cost is the new text only).
 
-    def get_live_transcript(self) -> str:
-        return "\n".join(self.transcript_buffer).strip()
+        Sessions no longer held here (processed, or from before a restart) are read from storage.
+        """
+        session = self._session(session_id) or (None if session_id else self._last_local)
+        if session is None:
+            if not session_id:
+                return []
+            return [{"seq": seg["seq"], "text": seg["text"]} for seg in storage.get_live_segments(session_id, after_seq)]
+        after_seq = max(0, after_seq)
+        return [
+            {"seq": seq, "text": text}
+            for seq, text in enumerate(session.transcript_buffer[after_seq:], start=after_seq + 1)
+        ]
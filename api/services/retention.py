@@ -0,0 +1,136 @@
+"""Retention: age, quota and emailed-metadata-only eviction, run by a background sweeper."""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from api.services import storage
+
+# Seconds between background sweeps.
+RETENTION_SWEEP_SECONDS = 3600
+# Meetings deleted per transaction while evicting.
+RETENTION_BATCH_SIZE = 20
+# Pipeline timing spans (/api/jobs/{id}/timings) are kept this long regardless of meetings.
+JOB_SPANS_MAX_AGE_DAYS = 30
+# VACUUM rewrites the whole database file (SD card wear): only after deletions have left at
+# least this much free space in it, and at most once per interval.
+COMPACT_MIN_FREE_MB = 8
+COMPACT_MIN_INTERVAL_SECONDS = 86400
+
+logger = logging.getLogger(__name__)
+
+_sweep_lock = threading.Lock()
+_sweeper_thread: Optional[threading.Thread] = None
+_last_compact = 0.0
+
+
+def get_policy() -> dict:
+    """Return the retention policy from settings; None / False means the rule is off."""
+    max_age = storage.get_setting("retention_max_age_days")
+    max_mb = storage.get_setting("retention_max_mb")
+    return {
+        "maxAgeDays": int(max_age) if max_age else None,
+        "maxMB": float(max_mb) if max_mb else None,
+        "emailedMetadataOnly": storage.get_setting("retention_emailed_metadata_only") == "true",
+    }
+
+
+def set_policy(max_age_days: int | None, max_mb: float | None, emailed_metadata_only: bool) -> dict:
+    storage.set_setting("retention_max_age_days", str(max_age_days) if max_age_days else "")
+    storage.set_setting("retention_max_mb", str(max_mb) if max_mb else "")
+    storage.set_setting("retention_emailed_metadata_only", "true" if emailed_metadata_only else "false")
+    return get_policy()
+
+
+def _evict_older_than(days: int) -> int:
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    deleted = 0
+    while True:
+        batch = storage.list_oldest_meetings(RETENTION_BATCH_SIZE, created_before=cutoff)
+        if not batch:
+            return deleted
+        deleted += storage.delete_meetings([m["id"] for m in batch])
+
+
+def _excess_mb(max_mb: float) -> float:
+    """Usage over max_mb, not counting free pages in the database: deleted rows already freed
+    them, and the next compaction returns them to the filesystem."""
+    stats = storage.refresh_storage_stats()
+    return stats["filesMB"] + stats["dbMB"] - storage.db_free_mb() - max_mb
+
+
+def _evict_to_quota(max_mb: float) -> int:
+    """Delete oldest meetings until their size covers the excess over max_mb.
+
+    Nothing is evicted if other data (spans, outbox, live transcripts) keeps usage over the
+    quota even with every meeting gone.
+    """
+    excess = _excess_mb(max_mb)
+    if excess <= 0:
+        return 0
+    if excess > storage.meetings_size_mb():
+        logger.warning("Storage is %.0f MB over the %.0f MB quota; evicting meetings can't cover that", excess, max_mb)
+        return 0
+    deleted = 0
+    while excess > 0:
+        batch = storage.list_oldest_meetings(RETENTION_BATCH_SIZE)
+        if not batch:
+            break
+        victims = []
+        for meeting in batch:
+            victims.append(meeting["id"])
+            excess -= meeting["sizeMB"]
+            if excess <= 0:
+                break
+        deleted += storage.delete_meetings(victims)
+    return deleted
+
+
+def _compact_if_due() -> bool:
+    """Return deleted rows' pages to the filesystem, if enough are free and it's been a while."""
+    global _last_compact
+    if time.time() - _last_compact < COMPACT_MIN_INTERVAL_SECONDS:
+        return False
+    if storage.db_free_mb() < COMPACT_MIN_FREE_MB:
+        return False
+    storage.compact_db()
+    _last_compact = time.time()
+    return True
+
+
+def sweep() -> dict:
+    """Apply the retention policy once. Emailed meetings are stripped first, then age, then quota."""
+    policy = get_policy()
+    result = {"stripped": 0, "expired": 0, "evicted": 0}
+    with _sweep_lock:
+        if policy["emailedMetadataOnly"]:
+            result["stripped"] = storage.strip_emailed_meetings()
+        if policy["maxAgeDays"]:
+            result["expired"] = _evict_older_than(policy["maxAgeDays"])
+        if policy["maxMB"]:
+            result["evicted"] = _evict_to_quota(policy["maxMB"])
+        storage.prune_job_spans(time.time() - JOB_SPANS_MAX_AGE_DAYS * 86400)
+        if any(result.values()):
+            _compact_if_due()
+    if any(result.values()):
+        storage.refresh_storage_stats()
+    return result
+
+
+def start_sweeper() -> None:
+    """Start the background thread that applies the retention policy periodically."""
+    global _sweeper_thread
+    if _sweeper_thread and _sweeper_thread.is_alive():
+        return
+
+    def _loop():
+        while True:
+            try:
+                sweep()
+            except Exception:
+                logger.exception("Retention sweep failed")
+            time.sleep(RETENTION_SWEEP_SECONDS)
+
+    _sweeper_thread = threading.Thread(target=_loop, daemon=True)
+    _sweeper_thread.start()
@@ -2,10 +2,36 @@
 import json
 import os
 import re
+import shutil
 import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
 from typing import Optional
 
-from config import MEETINGS_DIR, DB_PATH
+from config import DATA_DIR, MEETINGS_DIR, DB_PATH
+
+
+# Child tables for list fields, keyed by the meetings column they replace.
+_ITEM_TABLES = {
+    "action_items": "meeting_action_items",
+    "decisions": "meeting_decisions",
+    "topics": "meeting_topics",
+}
+
+# PRAGMA user_version after action items / decisions / topics moved to child tables.
+_SCHEMA_VERSION_ITEMS = 1
+# PRAGMA user_version after transcripts moved to the compressed transcript_z column.
+_SCHEMA_VERSION_TRANSCRIPT_Z = 2
+
+# Seconds between background refreshes of the cached storage stats.
+STORAGE_STATS_REFRESH_SECONDS = 60
+
+_MB = 1024 * 1024
+
+# zlib level for stored transcripts: plain text compresses ~3-4x, level 6 is cheap on a Pi.
+TRANSCRIPT_COMPRESSION_LEVEL = 6
 
 
 def _init_db() -> None:
@@ -30,7 +56,9 @@ def _init_db() -> None:
                 pdf_size_mb REAL DEFAULT 0,
                 exported_usb INTEGER DEFAULT 0,
                 emailed INTEGER DEFAULT 0,
-                emailed_at TEXT
+                emailed_at TEXT,
+                transcript_z BLOB,
+                audio_path TEXT DEFAULT ''
             )
         """)
         try:
@@ -38,6 +66,26 @@ def _init_db() -> None:
             conn.commit()
         except sqlite3.OperationalError:
             pass
+        try:
+            conn.execute("ALTER TABLE meetings ADD COLUMN transcript_z BLOB")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass
+        try:
+            conn.execute("ALTER TABLE meetings ADD COLUMN audio_path TEXT DEFAULT ''")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass
+        try:
+            conn.execute("ALTER TABLE meetings ADD COLUMN room TEXT DEFAULT ''")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass
+        try:
+            conn.execute("ALTER TABLE meetings ADD COLUMN timeline_z BLOB")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass
         conn.execute("""
             CREATE TABLE IF NOT EXISTS processing_jobs (
                 id TEXT PRIMARY KEY,
@@ -51,11 +99,186 @@ def _init_db() -> None:
                 value TEXT NOT NULL
             )
         """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS email_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                meeting_id TEXT,
+                recipient TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+        """)
+        try:
+            # Messages of a split email ("part N of M") already delivered; a retry resumes after them
+            conn.execute("ALTER TABLE email_outbox ADD COLUMN parts_sent INTEGER NOT NULL DEFAULT 0")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (status, next_attempt_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_spans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                meeting_id TEXT,
+                name TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                duration_ms REAL NOT NULL,
+                attrs TEXT NOT NULL DEFAULT '{}'
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_spans_job ON job_spans (job_id)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_spans_meeting ON job_spans (meeting_id)")
+        # Live transcript of each recording in progress, one row per transcribed chunk (append-only)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS live_sessions (
+                id TEXT PRIMARY KEY,
+                audio_path TEXT NOT NULL,
+                room TEXT NOT NULL DEFAULT '',
+                started_at REAL NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS live_segments (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                end_frame INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            )
+        """)
+        try:
+            conn.execute("ALTER TABLE live_segments ADD COLUMN timeline TEXT NOT NULL DEFAULT '[]'")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_meetings_created_at ON meetings (created_at)")
+        for table in _ITEM_TABLES.values():
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    meeting_id TEXT NOT NULL REFERENCES meetings (id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    done INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_meeting ON {table} (meeting_id, position)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_meeting_action_items_done ON meeting_action_items (done, meeting_id)")
         conn.commit()
+        _migrate_json_items(conn)
+        _migrate_compress_transcripts(conn)
     finally:
         conn.close()
 
 
+def _migrate_json_items(conn: sqlite3.Connection) -> None:
+    """Move legacy JSON list columns into child tables (one-time, single transaction)."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION_ITEMS:
+        return
+    with conn:
+        rows = conn.execute("SELECT id, action_items, decisions, topics FROM meetings").fetchall()
+        for row in rows:
+            meeting_id = row[0]
+            for i, column in enumerate(_ITEM_TABLES):
+                _insert_items(conn, meeting_id, column, _json_list(row[i + 1]))
+        conn.execute("UPDATE meetings SET action_items = '[]', decisions = '[]', topics = '[]'")
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION_ITEMS}")
+
+
+def _migrate_compress_transcripts(conn: sqlite3.Connection) -> None:
+    """Compress legacy plain-text transcripts into transcript_z (one-time, single transaction)."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION_TRANSCRIPT_Z:
+        return
+    with conn:
+        _compress_plain_transcripts(conn)
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION_TRANSCRIPT_Z}")
+
+
+def _compress_plain_transcripts(conn: sqlite3.Connection) -> int:
+    rows = conn.execute("SELECT id, transcript FROM meetings WHERE transcript != ''").fetchall()
+    conn.executemany(
+        "UPDATE meetings SET transcript_z = ?, transcript = '' WHERE id = ?",
+        [(_compress_text(text), meeting_id) for meeting_id, text in rows],
+    )
+    return len(rows)
+
+
+def _compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), TRANSCRIPT_COMPRESSION_LEVEL)
+
+
+def _decompress_text(data: bytes | None) -> str:
+    if not data:
+        return ""
+    return zlib.decompress(data).decode("utf-8")
+
+
+def _pack_timeline(timeline: list) -> bytes | None:
+    """Segment and word timestamps as compressed columns (milliseconds, texts in parallel lists)."""
+    if not timeline:
+        return None
+    columns = {
+        "segStart": [], "segEnd": [], "segText": [],
+        "wordSeg": [], "wordStart": [], "wordEnd": [], "wordText": [],
+    }
+    for i, (start, end, text, words) in enumerate(timeline):
+        columns["segStart"].append(round(start * 1000))
+        columns["segEnd"].append(round(end * 1000))
+        columns["segText"].append(text.strip())
+        for word_start, word_end, word in words:
+            columns["wordSeg"].append(i)
+            columns["wordStart"].append(round(word_start * 1000))
+            columns["wordEnd"].append(round(word_end * 1000))
+            columns["wordText"].append(word.strip())
+    return _compress_text(json.dumps(columns, separators=(",", ":")))
+
+
+def _unpack_timeline(data: bytes, start: float | None = None, end: float | None = None) -> list:
+    """Segments overlapping [start, end) seconds, each {start, end, text, words: [{start, end, word}]}."""
+    columns = json.loads(_decompress_text(data))
+    start_ms = -1 if start is None else start * 1000
+    end_ms = float("inf") if end is None else end * 1000
+    segments = {}
+    for i, (seg_start, seg_end) in enumerate(zip(columns["segStart"], columns["segEnd"])):
+        if seg_end > start_ms and seg_start < end_ms:
+            segments[i] = {"start": seg_start / 1000, "end": seg_end / 1000, "text": columns["segText"][i], "words": []}
+    for seg, word_start, word_end, word in zip(
+        columns["wordSeg"], columns["wordStart"], columns["wordEnd"], columns["wordText"]
+    ):
+        if seg in segments:
+            segments[seg]["words"].append({"start": word_start / 1000, "end": word_end / 1000, "word": word})
+    return list(segments.values())
+
+
+def _insert_items(conn: sqlite3.Connection, meeting_id: str, column: str, items: list) -> None:
+    table = _ITEM_TABLES[column]
+    conn.executemany(
+        f"INSERT INTO {table} (meeting_id, position, text) VALUES (?, ?, ?)",
+        [(meeting_id, pos, str(text)) for pos, text in enumerate(items)],
+    )
+
+
+def _load_items(conn: sqlite3.Connection, meeting_ids: list[str] | None = None) -> dict:
+    """Return {meeting_id: {column: [text, ...]}} for the given meetings (all when None)."""
+    items: dict = {}
+    for column, table in _ITEM_TABLES.items():
+        if meeting_ids is None:
+            rows = conn.execute(f"SELECT meeting_id, text FROM {table} ORDER BY meeting_id, position")
+        else:
+            placeholders = ",".join("?" * len(meeting_ids))
+            rows = conn.execute(
+                f"SELECT meeting_id, text FROM {table} WHERE meeting_id IN ({placeholders}) ORDER BY meeting_id, position",
+                meeting_ids,
+            )
+        for meeting_id, text in rows:
+            items.setdefault(meeting_id, {}).setdefault(column, []).append(text)
+    return items
+
+
 def _json_list(value: str) -> list:
     if not value:
         return []
@@ -65,10 +288,6 @@ def _json_list(value: str) -> list:
         return []
 
 
-def _serialize_list(lst: list) -> str:
-    return json.dumps(lst)
-
-
 def create_meeting(
     meeting_id: str,
     created_at: str,
@@ -84,62 +303,82 @@ def create_meeting(
     audio_size_mb: float = 0,
     transcript_size_mb: float = 0,
     pdf_size_mb: float = 0,
+    audio_path: str = "",
+    room: str = "",
+    timeline: list | None = None,
 ) -> dict:
     _init_db()
     conn = sqlite3.connect(DB_PATH)
     try:
-        conn.execute(
-            """
-            INSERT INTO meetings (
-                id, created_at, duration, title, transcript_path, pdf_path,
-                transcript, summary, action_items, decisions, topics,
-                audio_size_mb, transcript_size_mb, pdf_size_mb, exported_usb, emailed
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0)
-            """,
-            (
-                meeting_id, created_at, duration, title, transcript_path, pdf_path,
-                transcript, summary, _serialize_list(action_items), _serialize_list(decisions), _serialize_list(topics),
-                audio_size_mb, transcript_size_mb, pdf_size_mb,
-            ),
-        )
-        conn.commit()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO meetings (
+                    id, created_at, duration, title, transcript_path, pdf_path, audio_path,
+                    transcript, transcript_z, summary, action_items, decisions, topics,
+                    audio_size_mb, transcript_size_mb, pdf_size_mb, exported_usb, emailed, room, timeline_z
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, '', ?, ?, '[]', '[]', '[]', ?, ?, ?, 0, 0, ?, ?)
+                """,
+                (
+                    meeting_id, created_at, duration, title, transcript_path, pdf_path, audio_path,
+                    _compress_text(transcript), summary, audio_size_mb, transcript_size_mb, pdf_size_mb, room,
+                    _pack_timeline(timeline),
+                ),
+            )
+            _insert_items(conn, meeting_id, "action_items", action_items)
+            _insert_items(conn, meeting_id, "decisions", decisions)
+            _insert_items(conn, meeting_id, "topics", topics)
     finally:
         conn.close()
+    _track_files_mb(audio_size_mb + transcript_size_mb + pdf_size_mb)
     return get_meeting(meeting_id)
 
 
-def get_meeting(meeting_id: str) -> Optional[dict]:
+# Meeting columns read for API dicts; the transcript blob is only selected on request.
+_MEETING_COLUMNS = (
+    "id, created_at, duration, title, transcript_path, pdf_path, audio_path, summary, "
+    "audio_size_mb, transcript_size_mb, pdf_size_mb, exported_usb, emailed, emailed_at, room"
+)
+
+
+def get_meeting(meeting_id: str, include_transcript: bool = False) -> Optional[dict]:
+    """Return meeting dict; the transcript is decompressed only when include_transcript is set."""
     _init_db()
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     try:
-        row = conn.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+        columns = _MEETING_COLUMNS + (", transcript_z" if include_transcript else "")
+        row = conn.execute(f"SELECT {columns} FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
         if not row:
             return None
-        return _row_to_meeting(row)
+        meeting = _row_to_meeting(row, _load_items(conn, [meeting_id]).get(meeting_id, {}))
+        if include_transcript:
+            meeting["transcript"] = _decompress_text(row["transcript_z"])
+        return meeting
     finally:
         conn.close()
 
 
-def _row_to_meeting(row: sqlite3.Row) -> dict:
+def _row_to_meeting(row: sqlite3.Row, items: dict) -> dict:
     return {
         "id": row["id"],
         "createdAt": row["created_at"],
         "duration": row["duration"],
         "title": row["title"] or "",
-        "transcript": row["transcript"],
         "summary": row["summary"],
-        "actionItems": _json_list(row["action_items"]),
-        "decisions": _json_list(row["decisions"]),
-        "topics": _json_list(row["topics"]),
+        "actionItems": items.get("action_items", []),
+        "decisions": items.get("decisions", []),
+        "topics": items.get("topics", []),
         "exportedUsb": bool(row["exported_usb"]),
         "emailed": bool(row["emailed"]),
-        "emailedAt": row["emailed_at"] if "emailed_at" in row.keys() else None,
+        "emailedAt": row["emailed_at"],
         "audioSize": row["audio_size_mb"] or 0,
         "transcriptSize": row["transcript_size_mb"] or 0,
         "pdfSize": row["pdf_size_mb"] or 0,
         "transcriptPath": row["transcript_path"],
         "pdfPath": row["pdf_path"],
+        "audioPath": row["audio_path"] or "",
+        "room": row["room"] or "",
     }
 
 
@@ -180,6 +419,17 @@ def list_processing_jobs() -> list:
         conn.close()
 
 
+def clear_processing_jobs() -> None:
+    """Drop all processing jobs (at startup nothing can still be processing them)."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute("DELETE FROM processing_jobs")
+        conn.commit()
+    finally:
+        conn.close()
+
+
 def delete_processing_job(job_id: str) -> bool:
     _init_db()
     conn = sqlite3.connect(DB_PATH)
@@ -191,13 +441,170 @@ def delete_processing_job(job_id: str) -> bool:
         conn.close()
 
 
+def get_meeting_timeline(meeting_id: str, start: float | None = None, end: float | None = None) -> Optional[list]:
+    """Timed segments of a meeting overlapping [start, end) seconds; None if it has no timeline."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        row = conn.execute("SELECT timeline_z FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+    finally:
+        conn.close()
+    if not row or not row[0]:
+        return None
+    return _unpack_timeline(row[0], start, end)
+
+
+def create_live_session(session_id: str, audio_path: str, room: str, started_at: float) -> None:
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute(
+            "INSERT INTO live_sessions (id, audio_path, room, started_at) VALUES (?, ?, ?, ?)",
+            (session_id, audio_path, room, started_at),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def append_live_segment(session_id: str, seq: int, end_frame: int, text: str, timeline: list) -> None:
+    """Append a transcribed chunk; end_frame is how far into the recording it transcribed and
+    timeline its Whisper segments as (start, end, text, words)."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute(
+            "INSERT INTO live_segments (session_id, seq, end_frame, text, timeline) VALUES (?, ?, ?, ?, ?)",
+            (session_id, seq, end_frame, text, json.dumps(timeline)),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_live_segments(session_id: str, after_seq: int = 0) -> list:
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        rows = conn.execute(
+            "SELECT seq, end_frame, text, timeline FROM live_segments WHERE session_id = ? AND seq > ? ORDER BY seq",
+            (session_id, after_seq),
+        ).fetchall()
+        return [{"seq": r[0], "endFrame": r[1], "text": r[2], "timeline": json.loads(r[3])} for r in rows]
+    finally:
+        conn.close()
+
+
+def list_live_sessions() -> list:
+    """Live transcripts still stored: recordings in progress, or interrupted before processing."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        rows = conn.execute("SELECT id, audio_path, room, started_at FROM live_sessions").fetchall()
+        return [{"id": r[0], "audioPath": r[1], "room": r[2], "startedAt": r[3]} for r in rows]
+    finally:
+        conn.close()
+
+
+def delete_live_session(session_id: str) -> None:
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        with conn:
+            conn.execute("DELETE FROM live_segments WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM live_sessions WHERE id = ?", (session_id,))
+    finally:
+        conn.close()
+
+
 def list_meetings() -> list:
     _init_db()
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     try:
-        rows = conn.execute("SELECT * FROM meetings ORDER BY created_at DESC").fetchall()
-        return [_row_to_meeting(r) for r in rows]
+        rows = conn.execute(f"SELECT {_MEETING_COLUMNS} FROM meetings ORDER BY created_at DESC").fetchall()
+        items = _load_items(conn)
+        return [_row_to_meeting(r, items.get(r["id"], {})) for r in rows]
+    finally:
+        conn.close()
+
+
+def list_open_action_items(days: int | None = None) -> list:
+    """Open (not done) action items, newest meeting first; optionally only the last `days` days."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        query = """
+            SELECT a.id, a.meeting_id, a.text, m.title, m.created_at
+            FROM meeting_action_items a JOIN meetings m ON m.id = a.meeting_id
+            WHERE a.done = 0
+        """
+        params: tuple = ()
+        if days is not None:
+            query += " AND m.created_at >= ?"
+            params = ((datetime.now() - timedelta(days=days)).isoformat(),)
+        query += " ORDER BY m.created_at DESC, a.position"
+        return [
+            {
+                "id": r["id"],
+                "meetingId": r["meeting_id"],
+                "meetingTitle": r["title"] or "",
+                "createdAt": r["created_at"],
+                "text": r["text"],
+            }
+            for r in conn.execute(query, params)
+        ]
+    finally:
+        conn.close()
+
+
+def update_action_item_done(item_id: int, done: bool) -> bool:
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.execute("UPDATE meeting_action_items SET done = ? WHERE id = ?", (1 if done else 0, item_id))
+        conn.commit()
+        return cur.rowcount > 0
+    finally:
+        conn.close()
+
+
+def get_weekly_stats(weeks: int = 12) -> list:
+    """Per-week meeting, action item, decision and topic counts (weeks start on Monday)."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        cutoff = (datetime.now() - timedelta(weeks=weeks)).isoformat()
+        rows = conn.execute(
+            """
+            SELECT date(m.created_at, '-6 days', 'weekday 1') AS week_start,
+                   COUNT(*) AS meetings,
+                   COALESCE(SUM(m.duration), 0) AS duration,
+                   COALESCE(SUM((SELECT COUNT(*) FROM meeting_action_items a WHERE a.meeting_id = m.id)), 0) AS action_items,
+                   COALESCE(SUM((SELECT COUNT(*) FROM meeting_action_items a WHERE a.meeting_id = m.id AND a.done = 0)), 0) AS open_action_items,
+                   COALESCE(SUM((SELECT COUNT(*) FROM meeting_decisions d WHERE d.meeting_id = m.id)), 0) AS decisions,
+                   COALESCE(SUM((SELECT COUNT(*) FROM meeting_topics t WHERE t.meeting_id = m.id)), 0) AS topics
+            FROM meetings m
+            WHERE m.created_at >= ?
+            GROUP BY week_start
+            ORDER BY week_start DESC
+            """,
+            (cutoff,),
+        ).fetchall()
+        return [
+            {
+                "weekStart": r["week_start"],
+                "meetings": r["meetings"],
+                "duration": r["duration"],
+                "actionItems": r["action_items"],
+                "openActionItems": r["open_action_items"],
+                "decisions": r["decisions"],
+                "topics": r["topics"],
+            }
+            for r in rows
+        ]
     finally:
         conn.close()
 
@@ -228,53 +635,461 @@ def update_meeting_emailed(meeting_id: str, emailed: bool, emailed_at: str | Non
         conn.close()
 
 
+def update_meeting_transcript(
+    meeting_id: str, transcript: str, transcript_size_mb: float, timeline: list | None = None
+) -> bool:
+    """Replace a meeting's transcript and timeline (e.g. after re-transcription). Returns False if it's gone."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        with conn:
+            row = conn.execute("SELECT transcript_size_mb FROM meetings WHERE id = ?", (meeting_id,)).fetchone()
+            if not row:
+                return False
+            conn.execute(
+                "UPDATE meetings SET transcript = '', transcript_z = ?, timeline_z = ?, transcript_size_mb = ? "
+                "WHERE id = ?",
+                (_compress_text(transcript), _pack_timeline(timeline), transcript_size_mb, meeting_id),
+            )
+    finally:
+        conn.close()
+    _track_files_mb(transcript_size_mb - (row[0] or 0))
+    return True
+
+
 def delete_meeting_files(meeting_id: str) -> None:
-    """Delete transcript and PDF files after successful email. Keep meeting row."""
+    """Delete transcript, PDF and audio files after successful email. Keep meeting row."""
     meeting = get_meeting(meeting_id)
     if not meeting:
         return
-    for path in (meeting.get("transcriptPath"), meeting.get("pdfPath")):
+    removed_mb = 0.0
+    cleared = []
+    for path, column, size_mb in (
+        (meeting.get("transcriptPath"), "transcript_size_mb", meeting["transcriptSize"]),
+        (meeting.get("pdfPath"), "pdf_size_mb", meeting["pdfSize"]),
+        (meeting.get("audioPath"), "audio_size_mb", meeting["audioSize"]),
+    ):
         if path and os.path.isfile(path):
             try:
                 os.remove(path)
             except OSError:
                 pass
+            if os.path.isfile(path):
+                continue  # still there: keep counting it, a later sweep retries
+        # Gone now or already (deleted elsewhere): zero the size so it isn't selected again
+        if size_mb:
+            removed_mb += size_mb
+            cleared.append(column)
+    if not cleared:
+        return
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute(f"UPDATE meetings SET {', '.join(c + ' = 0' for c in cleared)} WHERE id = ?", (meeting_id,))
+        conn.commit()
+    finally:
+        conn.close()
+    _track_files_mb(-removed_mb)
 
 
 def delete_meeting(meeting_id: str) -> bool:
+    """Delete a meeting row, its items, its pending emails and any files still on disk."""
+    delete_meeting_files(meeting_id)
     _init_db()
     conn = sqlite3.connect(DB_PATH)
     try:
-        cur = conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+        row = conn.execute(
+            "SELECT audio_size_mb + transcript_size_mb + pdf_size_mb FROM meetings WHERE id = ?", (meeting_id,)
+        ).fetchone()
+        with conn:
+            for table in _ITEM_TABLES.values():
+                conn.execute(f"DELETE FROM {table} WHERE meeting_id = ?", (meeting_id,))
+            # Its queued emails could only fail now
+            conn.execute("DELETE FROM email_outbox WHERE meeting_id = ? AND status = 'pending'", (meeting_id,))
+            cur = conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+    finally:
+        conn.close()
+    if row and row[0]:
+        _track_files_mb(-row[0])
+    return cur.rowcount > 0
+
+
+# What deleting a meeting frees: its files plus the stored transcript and timeline.
+_MEETING_SIZE_MB = (
+    "audio_size_mb + transcript_size_mb + pdf_size_mb "
+    "+ (COALESCE(LENGTH(transcript_z), 0) + COALESCE(LENGTH(timeline_z), 0)) / 1048576.0"
+)
+
+
+def meetings_size_mb() -> float:
+    """Total _MEETING_SIZE_MB of all meetings: the most that evicting meetings can free."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return conn.execute(f"SELECT COALESCE(SUM({_MEETING_SIZE_MB}), 0) FROM meetings").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def list_oldest_meetings(limit: int, created_before: str | None = None) -> list:
+    """Oldest meetings first as {id, createdAt, sizeMB}; sizeMB covers files plus the stored transcript."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        query = f"SELECT id, created_at, {_MEETING_SIZE_MB} AS size_mb FROM meetings"
+        params: tuple = ()
+        if created_before is not None:
+            query += " WHERE created_at < ?"
+            params = (created_before,)
+        query += " ORDER BY created_at LIMIT ?"
+        rows = conn.execute(query, params + (limit,)).fetchall()
+        return [{"id": r["id"], "createdAt": r["created_at"], "sizeMB": r["size_mb"] or 0} for r in rows]
+    finally:
+        conn.close()
+
+
+def delete_meetings(meeting_ids: list[str]) -> int:
+    """Batch delete: remove files, then all rows, items and pending emails in one transaction.
+    Returns rows deleted."""
+    if not meeting_ids:
+        return 0
+    for meeting_id in meeting_ids:
+        delete_meeting_files(meeting_id)
+    placeholders = ",".join("?" * len(meeting_ids))
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        row = conn.execute(
+            f"SELECT COALESCE(SUM(audio_size_mb + transcript_size_mb + pdf_size_mb), 0) FROM meetings WHERE id IN ({placeholders})",
+            meeting_ids,
+        ).fetchone()
+        with conn:
+            for table in _ITEM_TABLES.values():
+                conn.execute(f"DELETE FROM {table} WHERE meeting_id IN ({placeholders})", meeting_ids)
+            conn.execute(
+                f"DELETE FROM email_outbox WHERE meeting_id IN ({placeholders}) AND status = 'pending'", meeting_ids
+            )
+            cur = conn.execute(f"DELETE FROM meetings WHERE id IN ({placeholders})", meeting_ids)
+    finally:
+        conn.close()
+    if row and row[0]:
+        _track_files_mb(-row[0])
+    return cur.rowcount
+
+
+def strip_emailed_meetings() -> int:
+    """Reduce emailed meetings to metadata: delete their files and drop the stored transcript."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        ids = [r[0] for r in conn.execute(
+            "SELECT id FROM meetings WHERE emailed = 1 AND (transcript_z IS NOT NULL OR timeline_z IS NOT NULL "
+            "OR transcript_size_mb > 0 OR pdf_size_mb > 0 OR audio_size_mb > 0)"
+        )]
+    finally:
+        conn.close()
+    if not ids:
+        return 0
+    for meeting_id in ids:
+        delete_meeting_files(meeting_id)
+    placeholders = ",".join("?" * len(ids))
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute(f"UPDATE meetings SET transcript_z = NULL, timeline_z = NULL WHERE id IN ({placeholders})", ids)
         conn.commit()
-        return cur.rowcount > 0
     finally:
         conn.close()
+    return len(ids)
 
 
-def get_storage_stats() -> dict:
+# Cached storage stats, refreshed in the background so API requests never touch the filesystem.
+_stats_lock = threading.Lock()
+_stats: dict = {}
+_stats_thread: Optional[threading.Thread] = None
+
+
+def _db_files_mb() -> float:
+    """Size of the SQLite database including its WAL and shared-memory files."""
+    total = 0
+    for path in (DB_PATH, DB_PATH + "-wal", DB_PATH + "-shm"):
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total / _MB
+
+
+def db_free_mb() -> float:
+    """Free pages inside the database file: space deleted rows left, returned by compact_db()."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        conn.close()
+    return free_pages * page_size / _MB
+
+
+def refresh_storage_stats() -> dict:
+    """Recompute stats from tracked file sizes, DB size and filesystem capacity."""
     _init_db()
     conn = sqlite3.connect(DB_PATH)
     try:
         row = conn.execute(
-            "SELECT COALESCE(SUM(audio_size_mb + transcript_size_mb + pdf_size_mb), 0) as used FROM meetings"
+            "SELECT COALESCE(SUM(audio_size_mb + transcript_size_mb + pdf_size_mb), 0) FROM meetings"
         ).fetchone()
-        used_mb = row[0] if row else 0
+        files_mb = row[0] if row else 0
     finally:
         conn.close()
-    return {"usedMB": used_mb, "totalMB": 32000}
+    disk = shutil.disk_usage(DATA_DIR)
+    with _stats_lock:
+        _stats.update({
+            "filesMB": files_mb,
+            "dbMB": _db_files_mb(),
+            "totalMB": disk.total / _MB,
+            "freeMB": disk.free / _MB,
+        })
+        return dict(_stats)
 
 
-def get_setting(key: str) -> Optional[str]:
+def _track_files_mb(delta_mb: float) -> None:
+    """Apply a file write/delete to the cached stats without rescanning."""
+    with _stats_lock:
+        if _stats:
+            _stats["filesMB"] = max(0.0, _stats["filesMB"] + delta_mb)
+            _stats["freeMB"] = max(0.0, _stats["freeMB"] - delta_mb)
+
+
+def start_storage_stats_refresher() -> None:
+    """Start the background thread that keeps the storage stats cache fresh."""
+    global _stats_thread
+    if _stats_thread and _stats_thread.is_alive():
+        return
+
+    def _loop():
+        while True:
+            try:
+                refresh_storage_stats()
+            except Exception:
+                pass
+            time.sleep(STORAGE_STATS_REFRESH_SECONDS)
+
+    _stats_thread = threading.Thread(target=_loop, daemon=True)
+    _stats_thread.start()
+
+
+def get_storage_stats() -> dict:
+    """Return cached stats: usedMB (meeting files + database), totalMB/freeMB of the data filesystem."""
+    with _stats_lock:
+        stats = dict(_stats)
+    if not stats:
+        stats = refresh_storage_stats()
+    return {
+        "usedMB": round(stats["filesMB"] + stats["dbMB"], 2),
+        "totalMB": round(stats["totalMB"], 2),
+        "freeMB": round(stats["freeMB"], 2),
+        "filesMB": round(stats["filesMB"], 2),
+        "dbMB": round(stats["dbMB"], 2),
+    }
+
+
+def compact_db() -> dict:
+    """One-shot compaction: compress any plain transcripts left behind, then VACUUM to return free pages."""
+    _init_db()
+    before = os.path.getsize(DB_PATH)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        with conn:
+            compressed = _compress_plain_transcripts(conn)
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    after = os.path.getsize(DB_PATH)
+    return {"transcriptsCompressed": compressed, "beforeBytes": before, "afterBytes": after}
+
+
+def enqueue_email(kind: str, recipient: str, meeting_id: str | None = None, next_attempt_at: float = 0) -> int:
+    """Add a pending message to the outbox (due at next_attempt_at, epoch seconds); returns its id."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.execute(
+            "INSERT INTO email_outbox (kind, meeting_id, recipient, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?)",
+            (kind, meeting_id, recipient, datetime.now().isoformat(), next_attempt_at),
+        )
+        conn.commit()
+        return cur.lastrowid
+    finally:
+        conn.close()
+
+
+def _row_to_outbox(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["id"],
+        "kind": row["kind"],
+        "meetingId": row["meeting_id"],
+        "recipient": row["recipient"],
+        "createdAt": row["created_at"],
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "nextAttemptAt": row["next_attempt_at"],
+        "lastError": row["last_error"],
+        "partsSent": row["parts_sent"],
+    }
+
+
+def list_due_emails(now: float, limit: int = 50) -> list:
+    """Pending outbox messages whose next attempt is due, oldest first."""
     _init_db()
     conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
     try:
-        row = conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        rows = conn.execute(
+            "SELECT * FROM email_outbox WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+            (now, limit),
+        ).fetchall()
+        return [_row_to_outbox(r) for r in rows]
+    finally:
+        conn.close()
+
+
+def next_email_due_at(kind: str | None = None, recipient: str | None = None) -> Optional[float]:
+    """Earliest next_attempt_at among pending messages, optionally of one kind / recipient."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        query = "SELECT MIN(next_attempt_at) FROM email_outbox WHERE status = 'pending'"
+        params: list = []
+        if kind is not None:
+            query += " AND kind = ?"
+            params.append(kind)
+        if recipient is not None:
+            query += " AND recipient = ?"
+            params.append(recipient)
+        row = conn.execute(query, params).fetchone()
         return row[0] if row else None
     finally:
         conn.close()
 
 
+def list_outbox() -> list:
+    """Messages still pending or permanently failed, newest first."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [_row_to_outbox(r) for r in conn.execute("SELECT * FROM email_outbox ORDER BY id DESC")]
+    finally:
+        conn.close()
+
+
+def complete_email(email_ids: list[int]) -> None:
+    """Remove delivered messages from the outbox."""
+    if not email_ids:
+        return
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute(f"DELETE FROM email_outbox WHERE id IN ({','.join('?' * len(email_ids))})", email_ids)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def set_email_parts_sent(email_ids: list[int], parts_sent: int) -> None:
+    """Record how many messages of a split email have been delivered."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute(
+            f"UPDATE email_outbox SET parts_sent = ? WHERE id IN ({','.join('?' * len(email_ids))})",
+            [parts_sent, *email_ids],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def reschedule_email(email_id: int, attempts: int, next_attempt_at: float, error: str, failed: bool = False) -> None:
+    """Record a failed attempt; `failed` stops further retries."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute(
+            "UPDATE email_outbox SET attempts = ?, next_attempt_at = ?, last_error = ?, status = ? WHERE id = ?",
+            (attempts, next_attempt_at, error, "failed" if failed else "pending", email_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def retry_emails_now() -> int:
+    """Make pending messages that are backing off due immediately, e.g. after Wi-Fi reconnects.
+
+    Messages not attempted yet keep their schedule so queued digests still wait for their interval.
+    """
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.execute("UPDATE email_outbox SET next_attempt_at = 0 WHERE status = 'pending' AND attempts > 0")
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+def release_emails(kind: str) -> int:
+    """Make every pending message of `kind` due now (e.g. digest mode switched off)."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.execute("UPDATE email_outbox SET next_attempt_at = 0 WHERE status = 'pending' AND kind = ?", (kind,))
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+def cancel_meeting_emails(meeting_id: str) -> None:
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute("DELETE FROM email_outbox WHERE meeting_id = ?", (meeting_id,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# Read-through cache of the settings table; None until first read, dropped on every write.
+_settings_lock = threading.Lock()
+_settings_cache: Optional[dict] = None
+
+
+def _load_settings() -> dict:
+    global _settings_cache
+    with _settings_lock:
+        if _settings_cache is None:
+            _init_db()
+            conn = sqlite3.connect(DB_PATH)
+            try:
+                _settings_cache = dict(conn.execute("SELECT key, value FROM settings").fetchall())
+            finally:
+                conn.close()
+        return _settings_cache
+
+
+def _invalidate_settings() -> None:
+    global _settings_cache
+    with _settings_lock:
+        _settings_cache = None
+
+
+def get_setting(key: str) -> Optional[str]:
+    return _load_settings().get(key)
+
+
 def set_setting(key: str, value: str) -> None:
     _init_db()
     conn = sqlite3.connect(DB_PATH)
@@ -283,3 +1098,90 @@ def set_setting(key: str, value: str) -> None:
         conn.commit()
     finally:
         conn.close()
+        _invalidate_settings()
+
+
+def factory_reset() -> None:
+    """Delete all meetings (with their items) and settings."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        with conn:
+            for table in _ITEM_TABLES.values():
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("DELETE FROM email_outbox")
+            conn.execute("DELETE FROM job_spans")
+            conn.execute("DELETE FROM live_segments")
+            conn.execute("DELETE FROM live_sessions")
+            conn.execute("DELETE FROM meetings")
+            conn.execute("DELETE FROM settings")
+    finally:
+        conn.close()
+        _invalidate_settings()
+
+
+def save_job_spans(job_id: str, meeting_id: str | None, spans: list[dict]) -> None:
+    """Store timing spans ({name, startedAt, durationMs, attrs}) for a processing job."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT INTO job_spans (job_id, meeting_id, name, started_at, duration_ms, attrs) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (job_id, meeting_id, sp["name"], sp["startedAt"], sp["durationMs"], json.dumps(sp["attrs"]))
+                    for sp in spans
+                ],
+            )
+    finally:
+        conn.close()
+
+
+def job_id_for_meeting(meeting_id: str) -> Optional[str]:
+    """The processing job that produced a meeting, if its timings were recorded."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        row = conn.execute("SELECT job_id FROM job_spans WHERE meeting_id = ? LIMIT 1", (meeting_id,)).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def get_job_spans(job_or_meeting_id: str) -> list:
+    """Spans for a job (by job id or the meeting it produced), in start order."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(
+            "SELECT job_id, meeting_id, name, started_at, duration_ms, attrs FROM job_spans "
+            "WHERE job_id = ? OR job_id = (SELECT job_id FROM job_spans WHERE meeting_id = ? LIMIT 1) "
+            "ORDER BY started_at, id",
+            (job_or_meeting_id, job_or_meeting_id),
+        ).fetchall()
+        return [
+            {
+                "jobId": r["job_id"],
+                "meetingId": r["meeting_id"],
+                "name": r["name"],
+                "startedAt": r["started_at"],
+                "durationMs": round(r["duration_ms"], 1),
+                "attrs": json.loads(r["attrs"]),
+            }
+            for r in rows
+        ]
+    finally:
+        conn.close()
+
+
+def prune_job_spans(before: float) -> int:
+    """Delete spans started before the given epoch time. Returns rows deleted."""
+    _init_db()
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cur = conn.execute("DELETE FROM job_spans WHERE started_at < ?", (before,))
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
@@ -1,7 +1,14 @@
-"""WiFi scan and connect (Linux: nmcli, macOS: airport/networksetup)."""
+"""WiFi scan and connect (Linux: nmcli, macOS: airport/networksetup).
+
+A background monitor caches connection state and scan results so API requests never shell out:
+status refreshes on NetworkManager events (`nmcli monitor`) with a slow poll as fallback, and
+scans run in their own thread when the cached list goes stale.
+"""
 import subprocess
 import sys
-from typing import TypedDict
+import threading
+import time
+from typing import Callable, TypedDict
 
 
 def _wifi_status_nmcli_con() -> dict:
@@ -186,3 +193,128 @@ def wifi_connect(ssid: str, password: str) -> tuple[bool, str]:
         except subprocess.TimeoutExpired:
             return False, "Connection timed out."
     return False, "WiFi connect not supported."
+
+
+# Fallback status poll; NetworkManager events trigger refreshes in between.
+WIFI_STATUS_POLL_SECONDS = 60
+# Cached scan results older than this are refreshed in the background on the next request.
+WIFI_SCAN_MAX_AGE_SECONDS = 30
+# First scan request waits this long for the initial background scan.
+WIFI_SCAN_WAIT_SECONDS = 15
+# nmcli monitor emits bursts of lines per change; refresh once per burst.
+WIFI_EVENT_DEBOUNCE_SECONDS = 0.5
+
+_state_lock = threading.Lock()
+_status: dict | None = None
+_networks: list[NetworkInfo] = []
+_scanned_at = 0.0
+_status_wanted = threading.Event()
+_scan_wanted = threading.Event()
+_scan_done = threading.Event()
+_listeners: list[Callable[[dict], None]] = []
+_monitor_started = False
+
+
+def add_status_listener(callback: Callable[[dict], None]) -> None:
+    """Call callback(status) from the monitor thread whenever connected/ssid changes."""
+    _listeners.append(callback)
+
+
+def _set_status(status: dict) -> None:
+    global _status
+    with _state_lock:
+        changed = status != _status
+        _status = status
+    if changed:
+        for callback in list(_listeners):
+            try:
+                callback(dict(status))
+            except Exception:
+                pass
+
+
+def refresh_status() -> dict:
+    """Query the OS now and update the cache (e.g. right after connecting)."""
+    status = wifi_status()
+    _set_status(status)
+    return status
+
+
+def cached_status() -> dict:
+    """Last known { connected, ssid } without shelling out (queries once if nothing is cached)."""
+    with _state_lock:
+        status = dict(_status) if _status is not None else None
+    return status if status is not None else refresh_status()
+
+
+def request_scan() -> None:
+    _scan_wanted.set()
+
+
+def cached_scan() -> list[NetworkInfo]:
+    """Latest scan results; stale results trigger a background rescan and are returned meanwhile."""
+    if not _monitor_started:
+        return wifi_scan()
+    with _state_lock:
+        scanned_at = _scanned_at
+    if time.monotonic() - scanned_at > WIFI_SCAN_MAX_AGE_SECONDS:
+        request_scan()
+    if not scanned_at:
+        _scan_done.wait(timeout=WIFI_SCAN_WAIT_SECONDS)
+    with _state_lock:
+        return list(_networks)
+
+
+def _scan_loop() -> None:
+    global _networks, _scanned_at
+    while True:
+        _scan_wanted.wait()
+        _scan_wanted.clear()
+        try:
+            networks = wifi_scan()
+        except Exception:
+            networks = []
+        with _state_lock:
+            _networks = networks
+            _scanned_at = time.monotonic()
+        _scan_done.set()
+
+
+def _status_loop() -> None:
+    while True:
+        if _status_wanted.wait(timeout=WIFI_STATUS_POLL_SECONDS):
+            time.sleep(WIFI_EVENT_DEBOUNCE_SECONDS)
+        _status_wanted.clear()
+        try:
+            refresh_status()
+        except Exception:
+            pass
+
+
+def _event_loop() -> None:
+    """Follow `nmcli monitor` and request a status refresh on every event; restart it if it exits."""
+    while True:
+        try:
+            proc = subprocess.Popen(
+                ["nmcli", "monitor"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            )
+        except FileNotFoundError:
+            return  # No NetworkManager: the status poll is all we have
+        for _line in proc.stdout:
+            _status_wanted.set()
+        proc.wait()
+        time.sleep(WIFI_STATUS_POLL_SECONDS / 4)
+
+
+def start_monitor() -> None:
+    """Start the background network monitor (idempotent) and kick off the first status + scan."""
+    global _monitor_started
+    if _monitor_started:
+        return
+    _monitor_started = True
+    threading.Thread(target=_status_loop, daemon=True).start()
+    threading.Thread(target=_scan_loop, daemon=True).start()
+    if sys.platform.startswith("linux"):
+        threading.Thread(target=_event_loop, daemon=True).start()
+    _status_wanted.set()
+    request_scan()
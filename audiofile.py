@@ -0,0 +1,109 @@
+"""Streaming FLAC recording files: appended block by block while recording, read back in chunks.
+
+FLAC is lossless (Whisper sees exactly what was captured) and roughly halves the size of
+16-bit PCM speech. Frames are self-checking, so a file cut short by a crash or power loss
+still decodes up to its last complete frame. PyAV (already installed for faster-whisper)
+does the encoding and decoding.
+"""
+import os
+import time
+
+import numpy as np
+
+# Flush encoded frames to the OS every second and fsync every 10 s: bounds what a crash loses.
+FLUSH_SECONDS = 1.0
+FSYNC_SECONDS = 10.0
+
+
+class FlacWriter:
+    """Append mono float32 blocks to a FLAC file. Not thread-safe: use from one writer thread."""
+
+    def __init__(self, path: str, samplerate: int):
+        import av
+
+        self.path = path
+        self.samplerate = samplerate
+        self.frames = 0
+        self._file = open(path, "wb")
+        self._container = av.open(self._file, "w", format="flac")
+        self._stream = self._container.add_stream("flac", rate=samplerate, layout="mono")
+        self._stream.format = "s16"
+        self._last_flush = self._last_fsync = time.monotonic()
+
+    def write(self, block: np.ndarray) -> None:
+        import av
+
+        pcm = (np.clip(block.reshape(-1), -1.0, 1.0) * 32767).astype(np.int16)
+        frame = av.AudioFrame.from_ndarray(pcm[None, :], format="s16", layout="mono")
+        frame.rate = self.samplerate
+        frame.pts = self.frames
+        self.frames += len(pcm)
+        for packet in self._stream.encode(frame):
+            self._container.mux(packet)
+        now = time.monotonic()
+        if now - self._last_flush >= FLUSH_SECONDS:
+            self._file.flush()
+            self._last_flush = now
+            if now - self._last_fsync >= FSYNC_SECONDS:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+
+    def close(self) -> None:
+        """Flush the encoder and finalize the header (total sample count)."""
+        for packet in self._stream.encode(None):
+            self._container.mux(packet)
+        self._container.close()
+        self._file.close()
+
+
+def read_samples(path: str, start: int, count: int | None = None) -> tuple[np.ndarray, int]:
+    """Decode up to `count` samples (all when None) from sample `start`.
+
+    Returns (mono float32 audio, samplerate). Returns fewer samples than asked when the file
+    is still being written or was truncated; a partial trailing frame is ignored.
+    """
+    import av
+
+    chunks = []
+    collected = 0
+    with av.open(path) as container:
+        stream = container.streams.audio[0]
+        samplerate = stream.rate
+        if start:
+            container.seek(start, stream=stream, backward=True)
+        try:
+            for frame in container.decode(stream):
+                pcm = frame.to_ndarray()[0]
+                if frame.pts + len(pcm) <= start:
+                    continue
+                pcm = pcm[max(0, start - frame.pts):]
+                chunks.append(pcm)
+                collected += len(pcm)
+                if count is not None and collected >= count:
+                    break
+        except (av.error.InvalidDataError, av.error.EOFError):
+            pass  # growing or truncated file: stop at the last complete frame
+    if not chunks:
+        return np.zeros(0, dtype=np.float32), samplerate
+    audio = np.concatenate(chunks)
+    if count is not None:
+        audio = audio[:count]
+    return audio.astype(np.float32) / 32768.0, samplerate
+
+
+def samplerate_of(path: str) -> int:
+    import av
+
+    with av.open(path) as container:
+        return container.streams.audio[0].rate
+
+
+def iter_chunks(path: str, seconds: float, start: int = 0):
+    """Yield (audio, samplerate) chunks of `seconds` from sample `start` to the end of the file."""
+    samplerate = samplerate_of(path)
+    while True:
+        audio, _ = read_samples(path, start, int(seconds * samplerate))
+        if not len(audio):
+            return
+        yield audio, samplerate
+        start += len(audio)
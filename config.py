@@ -6,17 +6,60 @@ _PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 _DATA_DIR_DEFAULT = os.path.join(_PROJECT_ROOT, "data") if os.path.exists(_PROJECT_ROOT) else os.path.expanduser("~/safescribe")
 DATA_DIR = os.environ.get("SAFESCRIBE_DATA_DIR", _DATA_DIR_DEFAULT)
 MEETINGS_DIR = os.path.join(DATA_DIR, "meetings")
+RECORDINGS_DIR = os.path.join(DATA_DIR, "recordings")  # in-progress audio; moved to MEETINGS_DIR when done
 DB_PATH = os.path.join(DATA_DIR, "safescribe.db")
+MODELS_DIR = os.path.join(DATA_DIR, "models")  # pre-converted Whisper models (see model_store.py)
 
 # Ensure directories exist on import
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(MEETINGS_DIR, exist_ok=True)
+os.makedirs(RECORDINGS_DIR, exist_ok=True)
 
 # Ollama
 OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
 
+# Whisper (faster-whisper / CTranslate2)
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
+WHISPER_COMPUTE_TYPE = os.environ.get("WHISPER_COMPUTE_TYPE", "int8")  # float16 on GPU
+# Download from the Hugging Face hub when the model is neither in MODELS_DIR nor the hub cache
+WHISPER_ALLOW_DOWNLOAD = os.environ.get("WHISPER_ALLOW_DOWNLOAD", "1") == "1"
+# Smaller model switched to while recording if transcription falls far behind ("" = never)
+WHISPER_FALLBACK_MODEL = os.environ.get("WHISPER_FALLBACK_MODEL", "tiny")
+# Transcribe in this many worker processes (0 = in the API process). Each worker loads its own
+# copy of the model and gets an equal share of the CPU cores.
+STT_WORKERS = int(os.environ.get("STT_WORKERS", "0"))
+# Keep per-word timestamps in meeting timelines (segment timestamps are always kept). Skipped
+# while transcription is degraded.
+WORD_TIMESTAMPS = os.environ.get("WORD_TIMESTAMPS", "1") == "1"
+# Drop Whisper hallucinations (silence boilerplate, repetition loops) before the transcript
+TRANSCRIPT_FILTER = os.environ.get("TRANSCRIPT_FILTER", "1") == "1"
+
+# Speaker diarization during recording (labels transcript lines "Speaker N:"); off by default
+DIARIZATION_ENABLED = os.environ.get("DIARIZATION", "0") == "1"
+# Most CPU time spent on speaker embeddings, as a fraction of the audio's duration
+DIARIZATION_BUDGET = float(os.environ.get("DIARIZATION_BUDGET", "0.05"))
+# Cosine similarity above which a segment joins an existing speaker
+DIARIZATION_THRESHOLD = float(os.environ.get("DIARIZATION_THRESHOLD", "0.95"))
+DIARIZATION_MAX_SPEAKERS = int(os.environ.get("DIARIZATION_MAX_SPEAKERS", "8"))
+
 # Audio (for sounddevice - device index or name)
 AUDIO_DEVICE = os.environ.get("AUDIO_DEVICE", None)  # None = default system device
+# Input channels: "auto" = all the device offers (up to AUDIO_MAX_CHANNELS), or a number
+AUDIO_CHANNELS = os.environ.get("AUDIO_CHANNELS", "auto")
+AUDIO_MAX_CHANNELS = int(os.environ.get("AUDIO_MAX_CHANNELS", "8"))
+# Multi-channel mixdown before Whisper: "best" (highest-SNR mic per block) or "beam" (delay-and-sum)
+AUDIO_MIX = os.environ.get("AUDIO_MIX", "best")
+# Largest inter-mic delay to search for when beamforming (~34 cm of spacing per ms)
+AUDIO_BEAM_MAX_DELAY_MS = float(os.environ.get("AUDIO_BEAM_MAX_DELAY_MS", "1.0"))
+
+# Gateway mode: this server also takes audio streamed over WebSocket from thin room devices
+# (gateway_client.py) and transcribes/summarizes them with one shared Whisper and Ollama.
+GATEWAY_ENABLED = os.environ.get("SAFESCRIBE_GATEWAY", "0") == "1"
+GATEWAY_MAX_SESSIONS = int(os.environ.get("GATEWAY_MAX_SESSIONS", "8"))
+GATEWAY_LLM_SLOTS = int(os.environ.get("GATEWAY_LLM_SLOTS", "2"))  # Ollama calls run at once across rooms
+# Thin device side: where to stream, and the room name its meetings are filed under
+GATEWAY_URL = os.environ.get("SAFESCRIBE_GATEWAY_URL", "")  # e.g. ws://minipc.local:8765
+GATEWAY_ROOM = os.environ.get("SAFESCRIBE_ROOM", "")
 
 # USB mount points (check in order)
 USB_MOUNT_POINTS = [
@@ -28,6 +71,8 @@ USB_MOUNT_POINTS = [
 # API
 API_HOST = os.environ.get("SAFESCRIBE_API_HOST", "0.0.0.0")
 API_PORT = int(os.environ.get("SAFESCRIBE_API_PORT", "8765"))
+# Expose per-stage timing histograms at /metrics (Prometheus text format); off by default
+METRICS_ENABLED = os.environ.get("SAFESCRIBE_METRICS", "0") == "1"
 
 # Email (SMTP) – use your email + 16-character app password (e.g. Gmail App Password)
 # Set via environment (e.g. /etc/safescribe/env on Pi). Defaults below are for Gmail.
@@ -36,3 +81,5 @@ SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
 SMTP_USER = os.environ.get("SMTP_USER", "")           # Your email (e.g. you@gmail.com)
 SMTP_APP_PASSWORD = os.environ.get("SMTP_APP_PASSWORD", "")  # 16-char app password, not your normal password
 SMTP_FROM = os.environ.get("SMTP_FROM", "")          # Optional; defaults to SMTP_USER when sending
+# Larger PDFs are compressed, then split into several emails (providers cap messages at ~25 MB after base64)
+EMAIL_MAX_ATTACHMENT_MB = float(os.environ.get("EMAIL_MAX_ATTACHMENT_MB", "18"))
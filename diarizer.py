@@ -0,0 +1,135 @@
+"""Online speaker diarization on CPU: label each transcribed segment with a speaker.
+
+Runs on its own thread beside the live transcription loop: a chunk is labelled while the next
+one is transcribed, so speaker labels don't slow transcription down. Each Whisper segment gets a short spectral embedding: the mean and
+spread of its MFCCs over voiced frames, computed with numpy/scipy only. The embedding is
+assigned to the nearest speaker centroid by cosine similarity, or starts a new speaker. Work
+per chunk is capped at DIARIZATION_BUDGET x the chunk's duration. Segments past the cap, or
+too short to embed, keep the previous speaker only if they directly follow it.
+"""
+import time
+
+import numpy as np
+
+from config import DIARIZATION_BUDGET, DIARIZATION_MAX_SPEAKERS, DIARIZATION_THRESHOLD
+
+EMBED_SAMPLERATE = 16000
+FRAME = 400          # 25 ms
+HOP = 160            # 10 ms
+NFFT = 512
+N_MELS = 26
+N_MFCC = 20          # c1..c19 are used; c0 (loudness) would split one speaker by distance to the mic
+MIN_SEGMENT_SECONDS = 0.8    # shorter segments are too noisy to embed
+MAX_EMBED_SECONDS = 4.0      # longer segments are embedded from their middle this long
+VOICED_FRACTION = 0.6        # loudest share of frames kept (drops pauses inside a segment)
+CONTINUE_GAP_SECONDS = 0.5   # unembedded segment this close after a labelled one keeps its speaker
+COST_SMOOTHING = 0.3
+
+_filterbank = None
+
+
+def _mel_filterbank() -> np.ndarray:
+    global _filterbank
+    if _filterbank is None:
+        def mel(f):
+            return 2595 * np.log10(1 + f / 700)
+
+        edges = 700 * (10 ** (np.linspace(mel(60), mel(7600), N_MELS + 2) / 2595) - 1)
+        bins = np.floor((NFFT + 1) * edges / EMBED_SAMPLERATE).astype(int)
+        fb = np.zeros((N_MELS, NFFT // 2 + 1))
+        for i in range(N_MELS):
+            left, center, right = bins[i], bins[i + 1], bins[i + 2]
+            fb[i, left:center] = (np.arange(left, center) - left) / max(center - left, 1)
+            fb[i, center:right] = (right - np.arange(center, right)) / max(right - center, 1)
+        _filterbank = fb
+    return _filterbank
+
+
+def embed(audio: np.ndarray) -> np.ndarray | None:
+    """Unit-length speaker embedding of 16 kHz mono audio, or None if it has too few voiced frames."""
+    from scipy.fft import dct
+
+    if len(audio) < FRAME + HOP * 10:
+        return None
+    frames = np.lib.stride_tricks.sliding_window_view(audio, FRAME)[::HOP] * np.hamming(FRAME)
+    power = np.abs(np.fft.rfft(frames, NFFT)) ** 2
+    energy = power.sum(axis=1)
+    voiced = energy >= np.quantile(energy, 1 - VOICED_FRACTION)
+    if voiced.sum() < 10:
+        return None
+    log_mel = np.log(power[voiced] @ _mel_filterbank().T + 1e-10)
+    mfcc = dct(log_mel, type=2, norm="ortho", axis=1)[:, 1:N_MFCC]
+    vector = np.concatenate([mfcc.mean(axis=0), mfcc.std(axis=0)])
+    return vector / (np.linalg.norm(vector) + 1e-12)
+
+
+class Diarizer:
+    """Speaker state for one recording; label() chunks in order (live loop, then the tail)."""
+
+    def __init__(
+        self,
+        budget: float = DIARIZATION_BUDGET,
+        threshold: float = DIARIZATION_THRESHOLD,
+        max_speakers: int = DIARIZATION_MAX_SPEAKERS,
+    ):
+        self.budget = budget
+        self.threshold = threshold
+        self.max_speakers = max_speakers
+        self.centroids: list[np.ndarray] = []
+        self.counts: list[int] = []
+        self.cost_per_second: float | None = None  # embedding seconds per second of audio embedded
+        self.skipped_segments = 0
+
+    def _assign(self, vector: np.ndarray) -> int:
+        if self.centroids:
+            sims = np.array([c @ vector / (np.linalg.norm(c) + 1e-12) for c in self.centroids])
+            best = int(np.argmax(sims))
+            if sims[best] >= self.threshold or len(self.centroids) >= self.max_speakers:
+                self.counts[best] += 1
+                self.centroids[best] += (vector - self.centroids[best]) / self.counts[best]
+                return best
+        self.centroids.append(vector.copy())
+        self.counts.append(1)
+        return len(self.centroids) - 1
+
+    def label(self, audio: np.ndarray, samplerate: int, segments: list) -> list[str]:
+        """Transcript lines ("Speaker N: text") for one chunk's (start, end, text, ...) segments.
+
+        Segment times are seconds from the start of `audio`. Unlabelled lines are plain text.
+        """
+        from scipy.signal import resample_poly
+
+        allowed = self.budget * len(audio) / samplerate
+        spent = 0.0
+        lines = []
+        previous, previous_end = None, -1.0
+        for start, end, text, *_ in segments:
+            text = text.strip()
+            if not text:
+                continue
+            speaker = None
+            duration = end - start
+            predicted = (self.cost_per_second or 0) * min(duration, MAX_EMBED_SECONDS)
+            if duration >= MIN_SEGMENT_SECONDS and spent + predicted <= allowed:
+                started = time.perf_counter()
+                middle = (start + end) / 2
+                half = min(duration, MAX_EMBED_SECONDS) / 2
+                piece = audio[int((middle - half) * samplerate):int((middle + half) * samplerate)]
+                if samplerate != EMBED_SAMPLERATE:
+                    piece = resample_poly(piece, EMBED_SAMPLERATE, samplerate)
+                vector = embed(np.asarray(piece, dtype=np.float32))
+                if vector is not None:
+                    speaker = self._assign(vector)
+                cost = time.perf_counter() - started
+                spent += cost
+                rate = cost / max(2 * half, 1e-3)
+                self.cost_per_second = rate if self.cost_per_second is None else (
+                    self.cost_per_second + COST_SMOOTHING * (rate - self.cost_per_second)
+                )
+            elif duration >= MIN_SEGMENT_SECONDS:
+                self.skipped_segments += 1
+            if speaker is None and previous is not None and start - previous_end <= CONTINUE_GAP_SECONDS:
+                speaker = previous
+            lines.append(f"Speaker {speaker + 1}: {text}" if speaker is not None else text)
+            previous, previous_end = speaker, end
+        return lines
@@ -0,0 +1,63 @@
+"""Round-robin admission to a shared resource (Whisper, Ollama) across many users.
+
+    gate = FairGate(slots=2)
+    with gate.slot("room-a"):      # blocks until it's room-a's turn and a slot is free
+        stt.transcribe(chunk)
+
+Callers wait in one queue per key. A freed slot goes to the next key in rotation that has
+someone waiting, so a key with a deep backlog (a long meeting's tail, a 10-segment summary)
+can't starve another key's next call.
+"""
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+
+class FairGate:
+    def __init__(self, slots: int):
+        self.slots = max(1, slots)
+        self._busy = 0
+        self._cond = threading.Condition()
+        self._queues: OrderedDict[str, deque] = OrderedDict()  # rotation order: first key goes next
+
+    def _admissible(self, ticket: object) -> bool:
+        if self._busy >= self.slots:
+            return False
+        first = next(iter(self._queues.values()))
+        return first[0] is ticket
+
+    def acquire(self, key: str) -> None:
+        """Block until it's key's turn and a slot is free; pair with release()."""
+        ticket = object()
+        with self._cond:
+            self._queues.setdefault(key, deque()).append(ticket)
+            while not self._admissible(ticket):
+                self._cond.wait()
+            queue = self._queues.pop(key)
+            queue.popleft()
+            if queue:
+                self._queues[key] = queue  # back of the rotation
+            self._busy += 1
+            self._cond.notify_all()  # another slot may be free for the next key
+
+    def release(self) -> None:
+        with self._cond:
+            self._busy -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, key: str):
+        self.acquire(key)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def waiting(self) -> dict[str, int]:
+        """Calls queued per key (not counting those holding a slot)."""
+        with self._cond:
+            return {key: len(queue) for key, queue in self._queues.items()}
+
+    @property
+    def busy(self) -> int:
+        return self._busy
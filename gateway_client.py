@@ -0,0 +1,87 @@
+"""Thin room device: stream the mic to a SafeScribe gateway instead of transcribing locally.
+
+    SAFESCRIBE_GATEWAY_URL=ws://minipc.local:8765 SAFESCRIBE_ROOM=Boardroom python gateway_client.py
+
+Audio is sent as captured (44.1 kHz int16, ~88 KB/s); the gateway resamples, transcribes,
+summarizes and emails. Ctrl+C ends the meeting.
+"""
+import json
+import queue
+import sys
+import threading
+from urllib.parse import urlencode
+
+import numpy as np
+
+from config import GATEWAY_ROOM, GATEWAY_URL
+from recorder import RECORD_SAMPLERATE, ChannelMixer, audio_device, input_channels
+
+SEND_SECONDS = 0.5  # audio per WebSocket message
+STOP_TIMEOUT_SECONDS = 30
+
+
+def _receive(ws) -> None:
+    from websockets.exceptions import ConnectionClosed
+
+    try:
+        for message in ws:
+            event = json.loads(message)
+            if event["type"] == "transcript" and event["text"]:
+                print(event["text"], flush=True)
+            elif event["type"] == "stopped":
+                print(f"Meeting handed to the gateway for notes (job {event['jobId']}).")
+            elif event["type"] == "error":
+                print(f"Gateway error: {event['detail']}")
+    except ConnectionClosed:
+        pass
+
+
+def stream(url: str, room: str) -> int:
+    import sounddevice as sd
+    from websockets.sync.client import connect
+
+    device = audio_device()
+    channels = input_channels(sd, device)
+    mixer = ChannelMixer(channels, RECORD_SAMPLERATE) if channels > 1 else None
+    blocks: queue.Queue = queue.Queue()
+
+    def _callback(indata, frames, time_info, status):
+        blocks.put(mixer.mix(indata) if mixer else indata.copy())
+
+    query = urlencode({"room": room, "samplerate": RECORD_SAMPLERATE})
+    with connect(f"{url.rstrip('/')}/api/gateway/stream?{query}") as ws:
+        hello = json.loads(ws.recv())
+        if hello["type"] != "started":
+            print(f"Gateway refused the session: {hello.get('detail')}")
+            return 1
+        print(f"Streaming to {url} as '{room or 'unnamed room'}' ({hello['sessionId']}); Ctrl+C to stop.")
+        receiver = threading.Thread(target=_receive, args=(ws,), daemon=True)
+        receiver.start()
+
+        pending, frames = [], 0
+        with sd.InputStream(device=device, samplerate=RECORD_SAMPLERATE, channels=channels,
+                            dtype="float32", callback=_callback):
+            try:
+                while True:
+                    try:
+                        block = blocks.get(timeout=1)
+                    except queue.Empty:
+                        continue
+                    pending.append(block.reshape(-1))
+                    frames += len(block)
+                    if frames >= SEND_SECONDS * RECORD_SAMPLERATE:
+                        pcm = (np.clip(np.concatenate(pending), -1.0, 1.0) * 32767).astype("<i2")
+                        ws.send(pcm.tobytes())
+                        pending, frames = [], 0
+            except KeyboardInterrupt:
+                pass
+        ws.send(json.dumps({"type": "stop"}))
+        receiver.join(timeout=STOP_TIMEOUT_SECONDS)
+    return 0
+
+
+if __name__ == "__main__":
+    if not GATEWAY_URL:
+        print(__doc__)
+        sys.exit(2)
+    sys.exit(stream(GATEWAY_URL, GATEWAY_ROOM))
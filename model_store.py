@@ -0,0 +1,194 @@
+"""Whisper model store: pre-converted CTranslate2 models under DATA_DIR/models/<name>.
+
+Loading from the store never touches the network (faster-whisper otherwise resolves "base"
+through the Hugging Face hub on every start). Each model directory carries a manifest with
+file sizes and SHA-256 hashes written at install time; sizes are checked on every load and
+hashes on demand.
+
+    python model_store.py fetch base            # download into the store (needs network)
+    python model_store.py install base /media/usb0/whisper-base
+    python model_store.py verify base           # full hash check
+    python model_store.py list
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+from config import MODELS_DIR
+
+MANIFEST_NAME = "manifest.json"
+REQUIRED_FILES = ("model.bin", "config.json", "tokenizer.json")
+VOCABULARY_FILES = ("vocabulary.txt", "vocabulary.json")
+OPTIONAL_FILES = ("preprocessor_config.json",)
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+class ModelStoreError(Exception):
+    pass
+
+
+def model_dir(name: str) -> str:
+    return os.path.join(MODELS_DIR, name)
+
+
+def _model_files(path: str) -> list[str]:
+    files = [f for f in REQUIRED_FILES + OPTIONAL_FILES if os.path.isfile(os.path.join(path, f))]
+    files += [f for f in VOCABULARY_FILES if os.path.isfile(os.path.join(path, f))][:1]
+    return files
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _check_complete(path: str) -> None:
+    missing = [f for f in REQUIRED_FILES if not os.path.isfile(os.path.join(path, f))]
+    if not any(os.path.isfile(os.path.join(path, f)) for f in VOCABULARY_FILES):
+        missing.append("vocabulary.txt")
+    if missing:
+        raise ModelStoreError(f"{path} is not a CTranslate2 Whisper model (missing {', '.join(missing)})")
+
+
+def _write_manifest(name: str, path: str, source: str) -> dict:
+    manifest = {
+        "name": name,
+        "source": source,
+        "installedAt": int(time.time()),
+        "files": {
+            f: {"size": os.path.getsize(os.path.join(path, f)), "sha256": _sha256(os.path.join(path, f))}
+            for f in _model_files(path)
+        },
+    }
+    with open(os.path.join(path, MANIFEST_NAME + ".tmp"), "w", encoding="utf-8") as out:
+        json.dump(manifest, out, indent=2)
+    os.replace(os.path.join(path, MANIFEST_NAME + ".tmp"), os.path.join(path, MANIFEST_NAME))
+    return manifest
+
+
+def read_manifest(name: str) -> dict | None:
+    try:
+        with open(os.path.join(model_dir(name), MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def verify(name: str, full: bool = False) -> None:
+    """Raise ModelStoreError unless every manifest file is present with the recorded size
+    (and, with full=True, the recorded SHA-256)."""
+    manifest = read_manifest(name)
+    if manifest is None:
+        raise ModelStoreError(f"Model '{name}' is not installed in {MODELS_DIR}")
+    path = model_dir(name)
+    for fname, info in manifest["files"].items():
+        fpath = os.path.join(path, fname)
+        if not os.path.isfile(fpath) or os.path.getsize(fpath) != info["size"]:
+            raise ModelStoreError(f"Model '{name}': {fname} is missing or truncated")
+        if full and _sha256(fpath) != info["sha256"]:
+            raise ModelStoreError(f"Model '{name}': {fname} failed its checksum")
+
+
+def install(name: str, source_dir: str) -> str:
+    """Copy a pre-converted model directory (e.g. from USB) into the store; returns its path."""
+    _check_complete(source_dir)
+    target = model_dir(name)
+    staging = target + ".partial"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for fname in _model_files(source_dir):
+        shutil.copyfile(os.path.join(source_dir, fname), os.path.join(staging, fname))
+    _write_manifest(name, staging, os.path.abspath(source_dir))
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    verify(name, full=True)
+    return target
+
+
+def fetch(name: str) -> str:
+    """Download a converted model from the Hugging Face hub into the store (needs network)."""
+    from faster_whisper.utils import download_model
+
+    staging = model_dir(name) + ".download"
+    path = download_model(name, output_dir=staging)
+    try:
+        return install(name, path)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def installed() -> list[dict]:
+    if not os.path.isdir(MODELS_DIR):
+        return []
+    models = []
+    for name in sorted(os.listdir(MODELS_DIR)):
+        manifest = read_manifest(name)
+        if manifest is not None:
+            size_mb = sum(f["size"] for f in manifest["files"].values()) / (1024 * 1024)
+            models.append({"name": name, "sizeMB": round(size_mb, 1), "installedAt": manifest["installedAt"]})
+    return models
+
+
+def resolve(name: str) -> str | None:
+    """Path of an installed, size-checked model, or None if it isn't in the store."""
+    if read_manifest(name) is None:
+        return None
+    verify(name)
+    return model_dir(name)
+
+
+def prefetch(path: str) -> None:
+    """Ask the kernel to start reading model.bin into the page cache (returns immediately)."""
+    try:
+        fd = os.open(os.path.join(path, "model.bin"), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except (AttributeError, OSError):
+        pass  # not available on this platform
+    finally:
+        os.close(fd)
+
+
+def has_default_route() -> bool:
+    """True if the device has a default IPv4 route (read locally; no packets sent)."""
+    try:
+        with open("/proc/net/route", encoding="ascii") as f:
+            return any(line.split()[1] == "00000000" for line in f.readlines()[1:] if line.strip())
+    except OSError:
+        return True  # not Linux; let the hub client decide
+
+
+def main(argv: list[str]) -> int:
+    if not argv or argv[0] not in ("fetch", "install", "verify", "list"):
+        print(__doc__)
+        return 2
+    try:
+        if argv[0] == "list":
+            for m in installed():
+                print(f"{m['name']:24} {m['sizeMB']:8.1f} MB")
+        elif argv[0] == "fetch":
+            print(fetch(argv[1]))
+        elif argv[0] == "install":
+            print(install(argv[1], argv[2]))
+        else:
+            verify(argv[1], full=True)
+            print(f"{argv[1]}: OK")
+    except IndexError:
+        print(__doc__)
+        return 2
+    except ModelStoreError as e:
+        print(e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
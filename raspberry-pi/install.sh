@@ -22,7 +22,9 @@ echo "Step 2/11: Setting up Python virtual environment..."
 python3 -m venv venv
 ./venv/bin/pip install --upgrade pip
 ./venv/bin/pip install -r requirements.txt
-./venv/bin/pip install uvicorn fastapi
+./venv/bin/pip install uvicorn fastapi websockets
+# Notes rendering (renderer.py): PDF layout and Markdown parsing
+./venv/bin/pip install PyMuPDF markdown-it-py
 
 # 3. Download NLTK data (punkt and punkt_tab for sentence tokenization)
 echo "Step 3/11: Downloading NLTK data..."
@@ -64,6 +66,8 @@ OLLAMASVC
 fi
 echo "Step 5/11: Pulling Ollama model (gemma2:2b-instruct-q4_0)..."
 ollama pull gemma2:2b-instruct-q4_0 2>/dev/null || echo "Ollama model pull - run 'ollama pull gemma2:2b-instruct-q4_0' manually if needed"
+echo "  Installing Whisper model into the local model store..."
+./venv/bin/python model_store.py fetch base || echo "Whisper model fetch - run './venv/bin/python model_store.py fetch base' manually if needed"
 
 # 6. Build frontend
 echo "Step 6/11: Building frontend..."
@@ -1,9 +1,12 @@
-import sounddevice as sd
 import numpy as np
 import threading
+import time
 from enum import Enum
 from collections import deque
 
+import audiofile
+from config import AUDIO_BEAM_MAX_DELAY_MS, AUDIO_CHANNELS, AUDIO_DEVICE, AUDIO_MAX_CHANNELS, AUDIO_MIX
+
 
 class RecorderState(Enum):
     IDLE = 0
@@ -15,12 +18,129 @@ class RecorderState(Enum):
 RECORD_SAMPLERATE = 44100
 WHISPER_SAMPLERATE = 16000
 
+# Channel mixer tuning (per capture block of ~23 ms at 44.1 kHz / 1024 frames)
+ENERGY_SMOOTHING = 0.2          # EMA weight of the newest block's energy
+NOISE_FLOOR_RISE = 1.002        # noise floor creeps up this much per block, drops instantly
+SWITCH_MARGIN = 2.0             # another mic must have 2x (3 dB) the SNR of the current one
+SWITCH_HOLD_BLOCKS = 8          # ...for this many consecutive blocks before we switch
+BEAM_UPDATE_BLOCKS = 16         # re-estimate beamforming delays every ~0.4 s of speech
+BEAM_WINDOW_BLOCKS = 4          # audio used per delay estimate
+SPEECH_SNR = 4.0                # block counts as speech above 4x (6 dB) the noise floor
+
+# File-backed recording: the writer thread drains captured blocks to FLAC this often, and
+# chunks are only read back once this much more audio has been encoded (encoder/IO buffering).
+WRITE_INTERVAL_SECONDS = 0.1
+READ_MARGIN_SECONDS = 3
+# Blocks waiting for the writer are capped; past this the oldest are dropped (and counted)
+# rather than growing memory if the SD card stalls.
+MAX_UNWRITTEN_SECONDS = 30
+
+
+def audio_device():
+    """config.AUDIO_DEVICE as sounddevice expects it: index, name substring or None (default)."""
+    if AUDIO_DEVICE is None or AUDIO_DEVICE == "":
+        return None
+    return int(AUDIO_DEVICE) if AUDIO_DEVICE.isdigit() else AUDIO_DEVICE
+
+
+def input_channels(sd, device) -> int:
+    """Channels to open: AUDIO_CHANNELS, or with "auto" everything the device has (capped)."""
+    if AUDIO_CHANNELS != "auto":
+        return max(1, int(AUDIO_CHANNELS))
+    try:
+        available = int(sd.query_devices(device, "input")["max_input_channels"])
+    except Exception:
+        return 1
+    return max(1, min(available, AUDIO_MAX_CHANNELS))
+
+
+class ChannelMixer:
+    """Reduce multi-channel capture blocks to mono before they are buffered for Whisper.
+
+    "best": pick the mic with the highest SNR (smoothed block energy over a tracked noise
+    floor), with hysteresis so we don't flap between mics mid-word.
+    "beam": delay-and-sum; per-mic delays against the best mic are estimated with GCC-PHAT
+    on recent speech and applied as integer-sample shifts (output lags input by max delay).
+    """
+
+    def __init__(self, channels: int, samplerate: int, mode: str = AUDIO_MIX,
+                 max_delay_ms: float = AUDIO_BEAM_MAX_DELAY_MS):
+        self.channels = channels
+        self.mode = mode if mode in ("best", "beam") else "best"
+        self.energy = np.zeros(channels)
+        self.noise = np.full(channels, np.inf)
+        self.current = 0
+        self._challenger = -1
+        self._challenger_blocks = 0
+
+        self.max_delay = max(1, int(round(samplerate * max_delay_ms / 1000)))
+        self.delays = np.zeros(channels, dtype=np.int64)
+        self._history = np.zeros((2 * self.max_delay, channels), dtype=np.float32)
+        self._recent = deque(maxlen=BEAM_WINDOW_BLOCKS)
+        self._speech_blocks = 0
+
+    def _track(self, block: np.ndarray) -> np.ndarray:
+        """Update per-channel energy and noise floor; return per-channel SNR."""
+        power = np.einsum("ij,ij->j", block, block) / max(len(block), 1) + 1e-12
+        self.energy += ENERGY_SMOOTHING * (power - self.energy)
+        self.noise = np.minimum(self.noise * NOISE_FLOOR_RISE, power)
+        return self.energy / self.noise
+
+    def _select(self, snr: np.ndarray) -> int:
+        best = int(np.argmax(snr))
+        if best == self.current or snr[best] < SWITCH_MARGIN * snr[self.current]:
+            self._challenger_blocks = 0
+            return self.current
+        if best != self._challenger:
+            self._challenger, self._challenger_blocks = best, 0
+        self._challenger_blocks += 1
+        if self._challenger_blocks >= SWITCH_HOLD_BLOCKS:
+            self.current, self._challenger_blocks = best, 0
+        return self.current
+
+    def _estimate_delays(self) -> None:
+        """GCC-PHAT of every channel against the current best mic, limited to +/- max_delay."""
+        window = np.concatenate(self._recent, axis=0)
+        nfft = 1 << int(np.ceil(np.log2(len(window) + self.max_delay)))
+        spectra = np.fft.rfft(window, n=nfft, axis=0)
+        cross = spectra * np.conj(spectra[:, self.current:self.current + 1])
+        cross /= np.abs(cross) + 1e-12
+        corr = np.fft.irfft(cross, n=nfft, axis=0)
+        lags = np.r_[nfft - self.max_delay:nfft, 0:self.max_delay + 1]
+        self.delays = np.argmax(corr[lags], axis=0) - self.max_delay
+
+    def _beamform(self, block: np.ndarray, speech: bool) -> np.ndarray:
+        if speech:
+            self._recent.append(block.copy())  # sounddevice reuses indata
+            self._speech_blocks += 1
+            if self._speech_blocks % BEAM_UPDATE_BLOCKS == 0 and len(self._recent) == BEAM_WINDOW_BLOCKS:
+                self._estimate_delays()
+        extended = np.concatenate((self._history, block), axis=0)
+        self._history = extended[-len(self._history):]
+        # x_c(t) = s(t - d_c): read channel c at t - max_delay + d_c so all mics line up
+        rows = (len(self._history) - self.max_delay + np.arange(len(block)))[:, None] + self.delays[None, :]
+        return extended[rows, np.arange(self.channels)].mean(axis=1)
+
+    def mix(self, block: np.ndarray) -> np.ndarray:
+        """(frames, channels) float32 -> (frames, 1) float32."""
+        if self.channels == 1:
+            return block.copy()
+        snr = self._track(block)
+        best = self._select(snr)
+        if self.mode == "beam":
+            mono = self._beamform(block, bool(snr[best] > SPEECH_SNR))
+        else:
+            mono = block[:, best]
+        return np.array(mono, dtype=np.float32)[:, None]  # copy: indata is reused by sounddevice
+
 
 class AudioRecorder:
-    def __init__(self, samplerate=RECORD_SAMPLERATE, channels=1, blocksize=1024):
+    def __init__(self, samplerate=RECORD_SAMPLERATE, channels=None, blocksize=1024, device=None):
         self.samplerate = samplerate
-        self.channels = channels
+        self.channels = channels  # None = decide from the device when the stream opens
         self.blocksize = blocksize
+        self.device = device if device is not None else audio_device()
+        self.mixer = None
 
         self.state = RecorderState.IDLE
         self.state_lock = threading.Lock()
@@ -36,22 +156,65 @@ class AudioRecorder:
 
         self.stream = None
 
+        # File-backed recording (start(audio_path=...)): the buffer only holds blocks not yet
+        # written, and chunks are read back from the file, so memory stays bounded.
+        self.audio_path = None
+        self.writer = None
+        self.writer_thread = None
+        self.read_frame = 0
+
+        # Capture health: PortAudio input overflows and frames dropped by the buffer cap
+        self.input_overflows = 0
+        self.dropped_frames = 0
+
     def _callback(self, indata, frames, time, status):
+        if status and status.input_overflow:
+            self.input_overflows += 1
+        if self.state != RecorderState.RECORDING:
+            return
+        mono = self.mixer.mix(indata) if self.mixer else indata.copy()
         with self.state_lock:
             if self.state == RecorderState.RECORDING:
-                self.buffer.append(indata.copy())
+                self.buffer.append(mono)
                 self.buffer_frames += frames
                 self.total_frames_recorded += frames
+                if self.writer:
+                    while self.buffer_frames > MAX_UNWRITTEN_SECONDS * self.samplerate:
+                        dropped = self.buffer.popleft()
+                        self.buffer_frames -= len(dropped)
+                        self.dropped_frames += len(dropped)
+
+    def start(self, audio_path=None):
+        """Start capturing. With audio_path, audio is streamed to that FLAC file as it arrives."""
+        import sounddevice as sd  # initializes PortAudio; only needed once recording starts
 
-    def start(self):
         with self.state_lock:
             if self.state != RecorderState.IDLE:
                 return
             self.state = RecorderState.RECORDING
 
+        if audio_path:
+            self.buffer.clear()
+            self.buffer_frames = 0
+            self.total_frames_recorded = 0
+            self.read_frame = 0
+            self.input_overflows = 0
+            self.dropped_frames = 0
+            self.audio_path = audio_path
+            self.writer = audiofile.FlacWriter(audio_path, self.samplerate)
+            self.writer_thread = threading.Thread(target=self._write_loop, daemon=True)
+            self.writer_thread.start()
+        else:
+            self.audio_path = self.writer = None
+
+        if self.channels is None:
+            self.channels = input_channels(sd, self.device)
+        self.mixer = ChannelMixer(self.channels, self.samplerate) if self.channels > 1 else None
         self.stream = sd.InputStream(
+            device=self.device,
             samplerate=self.samplerate,
             channels=self.channels,
+            dtype="float32",
             blocksize=self.blocksize,
             callback=self._callback,
         )
@@ -75,12 +238,55 @@ class AudioRecorder:
             self.stream.stop()
             self.stream.close()
             self.stream = None
+        if self.writer_thread:
+            self.writer_thread.join()
+            self.writer_thread = None
+
+    def _drain(self) -> None:
+        with self.state_lock:
+            blocks = list(self.buffer)
+            self.buffer.clear()
+            self.buffer_frames = 0
+        for block in blocks:
+            self.writer.write(block)
+
+    def _write_loop(self) -> None:
+        """Encode captured blocks to the recording file until stop(), then finalize it."""
+        while self.stream is not None or self.state != RecorderState.IDLE:
+            self._drain()
+            time.sleep(WRITE_INTERVAL_SECONDS)
+        self._drain()
+        self.writer.close()
+
+    @property
+    def frames_written(self) -> int:
+        return self.writer.frames if self.writer else 0
+
+    def backlog_seconds(self) -> float:
+        """Recorded audio not yet handed out by pop_chunk (what transcription is behind by)."""
+        if self.writer:
+            return (self.frames_written + self.buffer_frames - self.read_frame) / self.samplerate
+        return self.buffer_frames / self.samplerate
+
+    def _read_chunk(self, frames_needed):
+        """Next chunk of exactly frames_needed from the recording file, or None if not there yet."""
+        if self.frames_written - self.read_frame < frames_needed + READ_MARGIN_SECONDS * self.samplerate:
+            return None
+        audio, _ = audiofile.read_samples(self.audio_path, self.read_frame, frames_needed)
+        if len(audio) < frames_needed:
+            return None
+        self.last_chunk_start_time = self.read_frame / self.samplerate
+        self.read_frame += frames_needed
+        self.last_chunk_end_time = self.read_frame / self.samplerate
+        return audio
 
     def pop_chunk(self, seconds=30):
         """
         Returns a numpy array of exactly `seconds` audio, or None.
         """
         frames_needed = int(seconds * self.samplerate)
+        if self.writer:
+            return self._read_chunk(frames_needed)
 
         with self.state_lock:
             if self.buffer_frames < frames_needed:
@@ -119,6 +325,13 @@ class AudioRecorder:
         Return all remaining buffered audio, or None.
         Used for graceful shutdown.
         """
+        if self.writer:
+            if self.writer_thread:
+                return None  # still recording; the file isn't finalized
+            audio, _ = audiofile.read_samples(self.audio_path, self.read_frame)
+            self.read_frame += len(audio)
+            return audio if len(audio) else None
+
         with self.state_lock:
             if self.buffer_frames == 0:
                 return None
@@ -131,3 +344,35 @@ class AudioRecorder:
 
     def last_chunk_times(self):
         return self.last_chunk_start_time, self.last_chunk_end_time
+
+
+class StreamRecorder(AudioRecorder):
+    """AudioRecorder fed over the network (gateway mode) instead of from a local mic.
+
+    feed() takes little-endian int16 mono PCM as it arrives; buffering, the FLAC file, chunking
+    and the backlog cap work exactly as for local capture.
+    """
+
+    def __init__(self, samplerate=WHISPER_SAMPLERATE):
+        super().__init__(samplerate=samplerate, channels=1, device=None)
+
+    def start(self, audio_path=None):
+        with self.state_lock:
+            if self.state != RecorderState.IDLE:
+                return
+            self.state = RecorderState.RECORDING
+        self.buffer.clear()
+        self.buffer_frames = 0
+        self.total_frames_recorded = 0
+        self.read_frame = 0
+        self.dropped_frames = 0
+        self.audio_path = audio_path
+        self.writer = audiofile.FlacWriter(audio_path, self.samplerate) if audio_path else None
+        if self.writer:
+            self.writer_thread = threading.Thread(target=self._write_loop, daemon=True)
+            self.writer_thread.start()
+
+    def feed(self, pcm: bytes) -> None:
+        block = np.frombuffer(pcm[: len(pcm) - len(pcm) % 2], dtype="<i2").astype(np.float32) / 32768.0
+        if len(block):
+            self._callback(block[:, None], len(block), None, None)
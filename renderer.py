@@ -0,0 +1,177 @@
+"""Render meeting notes (Markdown) to PDF, HTML and plain text.
+
+The Markdown parser is built once per process. PDFs are laid out in one long-lived worker
+process (PyMuPDF's built-in fonts) so rendering doesn't hold the GIL against transcription.
+"""
+import io
+import multiprocessing
+import re
+import threading
+
+PAGE_SIZE = "A4"
+PAGE_BORDERS = (36, 36, -36, -36)  # points: left, top, right, bottom
+RENDER_TIMEOUT_SECONDS = 120
+
+NOTES_CSS = """
+body { font-family: sans-serif; font-size: 11pt; line-height: 1.4; color: #222; }
+h1 { font-size: 20pt; margin-bottom: 6pt; }
+h2 { font-size: 14pt; margin-top: 12pt; }
+ul { margin-top: 2pt; }
+hr { margin: 8pt 0; }
+"""
+
+_parser = None
+_worker: "_Worker | None" = None
+_worker_lock = threading.Lock()  # one render at a time in the worker, and one worker
+
+
+class RenderWorkerDied(RuntimeError):
+    """The render worker process exited mid-render (e.g. OOM-killed)."""
+
+
+def _markdown():
+    global _parser
+    if _parser is None:
+        from markdown_it import MarkdownIt
+        _parser = MarkdownIt("commonmark").enable("table")
+    return _parser
+
+
+def render_html(markdown_text: str) -> str:
+    """Markdown -> HTML fragment."""
+    return _markdown().render(markdown_text)
+
+
+def render_html_document(markdown_text: str, title: str = "") -> str:
+    """Standalone HTML page with the notes stylesheet inlined (for email bodies)."""
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{_escape(title)}</title><style>{NOTES_CSS}</style></head>"
+        f"<body>{render_html(markdown_text)}</body></html>"
+    )
+
+
+def render_text(markdown_text: str) -> str:
+    """Markdown -> readable plain text (drops emphasis markers, headings and rules)."""
+    lines = []
+    for line in markdown_text.splitlines():
+        if line.strip() == "---":
+            continue
+        line = re.sub(r"^#+\s*", "", line)
+        line = line.replace("**", "").replace("__", "")
+        lines.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip() + "\n"
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def render_pdf(markdown_text: str, output) -> None:
+    """Lay out markdown_text into a PDF at `output` (path or binary file object), in this process."""
+    import pymupdf
+    rect = pymupdf.paper_rect(PAGE_SIZE)
+    where = rect + PAGE_BORDERS
+    story = pymupdf.Story(html=render_html(markdown_text), user_css=NOTES_CSS)
+    writer = pymupdf.DocumentWriter(output)
+    more = 1
+    while more:
+        device = writer.begin_page(rect)
+        more, _ = story.place(where)
+        story.draw(device)
+        writer.end_page()
+    writer.close()
+
+
+def _warm_up() -> None:
+    """Import PyMuPDF and lay out a page before the first real render."""
+    render_pdf("# SafeScribe\n\n**Summary:**\n- warm up", io.BytesIO())
+
+
+def _serve(conn) -> None:
+    """Worker process: render each (markdown_text, output_path) received, reply with None or the error."""
+    _warm_up()
+    while True:
+        try:
+            markdown_text, output_path = conn.recv()
+        except EOFError:
+            return  # the API process went away
+        try:
+            render_pdf(markdown_text, output_path)
+            conn.send(None)
+        except Exception as e:
+            conn.send(f"{type(e).__name__}: {e}")
+
+
+class _Worker:
+    def __init__(self):
+        # spawn: never fork the API process (threads, loaded Whisper model)
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def render(self, markdown_text: str, output_path: str, timeout: float) -> None:
+        self.conn.send((markdown_text, output_path))
+        if not self.conn.poll(timeout):
+            raise TimeoutError(f"PDF render took over {timeout:.0f}s")
+        try:
+            error = self.conn.recv()
+        except EOFError:
+            raise RenderWorkerDied(f"Render worker exited with code {self.process.exitcode}") from None
+        if error:
+            raise RuntimeError(error)
+
+    def stop(self) -> None:
+        self.conn.close()
+        self.process.terminate()
+        self.process.join(timeout=5)
+
+
+def start_worker() -> None:
+    """Start and warm the render worker ahead of the first meeting."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = _Worker()
+
+
+def stop_worker() -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _worker.stop()
+        _worker = None
+
+
+def worker_pid() -> int | None:
+    """PID of the render worker, if one is running."""
+    worker = _worker
+    return worker.process.pid if worker is not None else None
+
+
+def render_pdf_in_worker(markdown_text: str, output_path: str) -> None:
+    """Render in the worker process (started on first use).
+
+    Renders in-process only if no worker process can be started. A render still running after
+    RENDER_TIMEOUT_SECONDS has its worker killed and raises TimeoutError; a worker that dies
+    mid-render raises RenderWorkerDied. Either way the next call starts a fresh worker.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.process.is_alive():
+            if _worker is not None:
+                _worker.stop()
+            try:
+                _worker = _Worker()
+            except OSError:
+                _worker = None
+                render_pdf(markdown_text, output_path)
+                return
+        try:
+            _worker.render(markdown_text, output_path, RENDER_TIMEOUT_SECONDS)
+        except (TimeoutError, RenderWorkerDied, OSError):
+            _worker.stop()
+            _worker = None
+            raise
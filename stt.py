@@ -1,34 +1,219 @@
+import contextlib
+import functools
+import math
+import time
+
 import numpy as np
-from scipy import signal
-from faster_whisper import WhisperModel
+
+import audiofile
+import model_store
+import tracing
+import transcript_filter
+from config import TRANSCRIPT_FILTER, WHISPER_ALLOW_DOWNLOAD, WHISPER_COMPUTE_TYPE, WHISPER_MODEL, WORD_TIMESTAMPS
 
 WHISPER_SAMPLERATE = 16000
+DEFAULT_BEAM_SIZE = 5  # faster-whisper's default; 1 = greedy decoding (faster, slightly less accurate)
+# Batched re-transcription: speech segments decoded together, from windows of the file read in turn
+BATCH_SIZE = 8
+BATCH_WINDOW_SECONDS = 300  # ~19 MB at 16 kHz; bounds memory however long the recording
+# Adjacent windows share this much audio, so speech cut at a window's end is decoded whole by the next
+BATCH_OVERLAP_SECONDS = 5
+BATCH_EDGE_SECONDS = 1  # a segment ending this close to a window's end may have been cut off
 
 
 class WhisperSTT:
-    def __init__(self):
-        print("Loading Whisper model...")
-        self.model = WhisperModel(
-            "base",           # change model here
-            compute_type="int8"  # use float16 if running on GPU
+    def __init__(
+        self,
+        model_name: str = WHISPER_MODEL,
+        allow_download: bool = WHISPER_ALLOW_DOWNLOAD,
+        cpu_threads: int = 0,  # 0 = CTranslate2's default
+    ):
+        start = time.perf_counter()
+        # Prefer the local store: a plain directory path, so faster-whisper never queries the hub
+        try:
+            path = model_store.resolve(model_name)
+        except model_store.ModelStoreError as e:
+            print(f"{e}; falling back to the Hugging Face cache")
+            path = None
+        if path is not None:
+            model_store.prefetch(path)
+            self.model_source = "store"
+
+        from faster_whisper import WhisperModel  # heavy (ctranslate2, av, tokenizers); load on demand
+
+        print(f"Loading Whisper model '{model_name}'...")
+        if path is not None:
+            self.model = WhisperModel(path, compute_type=WHISPER_COMPUTE_TYPE, cpu_threads=cpu_threads)
+        else:
+            self.model = self._load_from_hub(WhisperModel, model_name, allow_download, cpu_threads)
+        self.model_name = model_name
+        self._batched = None  # BatchedInferencePipeline over the same model, made on first use
+        self.load_seconds = time.perf_counter() - start
+        print(f"Whisper model loaded from {self.model_source} in {self.load_seconds:.1f}s.")
+
+    def _load_from_hub(self, WhisperModel, model_name: str, allow_download: bool, cpu_threads: int):
+        """Hub cache first (offline), then a download into the store if the device is online."""
+        try:
+            model = WhisperModel(
+                model_name, compute_type=WHISPER_COMPUTE_TYPE, cpu_threads=cpu_threads, local_files_only=True
+            )
+            self.model_source = "cache"
+            return model
+        except Exception:
+            if not (allow_download and model_store.has_default_route()):
+                raise model_store.ModelStoreError(
+                    f"Whisper model '{model_name}' is not installed; run: python model_store.py fetch {model_name}"
+                )
+        path = model_store.fetch(model_name)
+        self.model_source = "download"
+        return WhisperModel(path, compute_type=WHISPER_COMPUTE_TYPE, cpu_threads=cpu_threads)
+
+    def transcribe(self, audio, samplerate=WHISPER_SAMPLERATE, beam_size=DEFAULT_BEAM_SIZE):
+        return " ".join(segment[2] for segment in self.transcribe_segments(audio, samplerate, beam_size))
+
+    def transcribe_segments(
+        self, audio, samplerate=WHISPER_SAMPLERATE, beam_size=DEFAULT_BEAM_SIZE, word_timestamps=False
+    ) -> list:
+        """(start, end, text) per Whisper segment; times are seconds from the start of `audio`.
+
+        With word_timestamps each is (start, end, text, [(start, end, word), ...]). Hallucinated
+        segments are left out (see transcript_filter).
+        """
+        audio = _whisper_input(audio, samplerate)
+        with tracing.span("stt.transcribe", audioSeconds=round(len(audio) / WHISPER_SAMPLERATE, 2),
+                          model=self.model_name, beamSize=beam_size, words=word_timestamps) as attrs:
+            segments, _ = self.model.transcribe(
+                audio, language="en", task="transcribe", beam_size=beam_size, word_timestamps=word_timestamps
+            )
+            kept, attrs["dropped"] = _clean(segments, word_timestamps)
+            if not word_timestamps:
+                return [(s.start, s.end, text) for s, text, _ in kept]
+            return [(s.start, s.end, text, words) for s, text, words in kept]
+
+    def transcribe_batched(self, path: str, batch_size: int = BATCH_SIZE, window_slot=None) -> dict:
+        """Transcribe a stored recording, decoding its VAD speech segments batch_size at a time.
+
+        Much faster than chunk-by-chunk transcribe() for re-runs over archived audio. See
+        batched_transcript() for what it returns and window_slot.
+        """
+        return batched_transcript(
+            path, functools.partial(self.transcribe_window, batch_size=batch_size), window_slot,
+            model=self.model_name, batchSize=batch_size,
         )
-        print("Whisper model loaded.")
-
-    def transcribe(self, audio, samplerate=WHISPER_SAMPLERATE):
-        # Pass numpy directly to avoid temp file I/O (faster on Pi)
-        audio = np.asarray(audio, dtype=np.float32)
-        if audio.ndim > 1:
-            audio = audio.squeeze()
-        if audio.dtype == np.int16:
-            audio = audio.astype(np.float32) / 32768.0
-        elif audio.dtype != np.float32:
-            audio = audio.astype(np.float32)
-
-        # Resample to 16 kHz if needed (Whisper expects 16k)
-        if samplerate != WHISPER_SAMPLERATE:
-            num_samples = int(len(audio) * WHISPER_SAMPLERATE / samplerate)
-            audio = signal.resample(audio, num_samples).astype(np.float32)
-
-        segments, _ = self.model.transcribe(audio, language="en", task="transcribe")
-        return " ".join(s.text for s in segments)
 
+    def transcribe_window(self, path: str, start: int, batch_size: int = BATCH_SIZE) -> tuple[list, int, int]:
+        """One BATCH_WINDOW_SECONDS window of path from sample `start`, batched: (segments as
+        transcribe_segments() with word_timestamps, in seconds from the start of the window,
+        hallucinated segments dropped, samples read)."""
+        if self._batched is None:
+            from faster_whisper import BatchedInferencePipeline
+            self._batched = BatchedInferencePipeline(model=self.model)
+        samplerate = audiofile.samplerate_of(path)
+        window, _ = audiofile.read_samples(path, start, int(BATCH_WINDOW_SECONDS * samplerate))
+        if not len(window):
+            return [], 0, 0
+        segments, _ = self._batched.transcribe(
+            _whisper_input(window, samplerate), language="en", task="transcribe", batch_size=batch_size,
+            word_timestamps=WORD_TIMESTAMPS,
+        )
+        kept, dropped = _clean(segments, WORD_TIMESTAMPS)
+        return [(s.start, s.end, text, words or []) for s, text, words in kept], dropped, len(window)
+
+
+def batched_transcript(path: str, transcribe_window, window_slot=None, **span_attrs) -> dict:
+    """Batched transcript of a whole recording, read and decoded a window at a time.
+
+    transcribe_window(path, start) is WhisperSTT.transcribe_window (or a worker's). window_slot,
+    if given, returns a context manager held around each window (a FairGate slot), so a long
+    re-run gives way to live transcription between windows. Adjacent windows overlap by
+    BATCH_OVERLAP_SECONDS. A segment reaching a window's last BATCH_EDGE_SECONDS is taken from
+    the next window instead (unless it starts before that window does), and the next window's
+    segments centred before the end of the last one kept are duplicates. Returns {text, segments,
+    audioSeconds, wallSeconds, throughput}: segments as transcribe_segments() with
+    word_timestamps, in seconds from the start of the file; throughput is audio-seconds per
+    wall-second.
+    """
+    samplerate = audiofile.samplerate_of(path)
+    window = int(BATCH_WINDOW_SECONDS * samplerate)
+    overlap = int(BATCH_OVERLAP_SECONDS * samplerate)
+    started = time.perf_counter()
+    timed = []
+    start = read_to = 0
+    last_end = 0.0  # seconds, of the last segment kept
+    dropped = 0
+    with tracing.span("stt.batched", **span_attrs) as attrs:
+        while True:
+            with window_slot() if window_slot else contextlib.nullcontext():
+                segments, window_dropped, frames = transcribe_window(path, start)
+            if not frames:
+                break
+            offset = start / samplerate
+            read_to = start + frames
+            last = frames < window  # end of the file
+            next_start = read_to - overlap
+            edge = math.inf if last else read_to / samplerate - BATCH_EDGE_SECONDS
+            dropped += window_dropped
+            for s, e, text, words in segments:
+                s, e = offset + s, offset + e
+                if (s + e) / 2 < last_end:
+                    continue  # kept from the previous window
+                if e > edge and s >= next_start / samplerate:
+                    break  # possibly cut off; the next window decodes it whole
+                timed.append((s, e, text, [(offset + ws, offset + we, word) for ws, we, word in words]))
+                last_end = e
+            if last:
+                break
+            start = next_start
+        if TRANSCRIPT_FILTER:
+            repeats = transcript_filter.RepetitionFilter()
+            timed = repeats.filter(timed)
+            dropped += repeats.dropped
+        texts = [segment[2].strip() for segment in timed]
+        attrs["dropped"] = dropped
+        audio_seconds = read_to / samplerate
+        wall_seconds = time.perf_counter() - started
+        attrs["audioSeconds"] = round(audio_seconds, 1)
+        attrs["throughput"] = round(audio_seconds / wall_seconds, 1) if wall_seconds else 0
+    return {
+        "text": " ".join(t for t in texts if t),
+        "segments": timed,
+        "audioSeconds": audio_seconds,
+        "wallSeconds": wall_seconds,
+        "throughput": attrs["throughput"],
+    }
+
+
+def _clean(segments, word_timestamps: bool) -> tuple[list, int]:
+    """(segment, text, words) for each faster-whisper segment kept by the hallucination filter,
+    and how many were dropped. words are (start, end, word), or None without word_timestamps."""
+    kept = []
+    dropped = 0
+    for s in segments:  # a generator: decoding happens as it is consumed
+        text = s.text
+        words = [(w.start, w.end, w.word) for w in s.words or []] if word_timestamps else None
+        if TRANSCRIPT_FILTER:
+            cleaned = transcript_filter.clean_segment(text, words, s.no_speech_prob, s.avg_logprob)
+            if cleaned is None:
+                dropped += 1
+                continue
+            text, words = cleaned
+        kept.append((s, text, words))
+    return kept, dropped
+
+
+def _whisper_input(audio, samplerate: int) -> np.ndarray:
+    """Mono float32 at 16 kHz, as Whisper expects (numpy in, no temp files: faster on the Pi)."""
+    audio = np.asarray(audio)
+    if audio.ndim > 1:
+        audio = audio.squeeze()
+    if audio.dtype == np.int16:
+        audio = audio.astype(np.float32) / 32768.0
+    elif audio.dtype != np.float32:
+        audio = audio.astype(np.float32)
+
+    if samplerate != WHISPER_SAMPLERATE:
+        from scipy import signal
+
+        num_samples = int(len(audio) * WHISPER_SAMPLERATE / samplerate)
+        audio = signal.resample(audio, num_samples).astype(np.float32)
+    return audio
@@ -0,0 +1,230 @@
+"""Whisper in worker processes, for transcription that doesn't hold the API process's GIL.
+
+SttPool has WhisperSTT's interface. Each worker loads its own model at spawn. Audio is passed
+through a shared-memory block: the chunk is copied in once and only the block's name is
+pickled. The worker runs the resampling, the numpy conversions and the decoding, so the
+audio callback, FastAPI and the live loop no longer wait on that work. With several workers,
+submit() lets the post-recording tail transcribe several chunks at once.
+"""
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Callable
+
+import numpy as np
+
+import tracing
+from config import WHISPER_ALLOW_DOWNLOAD, WHISPER_MODEL
+
+_stt = None  # the worker process's WhisperSTT
+_load_error: str | None = None
+
+
+def _init_worker(model_name: str, allow_download: bool, cpu_threads: int) -> None:
+    global _stt, _load_error
+    from stt import WhisperSTT
+
+    try:
+        _stt = WhisperSTT(model_name, allow_download=allow_download, cpu_threads=cpu_threads)
+    except Exception as e:
+        _load_error = str(e)  # reported by _worker_info; raising here would only break the pool
+
+
+def _worker_info() -> dict:
+    if _stt is None:
+        return {"error": _load_error or "model not loaded"}
+    return {"pid": os.getpid(), "source": _stt.model_source, "loadSeconds": _stt.load_seconds}
+
+
+def _transcribe_shared(name: str, length: int, samplerate: int, beam_size: int, segments: bool, words: bool):
+    """(result, segments dropped as hallucinations), the count read off WhisperSTT's span."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        audio = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+        try:
+            with tracing.job("stt-worker") as trace:  # no sink in the worker: spans stay here
+                if segments:
+                    result = _stt.transcribe_segments(
+                        audio, samplerate=samplerate, beam_size=beam_size, word_timestamps=words
+                    )
+                else:
+                    result = _stt.transcribe(audio, samplerate=samplerate, beam_size=beam_size)
+            return result, sum(span["attrs"].get("dropped", 0) for span in trace.spans)
+        finally:
+            del audio  # the block can't be closed while a view on it exists
+    finally:
+        shm.close()
+
+
+def _transcribe_window(path: str, start: int, batch_size: int) -> tuple[list, int, int]:
+    return _stt.transcribe_window(path, start, batch_size=batch_size)
+
+
+class SttPool:
+    def __init__(
+        self,
+        workers: int,
+        model_name: str = WHISPER_MODEL,
+        allow_download: bool = WHISPER_ALLOW_DOWNLOAD,
+    ):
+        start = time.perf_counter()
+        self.workers = workers
+        self.model_name = model_name
+        self._allow_download = allow_download
+        # Split the cores between workers so their CTranslate2 thread pools don't oversubscribe
+        self._cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._restart_lock = threading.Lock()  # one restart for all the work a dead worker broke
+        info = self._start()
+        self.model_source = info[0]["source"]
+        self.load_seconds = time.perf_counter() - start
+        print(f"Whisper model loaded in {workers} worker processes in {self.load_seconds:.1f}s.")
+
+    def _start(self) -> list[dict]:
+        """(Re)start the workers and wait for every model to load."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            # spawn: never fork the API process (threads, sqlite connections, audio stream)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_name, self._allow_download, self._cpu_threads),
+            )
+            executor = self._executor
+        info = [f.result() for f in [executor.submit(_worker_info) for _ in range(self.workers)]]
+        errors = [i["error"] for i in info if "error" in i]
+        if errors:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise RuntimeError(f"Whisper worker failed to load '{self.model_name}': {errors[0]}")
+        return info
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Restart the workers, unless that was already done since `broken` failed."""
+        with self._restart_lock:
+            if self._executor is broken:
+                print("Whisper worker died; restarting workers")
+                self._start()
+
+    def _with_restart(self, submit: Callable[[ProcessPoolExecutor], Future], unpack=None) -> Future:
+        """Future of submit(executor), with unpack applied to its result. If a worker dies under
+        it (e.g. OOM-killed) the workers are restarted, off the caller's thread, and it is
+        submitted once more."""
+        outer = Future()
+
+        def attempt(retries: int) -> None:
+            executor = self._executor
+            try:
+                inner = submit(executor)
+            except BaseException as e:
+                failed(executor, e, retries)
+                return
+            inner.add_done_callback(lambda f: finished(f, executor, retries))
+
+        def finished(inner: Future, executor: ProcessPoolExecutor, retries: int) -> None:
+            if inner.cancelled():
+                outer.cancel()
+            elif inner.exception() is not None:
+                failed(executor, inner.exception(), retries)
+            else:
+                outer.set_result(unpack(inner.result()) if unpack else inner.result())
+
+        def failed(executor: ProcessPoolExecutor, error: BaseException, retries: int) -> None:
+            if not (isinstance(error, BrokenProcessPool) and retries):
+                outer.set_exception(error)
+                return
+
+            def restart():
+                try:
+                    self._restart(executor)
+                except BaseException as e:
+                    outer.set_exception(e)
+                    return
+                attempt(retries - 1)
+
+            threading.Thread(target=restart, daemon=True).start()
+
+        attempt(1)
+        return outer
+
+    def submit(
+        self, audio, samplerate: int, beam_size: int | None = None, segments: bool = False, word_timestamps: bool = False
+    ) -> Future:
+        """Queue a chunk; the Future resolves to its text (or, with segments=True, what
+        WhisperSTT.transcribe_segments returns). Retried once on fresh workers if a worker dies."""
+        return self._submit(audio, samplerate, beam_size, segments, word_timestamps, unpack=lambda r: r[0])
+
+    def _submit(
+        self, audio, samplerate: int, beam_size: int | None, segments: bool, word_timestamps: bool, unpack=None
+    ) -> Future:
+        """submit(), resolving to (result, segments dropped as hallucinations) unless unpacked.
+        The shared block is freed when it's done."""
+        from stt import DEFAULT_BEAM_SIZE
+
+        audio = np.asarray(audio)
+        if audio.dtype == np.int16:
+            audio = audio.astype(np.float32) / 32768.0
+        audio = audio.reshape(-1)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+        try:
+            np.copyto(np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf), audio, casting="same_kind")
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        args = (shm.name, len(audio), samplerate, DEFAULT_BEAM_SIZE if beam_size is None else beam_size,
+                segments, word_timestamps)
+        future = self._with_restart(lambda executor: executor.submit(_transcribe_shared, *args), unpack)
+
+        def _release(_):
+            shm.close()
+            shm.unlink()
+
+        future.add_done_callback(_release)
+        return future
+
+    def transcribe(self, audio, samplerate: int, beam_size: int | None = None) -> str:
+        """Same as WhisperSTT.transcribe; restarts the workers once if one died (e.g. OOM-killed)."""
+        return self._run(audio, samplerate, beam_size, segments=False)
+
+    def transcribe_segments(
+        self, audio, samplerate: int, beam_size: int | None = None, word_timestamps: bool = False
+    ) -> list:
+        return self._run(audio, samplerate, beam_size, segments=True, word_timestamps=word_timestamps)
+
+    def _run(self, audio, samplerate: int, beam_size: int | None, segments: bool, word_timestamps: bool = False):
+        with tracing.span("stt.transcribe", audioSeconds=round(len(audio) / samplerate, 2),
+                          model=self.model_name, beamSize=beam_size, worker=True) as attrs:
+            result, attrs["dropped"] = self._submit(audio, samplerate, beam_size, segments, word_timestamps).result()
+            return result
+
+    def transcribe_batched(self, path: str, batch_size: int | None = None, window_slot=None) -> dict:
+        """WhisperSTT.transcribe_batched, each window decoded in a worker (which reads it from the
+        file itself; no audio is passed)."""
+        import stt
+
+        return stt.batched_transcript(
+            path, functools.partial(self.transcribe_window, batch_size=batch_size), window_slot,
+            model=self.model_name, batchSize=batch_size or stt.BATCH_SIZE, worker=True,
+        )
+
+    def transcribe_window(self, path: str, start: int, batch_size: int | None = None) -> tuple[list, int, int]:
+        from stt import BATCH_SIZE
+
+        batch_size = batch_size or BATCH_SIZE
+        return self._with_restart(
+            lambda executor: executor.submit(_transcribe_window, path, start, batch_size)
+        ).result()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
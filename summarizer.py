@@ -1,16 +1,29 @@
 # summarizer.py
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
 import ollama
-from markdown_pdf import MarkdownPdf, Section
 import nltk
 from nltk.tokenize import sent_tokenize
 from typing import Dict, List, Optional, Tuple
 
+import renderer
+import tracing
+
 MODEL_NAME = "gemma2:2b-instruct-q4_0"
 MAX_PARALLEL_LLM = 4
 
+# Shared across concurrent jobs in gateway mode (see set_llm_gate); None = each job on its own
+_llm_gate = None
+
+
+def set_llm_gate(gate) -> None:
+    """Route every Ollama call through gate.slot(job id): a fairqueue.FairGate sized to what
+    the Ollama server can run at once, so many rooms' notes share it round-robin."""
+    global _llm_gate
+    _llm_gate = gate
+
 
 def num_predict_for(
     text: str,
@@ -30,6 +43,17 @@ def num_predict_for(
     return min(cap, base + extra)
 
 
+def _generate(stage: str, prompt: str, options: dict) -> str:
+    """One ollama.generate call, timed as an llm.<stage> span with its token counts."""
+    trace = tracing.current()
+    gate = _llm_gate.slot(trace.job_id if trace else "") if _llm_gate else nullcontext()
+    with gate, tracing.span(f"llm.{stage}", numPredict=options.get("num_predict")) as attrs:
+        result = ollama.generate(model=MODEL_NAME, prompt=prompt, options=options)
+        attrs["promptTokens"] = result.get("prompt_eval_count")
+        attrs["outputTokens"] = result.get("eval_count")
+    return result.get("response", "").strip()
+
+
 # ============================================================================
 # STAGE 1: Transcript Segmentation
 # ============================================================================
@@ -63,9 +87,18 @@ def segment_text(text, target_words=2500, window=50):
 # ============================================================================
 
 
+_SPEAKER_LABEL = re.compile(r"\bSpeaker \d+:")
+
+
 def _extract_actions(transcript: str) -> str:
+    # Diarized transcripts label lines "Speaker N:"; let the model attribute self-assigned tasks
+    speakers = (
+        "\nSpeaker labels (e.g. \"Speaker 2:\") mark who is talking. When a speaker takes on a task"
+        " themselves and no name is given, give that speaker label as responsible."
+        if _SPEAKER_LABEL.search(transcript) else ""
+    )
     prompt = f"""Extract all action items, tasks, or to-dos from this transcript.
-For each item, include who is responsible if mentioned.
+For each item, include who is responsible if mentioned.{speakers}
 List each as a single line starting with a dash.
 If none exist, respond with "None identified." Use complete and descriptive sentences.
 
@@ -74,11 +107,7 @@ Transcript:
 
 Action items:"""
     n = num_predict_for(transcript, base=150, cap=450)
-    return ollama.generate(
-        model=MODEL_NAME,
-        prompt=prompt,
-        options={"num_predict": n, "temperature": 0.3}
-    ).get("response", "").strip()
+    return _generate("actions", prompt, {"num_predict": n, "temperature": 0.3})
 
 
 def _extract_decisions(transcript: str) -> str:
@@ -91,11 +120,7 @@ Transcript:
 
 Decisions:"""
     n = num_predict_for(transcript, base=150, cap=450)
-    return ollama.generate(
-        model=MODEL_NAME,
-        prompt=prompt,
-        options={"num_predict": n, "temperature": 0.3}
-    ).get("response", "").strip()
+    return _generate("decisions", prompt, {"num_predict": n, "temperature": 0.3})
 
 
 def _extract_topics(transcript: str) -> str:
@@ -108,11 +133,7 @@ Transcript:
 
 Main topics:"""
     n = num_predict_for(transcript, base=200, cap=400)
-    return ollama.generate(
-        model=MODEL_NAME,
-        prompt=prompt,
-        options={"num_predict": n, "temperature": 0.4}
-    ).get("response", "").strip()
+    return _generate("topics", prompt, {"num_predict": n, "temperature": 0.4})
 
 
 def extract_content_structure(transcript: str) -> Dict[str, any]:
@@ -121,9 +142,9 @@ def extract_content_structure(transcript: str) -> Dict[str, any]:
     Runs actions, decisions, and topics extraction in parallel.
     """
     with ThreadPoolExecutor(max_workers=3) as ex:
-        actions_future = ex.submit(_extract_actions, transcript)
-        decisions_future = ex.submit(_extract_decisions, transcript)
-        topics_future = ex.submit(_extract_topics, transcript)
+        actions_future = ex.submit(tracing.bind(_extract_actions), transcript)
+        decisions_future = ex.submit(tracing.bind(_extract_decisions), transcript)
+        topics_future = ex.submit(tracing.bind(_extract_topics), transcript)
         action_items = actions_future.result()
         decisions = decisions_future.result()
         topics = topics_future.result()
@@ -153,15 +174,7 @@ Transcript:
 
 Summary (2-3 sentences only):"""
     n = num_predict_for(transcript, base=200, cap=400)
-    result = ollama.generate(
-        model=MODEL_NAME,
-        prompt=summary_prompt,
-        options={"num_predict": n, "temperature": 0.5}
-    )
-    
-    summary = result.get("response", "").strip()
-        
-    return summary
+    return _generate("summary", summary_prompt, {"num_predict": n, "temperature": 0.5})
 
 # ============================================================================
 # Merge Summaries & Title
@@ -176,12 +189,7 @@ Summary:
 
 Title:"""
     n = num_predict_for(text, base=30, cap=80, step=5, words_per_step=100)
-    result = ollama.generate(
-        model=MODEL_NAME,
-        prompt=prompt,
-        options={"num_predict": n, "temperature": 0.3}
-    )
-    return result.get("response", "").strip()
+    return _generate("title", prompt, {"num_predict": n, "temperature": 0.3})
 
 
 def _stitch_and_title(segment_summaries: list) -> Tuple[str, str]:
@@ -201,12 +209,7 @@ Segment Summaries:
 Response:"""
     combined = chr(10).join(segment_summaries)
     n = num_predict_for(combined, base=200, cap=500)
-    result = ollama.generate(
-        model=MODEL_NAME,
-        prompt=prompt,
-        options={"num_predict": n, "temperature": 0.4}
-    )
-    response = result.get("response", "").strip()
+    response = _generate("stitch", prompt, {"num_predict": n, "temperature": 0.4})
 
     # Parse SUMMARY: and TITLE: lines
     summary, title = "", ""
@@ -226,6 +229,16 @@ Response:"""
 # ============================================================================
 # STAGE 5: Assemble
 # ============================================================================
+def clean_items(lines: List[str]) -> List[str]:
+    """LLM list lines -> item texts: drop blanks and "None identified", strip bullet markers."""
+    items = []
+    for line in lines:
+        line = line.strip().lstrip("-* ").strip()
+        if line and "none identified" not in line.lower():
+            items.append(line)
+    return items
+
+
 def assemble(summary: str, merged: Dict[str, List[str]]) -> str:
     merged["action_items"] = [x for x in merged.get("action_items", []) if "none identified" not in x.lower()]
     merged["decisions"] = [x for x in merged.get("decisions", []) if "none identified" not in x.lower()]
@@ -260,9 +273,9 @@ def assemble(summary: str, merged: Dict[str, List[str]]) -> str:
 
 
 
-def markdown_to_pdf(markdown_content: str, output_pdf_path: str, title: str, date_time: str) -> None:
-    """Convert markdown notes to PDF - unchanged."""
-    full_markdown = f"""# {title}
+def notes_document(markdown_content: str, title: str, date_time: str) -> str:
+    """Full notes markdown: title heading, generation time, then the assembled sections."""
+    return f"""# {title}
 
 **Generated:** {date_time}
 
@@ -270,9 +283,12 @@ def markdown_to_pdf(markdown_content: str, output_pdf_path: str, title: str, dat
 
 {markdown_content}
 """
-    pdf = MarkdownPdf()
-    pdf.add_section(Section(full_markdown))
-    pdf.save(output_pdf_path)
+
+
+def markdown_to_pdf(markdown_content: str, output_pdf_path: str, title: str, date_time: str) -> None:
+    """Convert markdown notes to PDF in the render worker process."""
+    with tracing.span("render.pdf"):
+        renderer.render_pdf_in_worker(notes_document(markdown_content, title, date_time), output_pdf_path)
 
 def _process_segment(seg: str) -> Tuple[Dict[str, any], str]:
     """Extract structure and generate summary for one segment. Used for parallel execution."""
@@ -281,11 +297,11 @@ def _process_segment(seg: str) -> Tuple[Dict[str, any], str]:
     return structure, summary
 
 
-def save_summary_as_pdf(transcript: str, output_pdf_path: str) -> str:
+def summarize_transcript(transcript: str) -> Dict[str, any]:
     """
-    Summarize transcript, extract title, and save as PDF.
+    Summarize transcript and extract title, summary and item lists.
     Uses parallel LLM calls to reduce latency on multi-core systems.
-    Returns: meeting_title (for filename use)
+    Returns: {title, summary, action_items, decisions, topics, notes} where notes is the markdown body.
     """
     # STAGE 0: Split into segments
     segments = segment_text(transcript)
@@ -296,7 +312,7 @@ def save_summary_as_pdf(transcript: str, output_pdf_path: str) -> str:
     segment_summaries: List[str] = [None] * n_segments
 
     with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_LLM, n_segments)) as ex:
-        future_to_idx = {ex.submit(_process_segment, seg): i for i, seg in enumerate(segments)}
+        future_to_idx = {ex.submit(tracing.bind(_process_segment), seg): i for i, seg in enumerate(segments)}
         for future in as_completed(future_to_idx):
             idx = future_to_idx[future]
             structure, summary = future.result()
@@ -321,15 +337,17 @@ def save_summary_as_pdf(transcript: str, output_pdf_path: str) -> str:
     else:
         final_summary, title = _stitch_and_title(segment_summaries)
 
+    items = {key: clean_items(lines) for key, lines in merged.items()}
     notes_text = assemble(final_summary, merged)
+    return {"title": title, "summary": final_summary, "notes": notes_text, **items}
 
-    
-        
 
-    
-    #title, notes = summarize_and_extract_title(transcript)
+def save_summary_as_pdf(transcript: str, output_pdf_path: str) -> Dict[str, any]:
+    """
+    Summarize transcript and save the notes as PDF.
+    Returns the summarize_transcript() dict (title used for the filename).
+    """
+    result = summarize_transcript(transcript)
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    markdown_to_pdf(notes_text, output_pdf_path, title, now)
-    return title
-
-
+    markdown_to_pdf(result["notes"], output_pdf_path, result["title"], now)
+    return result
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Benchmark re-transcription of a stored recording - run from project root:
+
+    python tests/bench_batched.py recording.flac [--batch-size 8] [--skip-sequential]
+
+Compares chunk-by-chunk transcribe() (as the post-recording tail does) with batched inference
+over VAD segments (as /api/meetings/{id}/retranscribe does), in audio-seconds per wall-second.
+Accepts anything PyAV decodes (FLAC, WAV). Needs faster-whisper and a model in the store or cache.
+"""
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+CHUNK_SECONDS = 30
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--skip-sequential", action="store_true", help="only run the batched pass")
+    args = parser.parse_args()
+
+    import audiofile
+    from stt import BATCH_SIZE, WhisperSTT
+
+    stt = WhisperSTT()
+    print(f"Model: {stt.model_name} ({stt.model_source}), load {stt.load_seconds:.1f}s")
+
+    if not args.skip_sequential:
+        started = time.perf_counter()
+        audio_seconds = 0.0
+        words = 0
+        for chunk, samplerate in audiofile.iter_chunks(args.path, CHUNK_SECONDS):
+            audio_seconds += len(chunk) / samplerate
+            words += len(stt.transcribe(chunk, samplerate=samplerate).split())
+        wall = time.perf_counter() - started
+        print(f"sequential: {audio_seconds:7.0f}s audio in {wall:7.1f}s = {audio_seconds / wall:6.1f} audio-s/s, {words} words")
+
+    result = stt.transcribe_batched(args.path, batch_size=args.batch_size or BATCH_SIZE)
+    print(f"batched:    {result['audioSeconds']:7.0f}s audio in {result['wallSeconds']:7.1f}s = "
+          f"{result['throughput']:6.1f} audio-s/s, {len(result['text'].split())} words")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Benchmark API cold-start import time - run from project root: python tests/bench_import.py
+
+Imports api.server in a fresh interpreter with -X importtime, prints the wall time and the
+slowest top-level imports, and flags heavy modules that should only load on first use.
+"""
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["sounddevice", "faster_whisper", "scipy", "ollama", "markdown_it", "nltk", "pymupdf", "ctranslate2"]
+TOP_N = 15
+RUNS = 3
+
+
+def main():
+    walls = []
+    stderr = ""
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import api.server"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True,
+        )
+        walls.append(time.perf_counter() - start)
+        if out.returncode != 0:
+            print(out.stderr[-2000:])
+            sys.exit(1)
+        stderr = out.stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()[1:]))
+    # direct imports of api.server (one level of indentation in -X importtime output)
+    top_level = [(c, s, n.strip()) for c, s, n in rows if n.startswith("  ") and not n.startswith("    ")]
+    loaded = {r[2].strip().split(".")[0] for r in rows}
+
+    print(f"import api.server: best {min(walls):.3f}s, median {sorted(walls)[len(walls) // 2]:.3f}s over {RUNS} runs")
+    print()
+    print("Slowest imports made by api.server (cumulative):")
+    for cumulative, _, name in sorted(top_level, reverse=True)[:TOP_N]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print()
+    eager = [m for m in HEAVY_MODULES if m in loaded]
+    print("Heavy modules imported at startup:", ", ".join(eager) if eager else "none")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Benchmark Whisper model load time - run from project root: python tests/bench_model_load.py [model]
+
+Loads the model in fresh interpreters (as the API does at boot) and reports where it came from
+(store / cache / download) and how long WhisperSTT() took. Needs faster-whisper installed.
+"""
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 3
+
+_CHILD = """
+import json, time
+start = time.perf_counter()
+from stt import WhisperSTT
+stt = WhisperSTT({name!r})
+print(json.dumps({{"source": stt.model_source, "load": stt.load_seconds, "total": time.perf_counter() - start}}))
+"""
+
+
+def main():
+    sys.path.insert(0, PROJECT_ROOT)
+    from config import WHISPER_MODEL
+    name = sys.argv[1] if len(sys.argv) > 1 else WHISPER_MODEL
+
+    for i in range(RUNS):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(name=name)],
+            cwd=PROJECT_ROOT, capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            print(out.stderr[-2000:])
+            sys.exit(1)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"run {i + 1}: {name} from {result['source']:8} load {result['load']:.2f}s "
+              f"(incl. imports {result['total']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
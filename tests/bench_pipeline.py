@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""End-to-end recording -> notes benchmark, offline - run from project root:
+
+    python tests/bench_pipeline.py tests/fixtures/*.wav            # real Whisper, stub Ollama
+    python tests/bench_pipeline.py --speed 4 --llm-latency 2 meeting.wav
+    python tests/bench_pipeline.py --fake-stt 0.3 --synth 90        # no model or fixture needed
+
+Each WAV (16-bit PCM, any rate, 1-8 channels) is played through a fake sounddevice stream into
+AudioRecorder / RecorderService exactly as the mic would deliver it. Ollama is replaced by a
+local stub server with canned responses and a fixed per-call latency. Reports real-time factor,
+time to first live transcript, stop -> notes latency, peak RSS and LLM calls per prompt kind.
+Recorded fixtures aren't committed; put your own in tests/fixtures/.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import types
+import wave
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+BLOCK_FRAMES = 1024
+PROCESSING_TIMEOUT_SECONDS = 1800
+
+# Canned Ollama responses, keyed by how each summarizer prompt starts
+_LLM_RESPONSES = {
+    "Extract all action items": ("actions", "- Alice to send the revised budget by Friday.\n- Bob to book the venue."),
+    "Extract all decisions": ("decisions", "- The launch moves to the second week of March."),
+    "List the 3-5 main topics": ("topics", "- Q1 budget review\n- Launch timeline\n- Hiring plan"),
+    "Write a concise": ("summary", "The team reviewed the budget and agreed to move the launch. Owners were assigned."),
+    "Generate a concise but descriptive title": ("title", "Budget and Launch Planning"),
+    "You are given segment summaries": ("stitch", "SUMMARY: The team reviewed the budget and launch.\nTITLE: Budget and Launch Planning"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Stub Ollama server
+# ---------------------------------------------------------------------------
+
+class _StubOllama(BaseHTTPRequestHandler):
+    latency = 0.0
+    calls: Counter = Counter()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._reply({"models": [{"name": "stub"}]})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = request.get("prompt", "")
+        kind, text = next(
+            ((k, t) for prefix, (k, t) in _LLM_RESPONSES.items() if prompt.startswith(prefix)),
+            ("other", "None identified."),
+        )
+        with self.lock:
+            self.calls[kind] += 1
+        time.sleep(self.latency)
+        self._reply({"model": request.get("model", "stub"), "response": text, "done": True})
+
+
+def start_stub_ollama(latency: float) -> ThreadingHTTPServer:
+    _StubOllama.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Fake sounddevice
+# ---------------------------------------------------------------------------
+
+class FakeInputStream:
+    """Plays a (frames, channels) float32 array through the callback in BLOCK_FRAMES blocks."""
+
+    audio: np.ndarray = np.zeros((0, 1), dtype=np.float32)
+    speed = 1.0
+    finished = threading.Event()
+
+    def __init__(self, device=None, samplerate=44100, channels=1, dtype="float32", blocksize=BLOCK_FRAMES, callback=None):
+        self.samplerate = samplerate
+        self.blocksize = blocksize or BLOCK_FRAMES
+        self.callback = callback
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self._running = True
+        FakeInputStream.finished.clear()
+        self._thread = threading.Thread(target=self._play, daemon=True)
+        self._thread.start()
+
+    def _play(self):
+        interval = self.blocksize / self.samplerate / self.speed
+        next_at = time.perf_counter()
+        for i in range(0, len(self.audio), self.blocksize):
+            if not self._running:
+                return
+            block = self.audio[i:i + self.blocksize]
+            self.callback(block, len(block), None, None)
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.perf_counter()))
+        FakeInputStream.finished.set()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join()
+
+    def close(self):
+        pass
+
+
+def install_fake_sounddevice(channels: int) -> None:
+    sd = types.ModuleType("sounddevice")
+    sd.InputStream = FakeInputStream
+    sd.query_devices = lambda device=None, kind=None: {"name": "bench fixture", "max_input_channels": channels}
+    sys.modules["sounddevice"] = sd
+
+
+def load_wav(path: str, samplerate: int) -> np.ndarray:
+    """16-bit PCM WAV -> (frames, channels) float32 at `samplerate` (linear resample)."""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise SystemExit(f"{path}: only 16-bit PCM WAV is supported")
+        channels, rate = f.getnchannels(), f.getframerate()
+        pcm = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16).reshape(-1, channels)
+    audio = pcm.astype(np.float32) / 32768.0
+    if rate != samplerate:
+        t_out = np.arange(int(len(audio) * samplerate / rate)) / samplerate
+        t_in = np.arange(len(audio)) / rate
+        audio = np.stack([np.interp(t_out, t_in, audio[:, c]) for c in range(channels)], axis=1).astype(np.float32)
+    return audio
+
+
+def synth_audio(seconds: float, samplerate: int) -> np.ndarray:
+    """Noise bursts at speech-like levels, for --fake-stt runs without fixtures."""
+    rng = np.random.default_rng(0)
+    n = int(seconds * samplerate)
+    envelope = np.repeat(rng.random(n // 4410 + 1) > 0.3, 4410)[:n]
+    return (rng.standard_normal(n) * 0.1 * envelope).astype(np.float32)[:, None]
+
+
+class FakeSTT:
+    """Stand-in for WhisperSTT that takes `rtf` x the audio duration and returns filler text."""
+
+    model_name, model_source, load_seconds = "fake", "fake", 0.0
+
+    def __init__(self, rtf: float):
+        self.rtf = rtf
+
+    def transcribe(self, audio, samplerate=16000, beam_size=5):
+        segments = self.transcribe_segments(audio, samplerate=samplerate, beam_size=beam_size)
+        return " ".join(segment[2] for segment in segments)
+
+    def transcribe_segments(self, audio, samplerate=16000, beam_size=5, word_timestamps=False):
+        seconds = len(audio) / samplerate
+        time.sleep(self.rtf * seconds)
+        segments = [
+            (0.0, seconds / 2, "We reviewed the budget and agreed to move the launch to March."),
+            (seconds / 2, seconds, "I will send the updated plan to the team."),
+        ]
+        if not word_timestamps:
+            return segments
+        timed = []
+        for start, end, text in segments:
+            words = text.split()
+            step = (end - start) / len(words)
+            timed.append((start, end, text, [(start + i * step, start + (i + 1) * step, w) for i, w in enumerate(words)]))
+        return timed
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def _peak_rss_mb() -> float:
+    """Peak RSS of this (the API) process in MB; Linux reports ru_maxrss in KB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _worker_peak_rss_mb(renderer) -> float:
+    """Peak RSS of the live render worker process, from /proc VmHWM (0 if unavailable)."""
+    pid = renderer.worker_pid()
+    if pid is None:
+        return 0.0
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def _stage_summary(trace) -> str:
+    """Slowest stages of one job (seconds summed per span name; spans nest, so these overlap)."""
+    totals = Counter()
+    for sp in trace.spans:
+        if sp["name"] != "job.total":
+            totals[sp["name"]] += sp["durationMs"] / 1000
+    return ", ".join(f"{name} {seconds:.1f}s" for name, seconds in totals.most_common(6))
+
+
+def run_one(service, storage, name: str, audio: np.ndarray, samplerate: int, speed: float) -> dict:
+    FakeInputStream.audio = audio
+    FakeInputStream.speed = speed
+    audio_seconds = len(audio) / samplerate
+
+    transcribe_seconds = [0.0]
+    stt = service.stt
+    nested = threading.local()  # transcribe() may call transcribe_segments(); count the outer call only
+
+    def timed(original):
+        def wrapper(chunk, samplerate=16000, **kwargs):
+            if getattr(nested, "active", False):
+                return original(chunk, samplerate=samplerate, **kwargs)
+            nested.active = True
+            start = time.perf_counter()
+            try:
+                return original(chunk, samplerate=samplerate, **kwargs)
+            finally:
+                nested.active = False
+                transcribe_seconds[0] += time.perf_counter() - start
+        return wrapper
+
+    stt.transcribe = timed(stt.transcribe)
+    stt.transcribe_segments = timed(stt.transcribe_segments)
+    processed = threading.Event()
+    errors = []
+    process = service._process_and_email
+
+    def tracked(*args):
+        try:
+            process(*args)
+        except Exception as e:
+            lines = [line.strip() for line in str(e).splitlines() if line.strip().strip("*")]
+            errors.append(f"{type(e).__name__}: {lines[0] if lines else ''}")
+        finally:
+            processed.set()
+
+    service._process_and_email = tracked  # looked up when stop_recording starts the worker
+    first_transcript = []
+    service.on_transcript_update = lambda text: first_transcript or first_transcript.append(time.perf_counter())
+    known = {m["id"] for m in storage.list_meetings()}
+    _StubOllama.calls.clear()
+
+    started = time.perf_counter()
+    service.start_recording()
+    FakeInputStream.finished.wait()
+    stopped = time.perf_counter()
+    service.stop_recording(max(1, int(audio_seconds)))
+
+    processed.wait(PROCESSING_TIMEOUT_SECONDS)
+    done = time.perf_counter()
+    del stt.transcribe, stt.transcribe_segments
+    del service._process_and_email
+    meeting = next((m for m in storage.list_meetings() if m["id"] not in known), None)
+
+    return {
+        "fixture": name,
+        "audioSeconds": audio_seconds,
+        "rtf": transcribe_seconds[0] / audio_seconds if audio_seconds else 0,
+        "firstTranscript": first_transcript[0] - started if first_transcript else None,
+        "stopToNotes": done - stopped if meeting else None,
+        "pdf": bool(meeting and meeting.get("pdfPath") and os.path.isfile(meeting["pdfPath"])),
+        "llmCalls": dict(_StubOllama.calls),
+        "error": errors[0] if errors else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wavs", nargs="*", help="WAV fixtures (default: tests/fixtures/*.wav)")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed vs. real time")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="stub Ollama seconds per call")
+    parser.add_argument("--fake-stt", type=float, metavar="RTF", help="skip Whisper; fake STT at this real-time factor")
+    parser.add_argument("--synth", type=float, metavar="SECONDS", help="synthetic audio instead of WAV fixtures")
+    args = parser.parse_args()
+
+    wavs = args.wavs
+    if not wavs and not args.synth:
+        fixtures = os.path.join(PROJECT_ROOT, "tests", "fixtures")
+        wavs = sorted(os.path.join(fixtures, f) for f in os.listdir(fixtures) if f.endswith(".wav")) if os.path.isdir(fixtures) else []
+        if not wavs:
+            raise SystemExit("No WAV fixtures: pass paths, add tests/fixtures/*.wav, or use --synth SECONDS")
+
+    # Isolate all state and point the Ollama client at the stub before any project import
+    os.environ["SAFESCRIBE_DATA_DIR"] = tempfile.mkdtemp(prefix="safescribe-bench-")
+    server = start_stub_ollama(args.llm_latency)
+    os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{server.server_address[1]}"
+
+    from recorder import RECORD_SAMPLERATE
+    fixtures = [(f"synthetic {args.synth:.0f}s", synth_audio(args.synth, RECORD_SAMPLERATE))] if args.synth else [
+        (os.path.basename(p), load_wav(p, RECORD_SAMPLERATE)) for p in wavs
+    ]
+    install_fake_sounddevice(max(a.shape[1] for _, a in fixtures))
+
+    import renderer
+    import tracing
+    from api.services import storage
+    from api.services.recorder_service import RecorderService
+
+    traces = []
+    tracing.set_sink(traces.append)
+    service = RecorderService()
+    load_started = time.perf_counter()
+    if args.fake_stt is not None:
+        service.stt = FakeSTT(args.fake_stt)
+    else:
+        service.preload_whisper()
+    print(f"STT: {service.stt.model_name} ({service.stt.model_source}), load {time.perf_counter() - load_started:.2f}s")
+    renderer.start_worker()
+
+    print(f"{'fixture':28} {'audio':>7} {'RTF':>6} {'1st text':>9} {'stop->notes':>12} {'PDF':>4}  LLM calls")
+    for name, audio in fixtures:
+        r = run_one(service, storage, name, audio, RECORD_SAMPLERATE, args.speed)
+        first = f"{r['firstTranscript']:.1f}s" if r["firstTranscript"] is not None else "-"
+        notes = f"{r['stopToNotes']:.1f}s" if r["stopToNotes"] is not None else "no notes"
+        calls = ", ".join(f"{k}={v}" for k, v in sorted(r["llmCalls"].items())) or "none"
+        print(f"{name[:28]:28} {r['audioSeconds']:6.0f}s {r['rtf']:6.2f} {first:>9} {notes:>12} {'yes' if r['pdf'] else 'no':>4}  "
+              f"{sum(r['llmCalls'].values())} ({calls})")
+        if r["error"]:
+            print(f"  processing failed: {r['error']}")
+        if traces:
+            print(f"  stages: {_stage_summary(traces.pop())}")
+    print(f"Peak RSS: {_peak_rss_mb():.0f} MB (API process), {_worker_peak_rss_mb(renderer):.0f} MB (render worker)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
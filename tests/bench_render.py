@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark notes rendering time vs. notes length - run from project root: python tests/bench_render.py"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import renderer
+from summarizer import notes_document
+
+ITEM_COUNTS = [5, 25, 100, 400]
+REPEATS = 3
+
+
+def _notes(n_items: int) -> str:
+    items = "\n".join(f"- Item {i}: follow up with the vendor about the revised delivery schedule." for i in range(n_items))
+    body = (
+        f"**Summary:**\n{'The team reviewed progress and agreed on next steps. ' * 5}\n\n"
+        f"**Action Items:**\n{items}\n\n**Decisions:**\n{items}\n\n**Topics:**\n- Roadmap"
+    )
+    return notes_document(body, "Benchmark Meeting", "2026-01-01 09:00:00")
+
+
+def _best_of(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _legacy_render(markdown_text: str, path: str) -> None:
+    from markdown_pdf import MarkdownPdf, Section
+    pdf = MarkdownPdf()
+    pdf.add_section(Section(markdown_text))
+    pdf.save(path)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "notes.pdf")
+        start = time.perf_counter()
+        renderer.render_pdf(_notes(1), out)
+        print(f"Cold in-process render (imports + fonts): {time.perf_counter() - start:.3f}s")
+        import pymupdf
+        try:
+            import markdown_pdf  # noqa: F401
+            have_legacy = True
+        except ImportError:
+            have_legacy = False
+        start = time.perf_counter()
+        renderer.start_worker()
+        renderer.render_pdf_in_worker(_notes(1), out)
+        print(f"Worker spawn + warm-up + first render:    {time.perf_counter() - start:.3f}s")
+        print()
+        header = f"{'items':>6} {'chars':>7} {'pages':>5} {'in-proc':>9} {'worker':>9} {'html':>8} {'text':>8}"
+        if have_legacy:
+            header += f" {'markdown_pdf':>13}"
+        print(header)
+        for n in ITEM_COUNTS:
+            md = _notes(n)
+            t_proc = _best_of(renderer.render_pdf, md, out)
+            with pymupdf.open(out) as doc:
+                pages = len(doc)
+            t_worker = _best_of(renderer.render_pdf_in_worker, md, out)
+            t_html = _best_of(renderer.render_html_document, md, "Benchmark")
+            t_text = _best_of(renderer.render_text, md)
+            line = f"{n:>6} {len(md):>7} {pages:>5} {t_proc:>8.3f}s {t_worker:>8.3f}s {t_html:>7.4f}s {t_text:>7.4f}s"
+            if have_legacy:
+                line += f" {_best_of(_legacy_render, md, out):>12.3f}s"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""pytest setup: project root on sys.path and an isolated data dir before config is imported."""
+import os
+import sys
+import tempfile
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault("SAFESCRIBE_DATA_DIR", tempfile.mkdtemp(prefix="safescribe-test-"))
+
+# Manual scripts (need a mic, Ollama or an SMTP account); run them directly, see README.md
+collect_ignore = ["test_recorder.py", "test_smtp.py", "test_summarizer.py"]
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """api.services.storage on a fresh database and meetings dir."""
+    from api.services import storage
+
+    monkeypatch.setattr(storage, "DB_PATH", str(tmp_path / "safescribe.db"))
+    monkeypatch.setattr(storage, "MEETINGS_DIR", str(tmp_path))
+    monkeypatch.setattr(storage, "_stats", {})
+    storage._invalidate_settings()
+    return storage
@@ -0,0 +1,61 @@
+import numpy as np
+
+from diarizer import Diarizer
+
+SAMPLERATE = 16000
+# Formants (Hz, bandwidth) of two synthetic voices: an open vowel and a front vowel
+LOW = ((700, 150), (1200, 200), (2600, 300))
+HIGH = ((300, 100), (2300, 250), (3000, 300))
+
+
+def _voice(f0, formants, seconds, rng):
+    """Harmonics of a drifting f0 shaped by formants, with a syllable-rate envelope and noise."""
+    t = np.arange(int(seconds * SAMPLERATE)) / SAMPLERATE
+    f = f0 * (1 + 0.05 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, 6)))
+    phase = 2 * np.pi * np.cumsum(f) / SAMPLERATE
+    signal = np.zeros_like(t)
+    for k in range(1, int(7000 / f0)):
+        amp = sum(np.exp(-(((k * f0) - center) / width) ** 2) for center, width in formants) + 0.02
+        signal += amp * np.sin(k * phase) / np.sqrt(k)
+    signal *= 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t + rng.uniform(0, 6)) ** 2
+    signal += 0.01 * rng.standard_normal(len(t))
+    return signal / np.abs(signal).max()
+
+
+def _chunk(voices):
+    """One chunk of the given (f0, formants, seconds, loudness) turns with short pauses, and its segments."""
+    rng = np.random.default_rng(0)
+    audio, segments = [], []
+    at = 0.0
+    for i, (f0, formants, seconds, loudness) in enumerate(voices):
+        audio.append(loudness * _voice(f0, formants, seconds, rng))
+        segments.append((at, at + seconds, f"turn {i}"))
+        audio.append(np.zeros(int(0.6 * SAMPLERATE)))
+        at += seconds + 0.6
+    return np.concatenate(audio).astype(np.float32), segments
+
+
+def _speakers(lines):
+    return [line.split(":")[0] for line in lines]
+
+
+def test_speaker_changes_are_detected():
+    audio, segments = _chunk([
+        (120, LOW, 3, 0.5), (210, HIGH, 2.5, 0.5), (125, LOW, 2, 0.5), (205, HIGH, 3, 0.5),
+    ])
+
+    lines = Diarizer(budget=1.0).label(audio, SAMPLERATE, segments)
+
+    assert _speakers(lines) == ["Speaker 1", "Speaker 2", "Speaker 1", "Speaker 2"]
+
+
+def test_one_speaker_is_not_split():
+    # Pitch +-15%, loudness 10x and turn length vary as they do over a meeting
+    rng = np.random.default_rng(1)
+    audio, segments = _chunk([
+        (120 * rng.uniform(0.85, 1.15), LOW, rng.uniform(1, 4), rng.uniform(0.05, 0.5)) for _ in range(8)
+    ])
+
+    lines = Diarizer(budget=1.0).label(audio, SAMPLERATE, segments)
+
+    assert _speakers(lines) == ["Speaker 1"] * 8
@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from api.services.gateway import GatedSTT
+from fairqueue import FairGate
+
+
+class _PoolSTT:
+    model_name = "base"
+    model_source = "cache"
+    load_seconds = 0.0
+    workers = 2
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(self.workers)
+        self.release = threading.Event()
+
+    def submit(self, audio, samplerate, **kwargs):
+        return self.executor.submit(lambda: self.release.wait(5) and audio)
+
+
+def test_submit_holds_a_gate_slot_per_chunk():
+    stt = _PoolSTT()
+    gate = FairGate(stt.workers)
+    gated = GatedSTT(stt, gate, "room-a")
+    assert gated.workers == 2
+
+    futures = [gated.submit(n, 16000) for n in (1, 2)]
+    assert gate.busy == 2
+
+    other_room = threading.Thread(target=gate.acquire, args=("room-b",))
+    other_room.start()
+    other_room.join(0.1)
+    assert other_room.is_alive()  # waits for one of room-a's chunks
+
+    stt.release.set()
+    assert [f.result(5) for f in futures] == [1, 2]
+    other_room.join(5)
+    assert not other_room.is_alive()
+    assert gate.busy == 1  # room-b's; room-a's slots were released with their chunks
+    stt.executor.shutdown()
+
+
+def test_batched_rerun_takes_the_gate_per_window(tmp_path, monkeypatch):
+    import audiofile
+    import stt
+
+    monkeypatch.setattr(stt, "BATCH_WINDOW_SECONDS", 1)
+    monkeypatch.setattr(stt, "BATCH_OVERLAP_SECONDS", 0)
+
+    path = str(tmp_path / "meeting.flac")
+    writer = audiofile.FlacWriter(path, 16000)
+    writer.write(np.zeros(16000 * 3, dtype=np.float32))
+    writer.close()
+    gate = FairGate(1)
+    live_turns = []
+
+    def live_chunk():
+        with gate.slot("room-b"):
+            live_turns.append(len(windows))
+
+    windows = []
+
+    def transcribe_window(path, start):
+        assert gate.busy == 1
+        windows.append(start)
+        if len(windows) == 1:
+            live = threading.Thread(target=live_chunk)
+            live.start()
+            live.join(0.1)  # queued behind this window
+        frames = min(16000, 16000 * 3 - start)
+        return [(0.5, 0.9, " Hello.", [(0.5, 0.9, " Hello.")])], 0, frames
+
+    class _BatchedSTT(_PoolSTT):
+        def transcribe_batched(self, path, window_slot=None):
+            return stt.batched_transcript(path, transcribe_window, window_slot)
+
+    result = GatedSTT(_BatchedSTT(), gate, "room-a").transcribe_batched(path)
+
+    assert windows == [0, 16000, 32000, 48000]  # the last read finds the end of the file
+    assert live_turns == [1]  # between the first and second window, not after the re-run
+    assert [segment[0] for segment in result["segments"]] == [0.5]  # repeats across windows dropped
+    assert result["audioSeconds"] == 3
+    assert gate.busy == 0
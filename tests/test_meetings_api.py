@@ -0,0 +1,28 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import meetings
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(meetings.router, prefix="/api")
+    return TestClient(app)
+
+
+def test_retranscribe_after_email_is_a_conflict(storage, tmp_path):
+    audio = tmp_path / "audio.flac"
+    audio.write_bytes(b"fLaC")
+    storage.create_meeting(
+        meeting_id="m1", created_at="2026-01-01T10:00:00", duration=60, title="T", transcript_path="",
+        pdf_path="", audio_path=str(audio), transcript="text", summary="", action_items=[], decisions=[],
+        topics=[], audio_size_mb=1.0,
+    )
+    storage.update_meeting_emailed("m1", True)
+    storage.delete_meeting_files("m1")  # what the outbox does once the notes are delivered
+
+    response = _client().post("/api/meetings/m1/retranscribe")
+
+    assert response.status_code == 409
+    assert "emailed" in response.json()["detail"]
+    assert _client().post("/api/meetings/nope/retranscribe").status_code == 404
@@ -0,0 +1,164 @@
+import pytest
+
+from api.services import email_sender, outbox
+
+
+class _Session:
+    def close(self):
+        pass
+
+
+def _meeting(storage, meeting_id, day, pdf_path=""):
+    storage.create_meeting(
+        meeting_id=meeting_id, created_at=f"2026-01-{day:02d}T10:00:00", duration=60, title=f"T{day}",
+        transcript_path="", pdf_path=pdf_path, transcript="text", summary="", action_items=[], decisions=[], topics=[],
+    )
+
+
+@pytest.fixture
+def mail(storage, monkeypatch):
+    """Configured email whose sends are recorded; set fail_at to the subject that should fail once."""
+    storage.set_setting("email_address", "me@example.com")
+    storage.set_setting("email_password", "app-password")
+    storage.set_setting("email_format", "pdf")
+    sent, fail_at = [], set()
+
+    def send(to, subject, body_text, files, session=None, **kwargs):
+        if subject in fail_at:
+            fail_at.discard(subject)
+            raise ConnectionError("connection dropped")
+        sent.append(subject)
+
+    monkeypatch.setattr(email_sender, "_send_files_email", send)
+    return sent, fail_at
+
+
+def test_split_meeting_email_resumes_at_the_failed_part(storage, mail, tmp_path, monkeypatch):
+    sent, fail_at = mail
+    pdf = tmp_path / "notes.pdf"
+    pdf.write_bytes(b"%PDF")
+    monkeypatch.setattr(email_sender, "_pdf_attachments", lambda path, out_dir: [str(pdf)] * 3)
+    _meeting(storage, "m1", 1, pdf_path=str(pdf))
+    outbox.enqueue_meeting("m1", "you@example.com")
+    fail_at.add("SafeScribe: T1 (part 2 of 3)")
+
+    outbox.drain(_Session())
+
+    assert sent == ["SafeScribe: T1 (part 1 of 3)"]
+    assert storage.list_outbox()[0]["partsSent"] == 1
+
+    storage.retry_emails_now()
+    outbox.drain(_Session())
+
+    assert sent == [f"SafeScribe: T1 (part {n} of 3)" for n in (1, 2, 3)]
+    assert storage.list_outbox() == []
+    assert storage.get_meeting("m1")["emailed"]
+
+
+def test_split_digest_resumes_at_the_failed_part(storage, mail, tmp_path, monkeypatch):
+    sent, fail_at = mail
+    monkeypatch.setattr(email_sender, "EMAIL_MAX_ATTACHMENT_MB", 1 / 1024)  # 1 KB: one PDF per message
+    storage.set_setting("email_digest_minutes", "60")
+    for day in (1, 2, 3):
+        pdf = tmp_path / f"m{day}.pdf"
+        pdf.write_bytes(b"x" * 800)
+        _meeting(storage, f"m{day}", day, pdf_path=str(pdf))
+        outbox.enqueue_meeting(f"m{day}", "you@example.com")
+    storage.release_emails("digest")  # due now
+    fail_at.add("SafeScribe: 3 meeting notes (part 3 of 3)")
+
+    outbox.drain(_Session())
+
+    assert len(sent) == 2
+    assert {job["partsSent"] for job in storage.list_outbox()} == {2}
+
+    storage.retry_emails_now()
+    outbox.drain(_Session())
+
+    assert sent == [f"SafeScribe: 3 meeting notes (part {n} of 3)" for n in (1, 2, 3)]
+    assert storage.list_outbox() == []
+
+
+def test_backoff_doubles_up_to_the_cap():
+    delays = [outbox._backoff_seconds(attempts) for attempts in range(1, 10)]
+
+    assert delays[:3] == [outbox.OUTBOX_RETRY_BASE_SECONDS * n for n in (1, 2, 4)]
+    assert delays[-1] == outbox.OUTBOX_RETRY_MAX_SECONDS
+    assert delays == sorted(delays)
+
+
+def test_transient_failure_backs_off_and_stops_the_drain(storage, mail, monkeypatch):
+    sent, fail_at = mail
+    monkeypatch.setattr(outbox.time, "time", lambda: 1000.0)
+    for day in (1, 2):
+        _meeting(storage, f"m{day}", day)
+        outbox.enqueue_meeting(f"m{day}", "you@example.com")
+    fail_at.add("SafeScribe: T1")
+
+    assert outbox.drain(_Session()) == 0
+
+    assert sent == []  # m2 waits: the connection is likely down for it too
+    jobs = {job["meetingId"]: job for job in storage.list_outbox()}
+    first, second = jobs["m1"], jobs["m2"]
+    assert (first["attempts"], first["nextAttemptAt"]) == (1, 1000.0 + outbox.OUTBOX_RETRY_BASE_SECONDS)
+    assert first["lastError"] == "connection dropped"
+    assert second["attempts"] == 0
+
+    monkeypatch.setattr(outbox.time, "time", lambda: 1000.0 + outbox.OUTBOX_RETRY_BASE_SECONDS)
+    assert outbox.drain(_Session()) == 2
+    assert sent == ["SafeScribe: T1", "SafeScribe: T2"]
+
+
+def test_permanent_failure_stops_retrying_that_message_only(storage, mail):
+    sent, _ = mail
+    _meeting(storage, "m2", 2)
+    outbox.enqueue_meeting("gone", "you@example.com")  # no such meeting
+    outbox.enqueue_meeting("m2", "you@example.com")
+
+    assert outbox.drain(_Session()) == 1
+
+    assert sent == ["SafeScribe: T2"]
+    [failed] = storage.list_outbox()
+    assert (failed["status"], failed["lastError"]) == ("failed", "Meeting was deleted")
+
+
+def test_digest_meetings_share_the_first_ones_due_time(storage, monkeypatch):
+    monkeypatch.setattr(outbox.time, "time", lambda: 1000.0)
+    outbox.set_digest_minutes(30)
+    outbox.enqueue_meeting("m1", "you@example.com")
+    monkeypatch.setattr(outbox.time, "time", lambda: 1600.0)
+    outbox.enqueue_meeting("m2", "you@example.com")
+    outbox.enqueue_meeting("m3", "other@example.com")
+
+    due = {job["meetingId"]: job["nextAttemptAt"] for job in storage.list_outbox()}
+
+    assert due == {"m1": 1000.0 + 30 * 60, "m2": 1000.0 + 30 * 60, "m3": 1600.0 + 30 * 60}
+
+
+def test_group_batches_digests_per_recipient():
+    jobs = [
+        {"id": 1, "kind": "digest", "recipient": "a", "partsSent": 0},
+        {"id": 2, "kind": "meeting", "recipient": "a", "partsSent": 0},
+        {"id": 3, "kind": "digest", "recipient": "b", "partsSent": 0},
+        {"id": 4, "kind": "digest", "recipient": "a", "partsSent": 0},
+        {"id": 5, "kind": "meeting", "recipient": "a", "partsSent": 0},
+    ]
+
+    assert [[job["id"] for job in group] for group in outbox._group(jobs)] == [[1, 4], [2], [3], [5]]
+
+
+def test_digest_sends_one_email_for_all_queued_meetings(storage, mail):
+    sent, _ = mail
+    outbox.set_digest_minutes(30)
+    for day in (1, 2, 3):
+        _meeting(storage, f"m{day}", day)
+        outbox.enqueue_meeting(f"m{day}", "you@example.com")
+    storage.delete_meeting("m2")
+
+    assert outbox.drain(_Session()) == 0  # not due yet
+    outbox.set_digest_minutes(0)  # turning digests off sends what was queued
+    assert outbox.drain(_Session()) == 1
+
+    assert sent == ["SafeScribe: 2 meeting notes"]
+    assert storage.list_outbox() == []
+    assert all(storage.get_meeting(m)["emailed"] for m in ("m1", "m3"))
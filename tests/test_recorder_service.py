@@ -0,0 +1,166 @@
+import threading
+import time
+import types
+
+import numpy as np
+
+from api.services import recorder_service
+from api.services.recorder_service import RecorderService, RecordingSession
+
+SAMPLERATE = 16000
+
+
+class _SlowReadRecorder:
+    """Recorder whose first chunk read blocks until released, like a live loop stopped mid-read."""
+
+    samplerate = SAMPLERATE
+
+    def __init__(self):
+        self.state = types.SimpleNamespace(name="RECORDING")
+        self.read_frame = 0
+        self.reading = threading.Event()
+        self.release = threading.Event()
+
+    def pop_chunk(self, seconds):
+        if self.read_frame:
+            return None
+        self.reading.set()
+        self.release.wait(5)
+        frames = int(seconds * self.samplerate)
+        self.read_frame += frames
+        return np.zeros(frames, dtype=np.float32)
+
+    def last_chunk_times(self):
+        return 0.0, self.read_frame / self.samplerate
+
+    def backlog_seconds(self):
+        return 0.0
+
+    def stop(self):
+        self.state = types.SimpleNamespace(name="IDLE")
+
+
+class _SilentSTT:
+    def transcribe_segments(self, audio, samplerate=SAMPLERATE, beam_size=5, word_timestamps=False):
+        return []
+
+
+def _wait(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_stop_during_chunk_read_starts_tail_after_it(storage, monkeypatch, tmp_path):
+    monkeypatch.setattr(recorder_service, "TRANSCRIBE_CHUNK_SECONDS", 1)
+    service = RecorderService()
+    service.stt = _SilentSTT()
+    recorder = _SlowReadRecorder()
+    session = RecordingSession(recorder)
+    session.audio_path = str(tmp_path / "recording.flac")
+    service.sessions[session.id] = session
+    tail_starts = []
+
+    def transcribe_file(s):
+        tail_starts.append(s.start_frame)
+        return iter(())
+
+    monkeypatch.setattr(service, "_transcribe_file", transcribe_file)
+    session.running.set()
+    session.transcribe_thread = threading.Thread(target=service._transcribe_loop, args=(session,), daemon=True)
+    session.transcribe_thread.start()
+    assert recorder.reading.wait(5)
+
+    service.stop_recording(60, session.id)
+    recorder.release.set()
+    _wait(lambda: session.status == "done")
+
+    assert tail_starts == [SAMPLERATE]  # after the chunk the live loop read, not before it
+
+
+class _RecordingSTT:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe_segments(self, audio, samplerate=SAMPLERATE, beam_size=5, word_timestamps=False):
+        self.calls.append((beam_size, word_timestamps))
+        return []
+
+
+def test_tail_runs_undegraded_after_a_degraded_live_loop(storage, monkeypatch, tmp_path):
+    from stt import DEFAULT_BEAM_SIZE
+
+    monkeypatch.setattr(recorder_service, "WORD_TIMESTAMPS", True)
+    monkeypatch.setattr(
+        recorder_service.audiofile, "iter_chunks",
+        lambda path, seconds, start: iter([(np.zeros(SAMPLERATE, dtype=np.float32), SAMPLERATE)]),
+    )
+    service = RecorderService()
+    service.stt, service.fallback_stt = _RecordingSTT(), _RecordingSTT()
+    session = RecordingSession(_SlowReadRecorder())
+    session.audio_path = str(tmp_path / "recording.flac")
+    session.degrade_level = 2  # fell back to the small model while recording
+
+    service._process(session, "job-1")
+
+    assert service.fallback_stt.calls == []
+    assert service.stt.calls == [(DEFAULT_BEAM_SIZE, True)]
+
+
+class _ChunksRecorder(_SlowReadRecorder):
+    """Recorder handing out a fixed number of chunks without blocking."""
+
+    def __init__(self, chunks):
+        super().__init__()
+        self.chunks = chunks
+
+    def pop_chunk(self, seconds):
+        if not self.chunks:
+            return None
+        self.chunks -= 1
+        frames = int(seconds * self.samplerate)
+        self.read_frame += frames
+        return np.zeros(frames, dtype=np.float32)
+
+
+class _NumberingSTT:
+    def __init__(self):
+        self.chunks = 0
+
+    def transcribe_segments(self, audio, samplerate=SAMPLERATE, beam_size=5, word_timestamps=False):
+        self.chunks += 1
+        return [(0.0, 1.0, f"chunk {self.chunks}")]
+
+
+class _BlockedDiarizer:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def label(self, audio, samplerate, segments):
+        self.release.wait(5)
+        return [f"Speaker 1: {segments[0][2]}"]
+
+
+def test_live_transcription_does_not_wait_for_speaker_labels(monkeypatch):
+    monkeypatch.setattr(recorder_service, "TRANSCRIBE_CHUNK_SECONDS", 1)
+    monkeypatch.setattr(recorder_service, "TRANSCRIBE_LOOP_SLEEP_SECONDS", 0.01)
+    monkeypatch.setattr(recorder_service.storage, "append_live_segment", lambda *args: None)
+    service = RecorderService()
+    service.stt = _NumberingSTT()
+    diarizer = _BlockedDiarizer()
+    session = RecordingSession(_ChunksRecorder(3), diarizer=diarizer)
+    session.labeller = recorder_service.ThreadPoolExecutor(max_workers=1)
+    session.running.set()
+    session.transcribe_thread = threading.Thread(target=service._transcribe_loop, args=(session,), daemon=True)
+    session.transcribe_thread.start()
+
+    _wait(lambda: session.recorder.chunks == 0)  # all three transcribed while the first is being labelled
+    assert session.transcript_buffer == []
+
+    diarizer.release.set()
+    session.running.clear()
+    session.transcribe_thread.join()
+    session.labeller.shutdown(wait=True)
+
+    assert session.transcript_buffer == [f"Speaker 1: chunk {n}" for n in (1, 2, 3)]
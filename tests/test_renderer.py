@@ -0,0 +1,44 @@
+import multiprocessing
+
+import pytest
+
+import renderer
+
+
+@pytest.fixture(autouse=True)
+def fresh_worker():
+    yield
+    renderer.stop_worker()
+
+
+def test_timeout_kills_the_worker(monkeypatch, tmp_path):
+    monkeypatch.setattr(renderer, "RENDER_TIMEOUT_SECONDS", 0.01)  # still warming up
+    with pytest.raises(TimeoutError):
+        renderer.render_pdf_in_worker("# Notes", str(tmp_path / "notes.pdf"))
+    assert multiprocessing.active_children() == []
+    assert not (tmp_path / "notes.pdf").exists()  # not rendered in-process either
+
+    monkeypatch.setattr(renderer, "RENDER_TIMEOUT_SECONDS", 60)
+    renderer.render_pdf_in_worker("# Notes", str(tmp_path / "notes.pdf"))
+    assert (tmp_path / "notes.pdf").read_bytes().startswith(b"%PDF")
+
+
+def test_renders_in_process_when_no_worker_starts(monkeypatch, tmp_path):
+    def no_worker():
+        raise OSError("cannot spawn")
+
+    monkeypatch.setattr(renderer, "_Worker", no_worker)
+    renderer.render_pdf_in_worker("# Notes", str(tmp_path / "notes.pdf"))
+    assert (tmp_path / "notes.pdf").read_bytes().startswith(b"%PDF")
+
+
+def test_dead_worker_is_replaced(tmp_path):
+    renderer.start_worker()
+    pid = renderer.worker_pid()
+    renderer._worker.process.kill()
+    renderer._worker.process.join()
+
+    renderer.render_pdf_in_worker("# Notes", str(tmp_path / "notes.pdf"))
+
+    assert (tmp_path / "notes.pdf").read_bytes().startswith(b"%PDF")
+    assert renderer.worker_pid() not in (None, pid)
@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from api.services import retention
+
+
+def _meeting(storage, meeting_id, day, pdf_path="", **kwargs):
+    storage.create_meeting(
+        meeting_id=meeting_id, created_at=f"2026-01-{day:02d}T10:00:00", duration=60, title="T",
+        transcript_path="", pdf_path=pdf_path, transcript="text", summary="", action_items=[], decisions=[], topics=[],
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def meetings(storage):
+    for day in (1, 2, 3):
+        _meeting(storage, f"m{day}", day, audio_size_mb=10.0)
+    return storage
+
+
+def test_quota_evicts_only_the_measured_excess(meetings):
+    storage = meetings
+    storage.compact_db()
+    db_mb = storage.refresh_storage_stats()["dbMB"]
+
+    assert retention._evict_to_quota(db_mb + 15) == 2  # 30 MB of meetings, 15 over: two oldest
+
+    assert [m["id"] for m in storage.list_meetings()] == ["m3"]
+
+
+def test_quota_not_over(meetings):
+    assert retention._evict_to_quota(10_000) == 0
+    assert len(meetings.list_meetings()) == 3
+
+
+def test_quota_keeps_meetings_when_other_data_fills_it(meetings):
+    storage = meetings
+    # A quota below what the database alone takes: evicting every meeting can't meet it
+    assert retention._evict_to_quota(0.001) == 0
+    assert len(storage.list_meetings()) == 3
+
+
+def test_sweep_compacts_only_after_deleting_and_at_most_daily(meetings, monkeypatch):
+    storage = meetings
+    compactions = []
+    monkeypatch.setattr(storage, "compact_db", lambda: compactions.append(1))
+    monkeypatch.setattr(retention, "COMPACT_MIN_FREE_MB", 0)
+    monkeypatch.setattr(retention, "_last_compact", 0.0)
+
+    retention.set_policy(None, 10_000, False)
+    assert retention.sweep()["evicted"] == 0
+    assert compactions == []  # under quota: the database isn't rewritten
+
+    retention.set_policy(1, None, False)
+    assert retention.sweep()["expired"] == 3
+    assert compactions == [1]
+
+    _meeting(storage, "m4", 4)
+    assert retention.sweep()["expired"] == 1
+    assert compactions == [1]  # already compacted today
+
+
+def test_strip_zeroes_sizes_of_files_already_gone(storage, tmp_path):
+    pdf = tmp_path / "summary.pdf"
+    pdf.write_bytes(b"%PDF")
+    _meeting(storage, "m1", 1, pdf_path=str(pdf), pdf_size_mb=1.0,
+             audio_path=str(tmp_path / "deleted-elsewhere.flac"), audio_size_mb=5.0)
+    storage.update_meeting_emailed("m1", True)
+
+    assert storage.strip_emailed_meetings() == 1
+
+    meeting = storage.get_meeting("m1")
+    assert (meeting["pdfSize"], meeting["audioSize"]) == (0, 0)
+    assert not pdf.exists()
+    assert storage.strip_emailed_meetings() == 0  # not selected again
+    conn = sqlite3.connect(storage.DB_PATH)
+    try:
+        assert conn.execute("SELECT transcript_z FROM meetings").fetchone()[0] is None
+    finally:
+        conn.close()
+
+
+
+def test_deleting_meetings_cancels_their_pending_emails(meetings):
+    storage = meetings
+    for meeting_id in ("m1", "m2", "m3"):
+        storage.enqueue_email("meeting", "a@example.com", meeting_id=meeting_id)
+
+    storage.delete_meetings(["m1", "m2"])
+    assert [job["meetingId"] for job in storage.list_outbox()] == ["m3"]
+
+    storage.delete_meeting("m3")
+    assert storage.list_outbox() == []
@@ -0,0 +1,164 @@
+import sqlite3
+import zlib
+
+
+def _meeting(storage, meeting_id, **kwargs):
+    args = dict(
+        meeting_id=meeting_id, created_at=f"2026-01-0{meeting_id[-1]}T10:00:00", duration=60, title="Title",
+        transcript_path="", pdf_path="", transcript="We agreed to ship.", summary="Summary",
+        action_items=["Send plan"], decisions=["Ship in March"], topics=["Launch"],
+    )
+    args.update(kwargs)
+    return storage.create_meeting(**args)
+
+
+def _legacy_db(storage, rows):
+    """A database as left by an old release: list fields as JSON, plain transcripts, user_version 0."""
+    storage._init_db()
+    conn = sqlite3.connect(storage.DB_PATH)
+    with conn:
+        for meeting_id, transcript, action_items in rows:
+            conn.execute(
+                "INSERT INTO meetings (id, created_at, duration, title, transcript_path, pdf_path, transcript, "
+                "summary, action_items, decisions, topics) VALUES (?, '2026-01-01', 60, 'T', '', '', ?, 'S', ?, "
+                "'[\"Ship\"]', '[]')",
+                (meeting_id, transcript, action_items),
+            )
+        conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+
+def test_migrations_move_items_to_child_tables(storage):
+    _legacy_db(storage, [("m1", "Plain transcript", '["A", "B"]'), ("m2", "", "not json")])
+
+    meeting = storage.get_meeting("m1")  # _init_db runs the migrations
+
+    assert meeting["actionItems"] == ["A", "B"]
+    assert meeting["decisions"] == ["Ship"]
+    assert storage.get_meeting("m2")["actionItems"] == []
+    conn = sqlite3.connect(storage.DB_PATH)
+    try:
+        assert conn.execute("SELECT action_items FROM meetings WHERE id = 'm1'").fetchone()[0] == "[]"
+    finally:
+        conn.close()
+
+
+def test_migrations_run_once(storage):
+    _legacy_db(storage, [("m1", "Plain transcript", '["A"]')])
+    storage._init_db()
+    storage._init_db()
+    assert storage.get_meeting("m1")["actionItems"] == ["A"]
+
+
+def test_delete_meetings_cascades_items_and_files(storage, tmp_path):
+    pdf = tmp_path / "summary_m1.pdf"
+    pdf.write_bytes(b"%PDF")
+    _meeting(storage, "m1", pdf_path=str(pdf))
+    _meeting(storage, "m2")
+    _meeting(storage, "m3")
+
+    assert storage.delete_meetings(["m1", "m2", "missing"]) == 2
+
+    assert not pdf.exists()
+    assert storage.get_meeting("m1") is None and storage.get_meeting("m2") is None
+    assert [m["id"] for m in storage.list_meetings()] == ["m3"]
+    conn = sqlite3.connect(storage.DB_PATH)
+    try:
+        for table in storage._ITEM_TABLES.values():
+            ids = {r[0] for r in conn.execute(f"SELECT meeting_id FROM {table}")}
+            assert ids == {"m3"}, table
+    finally:
+        conn.close()
+    assert [item["meetingId"] for item in storage.list_open_action_items()] == ["m3"]
+
+
+def test_migration_compresses_plain_transcripts(storage):
+    _legacy_db(storage, [("m1", "Plain transcript", "[]"), ("m2", "", "[]")])
+
+    assert storage.get_meeting("m1", include_transcript=True)["transcript"] == "Plain transcript"
+    assert storage.get_meeting("m2", include_transcript=True)["transcript"] == ""
+    conn = sqlite3.connect(storage.DB_PATH)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == storage._SCHEMA_VERSION_TRANSCRIPT_Z
+        transcript, transcript_z = conn.execute(
+            "SELECT transcript, transcript_z FROM meetings WHERE id = 'm1'"
+        ).fetchone()
+    finally:
+        conn.close()
+    assert transcript == ""
+    assert zlib.decompress(transcript_z).decode("utf-8") == "Plain transcript"
+
+
+def test_transcript_round_trip(storage):
+    text = "Ünïcode transcript\nsecond line " * 100
+    _meeting(storage, "m1", transcript=text)
+    assert storage.get_meeting("m1", include_transcript=True)["transcript"] == text
+    assert "transcript" not in storage.get_meeting("m1")
+
+
+def test_recording_kept_and_deleted_with_meeting(storage, tmp_path):
+    audio = tmp_path / "audio_m1.flac"
+    audio.write_bytes(b"x" * 1024)
+    _meeting(storage, "m1", audio_path=str(audio), audio_size_mb=1024 / (1024 * 1024))
+
+    meeting = storage.get_meeting("m1")
+    assert (meeting["audioPath"], meeting["audioSize"]) == (str(audio), 1024 / (1024 * 1024))
+
+    assert storage.delete_meetings(["m1"]) == 1
+    assert not audio.exists()
+
+
+def test_timeline_round_trip(storage):
+    timeline = [
+        (0.0, 2.5, " We agreed to ship.", [(0.0, 0.4, " We"), (0.4, 1.0, " agreed"), (1.0, 1.2, " to"),
+                                           (1.2, 2.5, " ship.")]),
+        (2.5, 4.0, " Next topic.", []),
+        (30.25, 31.5, " Late remark.", [(30.25, 31.5, " Late")]),
+    ]
+    _meeting(storage, "m1", timeline=timeline)
+
+    segments = storage.get_meeting_timeline("m1")
+
+    assert [(s["start"], s["end"], s["text"]) for s in segments] == [
+        (0.0, 2.5, "We agreed to ship."), (2.5, 4.0, "Next topic."), (30.25, 31.5, "Late remark."),
+    ]
+    assert [w["word"] for w in segments[0]["words"]] == ["We", "agreed", "to", "ship."]
+    assert segments[0]["words"][1] == {"start": 0.4, "end": 1.0, "word": "agreed"}
+    assert segments[1]["words"] == []
+    assert [s["text"] for s in storage.get_meeting_timeline("m1", 2.0, 3.0)] == ["We agreed to ship.", "Next topic."]
+    assert [s["text"] for s in storage.get_meeting_timeline("m1", 4.0, 30.0)] == []
+
+
+def test_timeline_absent(storage):
+    _meeting(storage, "m1")
+    assert storage.get_meeting_timeline("m1") is None
+    assert storage.get_meeting_timeline("missing") is None
+
+
+def test_settings_are_read_once_until_written(storage, monkeypatch):
+    storage.set_setting("email_format", "pdf")
+    assert storage.get_setting("email_format") == "pdf"
+    connects = []
+    connect = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        connects.append(args)
+        return connect(*args, **kwargs)
+
+    monkeypatch.setattr(storage.sqlite3, "connect", counting_connect)
+
+    assert storage.get_setting("email_format") == "pdf"
+    assert storage.get_setting("missing") is None
+    assert connects == []  # served from the cache
+
+    storage.set_setting("email_format", "inline")
+    assert storage.get_setting("email_format") == "inline"
+
+
+def test_factory_reset_drops_cached_settings(storage):
+    storage.set_setting("email_address", "me@example.com")
+    assert storage.get_setting("email_address") == "me@example.com"
+
+    storage.factory_reset()
+
+    assert storage.get_setting("email_address") is None
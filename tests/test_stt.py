@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import audiofile
+import stt
+
+SAMPLERATE = 16000
+# What was said: (start, end, text) in seconds from the start of the recording. Windows of 3 s
+# overlapping by 1 s: "c" and "e" lie inside an overlap, "d", "f" and "g" cross a window's end.
+SPEECH = [
+    (0.2, 1.4, "a"), (1.6, 2.0, "b"), (2.1, 2.6, "c"), (2.7, 3.9, "d"), (4.1, 4.6, "e"), (4.7, 5.6, "f"),
+    (6.1, 7.5, "g"), (7.6, 8.8, "h"),
+]
+
+
+@pytest.fixture
+def recording(tmp_path, monkeypatch):
+    monkeypatch.setattr(stt, "BATCH_WINDOW_SECONDS", 3)
+    monkeypatch.setattr(stt, "BATCH_OVERLAP_SECONDS", 1)
+    monkeypatch.setattr(stt, "BATCH_EDGE_SECONDS", 0.2)
+    monkeypatch.setattr(stt, "TRANSCRIPT_FILTER", False)
+    path = str(tmp_path / "meeting.flac")
+    writer = audiofile.FlacWriter(path, SAMPLERATE)
+    writer.write(np.zeros(SAMPLERATE * 9, dtype=np.float32))
+    writer.close()
+    return path
+
+
+def _transcribe_window(path, start):
+    """SPEECH as Whisper sees it through one window: cut at both of the window's edges."""
+    frames = min(stt.BATCH_WINDOW_SECONDS * SAMPLERATE, 9 * SAMPLERATE - start)
+    begin, end = start / SAMPLERATE, (start + frames) / SAMPLERATE
+    segments = []
+    for s, e, text in SPEECH:
+        if s < end and e > begin:
+            cut = s < begin or e > end
+            s, e = max(s, begin) - begin, min(e, end) - begin
+            segments.append((s, e, text + ("~" if cut else ""), [(s, e, text)]))
+    return segments, 0, frames
+
+
+def test_overlapping_windows_keep_each_segment_once_and_whole(recording):
+    result = stt.batched_transcript(recording, _transcribe_window)
+
+    assert [(round(s, 1), round(e, 1), text) for s, e, text, _ in result["segments"]] == SPEECH
+    assert result["audioSeconds"] == 9
+
+
+def test_windows_step_by_their_length_less_the_overlap(recording):
+    starts = []
+
+    def transcribe_window(path, start):
+        starts.append(start)
+        return _transcribe_window(path, start)
+
+    stt.batched_transcript(recording, transcribe_window)
+
+    assert starts == [n * SAMPLERATE for n in (0, 2, 4, 6, 8)]
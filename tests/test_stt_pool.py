@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+import stt_pool
+import tracing
+from stt_pool import SttPool
+
+SAMPLERATE = 16000
+
+
+class _FakeSTT:
+    """Stands in for a worker's WhisperSTT: echoes what it was given, drops one segment."""
+
+    def transcribe_segments(self, audio, samplerate, beam_size, word_timestamps=False):
+        with tracing.span("stt.transcribe", dropped=1):
+            if not len(audio):
+                raise ValueError("no audio")
+            return [(0.0, len(audio) / samplerate, f"{audio.dtype} {audio[0]:.2f} beam={beam_size}")]
+
+    def transcribe(self, audio, samplerate, beam_size):
+        return self.transcribe_segments(audio, samplerate, beam_size)[0][2]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """An SttPool whose "workers" are threads of this process running _FakeSTT, so the shared
+    memory round trip runs as in a worker but without loading a model. Returns (pool, block names)."""
+    def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        return [{"source": "test"}]
+
+    monkeypatch.setattr(SttPool, "_start", start)
+    monkeypatch.setattr(stt_pool, "_stt", _FakeSTT())
+    names = []
+    transcribe_shared = stt_pool._transcribe_shared
+
+    def recording_names(name, *args):
+        names.append(name)
+        return transcribe_shared(name, *args)
+
+    monkeypatch.setattr(stt_pool, "_transcribe_shared", recording_names)
+    pool = SttPool(2, model_name="test")
+    yield pool, names
+    pool.close()
+
+
+def _freed(name, timeout=2.0):
+    """Whether the block is unlinked (by the Future's done callback, which may run just after result())."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            shared_memory.SharedMemory(name=name).close()
+        except FileNotFoundError:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_int16_audio_arrives_as_float32_and_the_block_is_freed(pool):
+    pool, names = pool
+    audio = np.full(SAMPLERATE, 16384, dtype=np.int16)
+
+    segments = pool.transcribe_segments(audio, SAMPLERATE, beam_size=1)
+
+    assert segments == [(0.0, 1.0, "float32 0.50 beam=1")]
+    assert len(names) == 1 and _freed(names[0])
+
+
+def test_dropped_segments_are_reported_on_the_callers_span(pool):
+    pool, _ = pool
+
+    with tracing.job("job-1") as trace:
+        assert pool.transcribe(np.zeros(SAMPLERATE, dtype=np.float32), SAMPLERATE) == "float32 0.00 beam=5"
+
+    [span] = [sp for sp in trace.spans if sp["name"] == "stt.transcribe"]
+    assert span["attrs"]["dropped"] == 1
+    assert span["attrs"]["worker"] is True
+
+
+def test_submitted_chunks_resolve_in_order_and_free_their_blocks(pool):
+    pool, names = pool
+    chunks = [np.full(SAMPLERATE, n / 10, dtype=np.float32) for n in range(4)]
+
+    futures = [pool.submit(chunk, SAMPLERATE, segments=True) for chunk in chunks]
+
+    assert [f.result()[0][2] for f in futures] == [f"float32 {n / 10:.2f} beam=5" for n in range(4)]
+    assert len(set(names)) == 4 and all(_freed(name) for name in names)
+
+
+def test_a_worker_error_reaches_the_caller_and_the_block_is_still_freed(pool):
+    pool, names = pool
+
+    with pytest.raises(ValueError, match="no audio"):
+        pool.transcribe_segments(np.zeros(0, dtype=np.float32), SAMPLERATE)
+
+    assert _freed(names[0])
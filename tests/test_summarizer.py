@@ -13,14 +13,14 @@ def main():
     transcript = TRANSCRIPT_PATH.read_text(encoding="utf-8")
 
     start = time.perf_counter()
-    meeting_title = save_summary_as_pdf(
+    result = save_summary_as_pdf(
         transcript,
         OUTPUT_PDF.name,
     )
     elapsed = time.perf_counter() - start
 
     print(f"Summary PDF saved to: {OUTPUT_PDF.resolve()}")
-    print(f"Detected meeting title: {meeting_title}")
+    print(f"Detected meeting title: {result['title']}")
     print(f"Total seconds: {elapsed:.1f}")
 
 
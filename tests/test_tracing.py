@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import tracing
+from api.routes import jobs
+
+
+@pytest.fixture
+def traces(monkeypatch):
+    """Finished jobs' traces, with fresh histograms."""
+    monkeypatch.setattr(tracing, "_metrics", {})
+    finished = []
+    monkeypatch.setattr(tracing, "_sink", finished.append)
+    return finished
+
+
+def test_job_spans_nest_and_reach_the_sink_when_the_job_ends(traces):
+    with tracing.job("job-1"):
+        with tracing.span("job.total"):
+            with tracing.span("stt.tail", audioSeconds=30) as attrs:
+                attrs["dropped"] = 2
+            tracing.current().meeting_id = "m1"
+        assert traces == []
+
+    [trace] = traces
+    assert (trace.job_id, trace.meeting_id) == ("job-1", "m1")
+    assert [sp["name"] for sp in trace.spans] == ["stt.tail", "job.total"]  # in end order
+    assert trace.spans[0]["attrs"] == {"audioSeconds": 30, "dropped": 2}
+    assert trace.spans[1]["durationMs"] >= trace.spans[0]["durationMs"]
+
+
+def test_spans_outside_a_job_are_only_counted(traces):
+    with tracing.span("email.send"):
+        pass
+
+    assert traces == []
+    assert 'safescribe_span_seconds_count{span="email.send"} 1' in tracing.prometheus_text()
+
+
+def test_bound_functions_run_in_the_submitting_job(traces):
+    def stage():
+        with tracing.span("llm.chunk"):
+            return threading.current_thread().name
+
+    with tracing.job("job-1"), ThreadPoolExecutor(max_workers=1) as pool:
+        unbound = pool.submit(stage).result()
+        bound = pool.submit(tracing.bind(stage)).result()
+
+    assert unbound == bound  # same pool thread, only the bound call was in the job
+    assert [sp["name"] for sp in traces[0].spans] == ["llm.chunk"]
+
+
+def test_a_failing_sink_does_not_fail_the_job(monkeypatch):
+    def sink(trace):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(tracing, "_sink", sink)
+
+    with tracing.job("job-1"), tracing.span("summarize"):
+        pass
+
+
+def test_prometheus_histogram_buckets_are_cumulative(traces):
+    for seconds in (0.03, 0.2, 0.2, 700):
+        tracing._observe("summarize", seconds)
+
+    lines = tracing.prometheus_text().splitlines()
+
+    assert lines[:2] == [
+        "# HELP safescribe_span_seconds Duration of pipeline stages.",
+        "# TYPE safescribe_span_seconds histogram",
+    ]
+    assert 'safescribe_span_seconds_bucket{span="summarize",le="0.01"} 0' in lines
+    assert 'safescribe_span_seconds_bucket{span="summarize",le="0.05"} 1' in lines
+    assert 'safescribe_span_seconds_bucket{span="summarize",le="0.25"} 3' in lines
+    assert 'safescribe_span_seconds_bucket{span="summarize",le="600"} 3' in lines
+    assert 'safescribe_span_seconds_bucket{span="summarize",le="+Inf"} 4' in lines
+    assert 'safescribe_span_seconds_sum{span="summarize"} 700.430000' in lines
+    assert 'safescribe_span_seconds_count{span="summarize"} 4' in lines
+
+
+def test_stored_spans_are_served_per_job_and_meeting(storage, monkeypatch):
+    monkeypatch.setattr(
+        tracing, "_sink", lambda trace: storage.save_job_spans(trace.job_id, trace.meeting_id, trace.spans)
+    )
+    with tracing.job("job-1", meeting_id="m1"):
+        with tracing.span("job.total"):
+            for _ in range(2):
+                with tracing.span("llm.chunk"):
+                    pass
+    app = FastAPI()
+    app.include_router(jobs.router, prefix="/api")
+    client = TestClient(app)
+
+    timings = client.get("/api/jobs/job-1/timings").json()
+
+    assert timings["meetingId"] == "m1"
+    assert timings["stages"]["llm.chunk"]["count"] == 2
+    assert timings["totalMs"] == pytest.approx(timings["stages"]["job.total"]["totalMs"], abs=0.05)
+    assert client.get("/api/jobs/m1/timings").json()["jobId"] == "job-1"
+    assert client.get("/api/jobs/job-2/timings").status_code == 404
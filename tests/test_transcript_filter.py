@@ -0,0 +1,48 @@
+from transcript_filter import RepetitionFilter, clean_segment
+
+SPEECH = dict(no_speech_prob=0.05, avg_logprob=-0.3)
+
+
+def test_speech_is_kept():
+    text = " We agreed to ship the release on Friday."
+    assert clean_segment(text, None, **SPEECH) == (text, None)
+
+
+def test_silence_by_whisper_confidence():
+    assert clean_segment(" Okay.", None, no_speech_prob=0.7, avg_logprob=-1.5) is None
+    assert clean_segment(" Okay.", None, no_speech_prob=0.7, avg_logprob=-0.5) == (" Okay.", None)
+    assert clean_segment(" Okay.", None, no_speech_prob=0.5, avg_logprob=-1.5) == (" Okay.", None)
+
+
+def test_boilerplate_dropped_only_when_unsure_of_speech():
+    assert clean_segment(" Thanks for watching!", None, no_speech_prob=0.4, avg_logprob=-0.5) is None
+    assert clean_segment(" Thank you.", None, **SPEECH) == (" Thank you.", None)
+
+
+def test_repeated_boilerplate_dropped_after_collapsing():
+    text = " Thank you. Thank you. Thank you. Thank you."
+    assert clean_segment(text, None, no_speech_prob=0.45, avg_logprob=-0.5) is None
+    words = [(i * 0.5, i * 0.5 + 0.5, w) for i, w in enumerate([" Thank", " you."] * 4)]
+    assert clean_segment(text, words, no_speech_prob=0.45, avg_logprob=-0.5) is None
+    # Said with confidence it is speech, kept once
+    assert clean_segment(text, None, **SPEECH) == (" Thank you.", None)
+
+
+def test_loop_collapsed_to_one_occurrence():
+    words = [(0.0, 0.5, " I"), (0.5, 1.0, " think"), (1.0, 1.5, " no,"), (1.5, 2.0, " no,"),
+             (2.0, 2.5, " no,"), (2.5, 3.0, " no."), (3.0, 3.5, " Right.")]
+    text, kept = clean_segment("".join(w[2] for w in words), words, **SPEECH)
+    assert text == " I think no, Right."
+    assert kept == [words[0], words[1], words[2], words[6]]
+
+
+def test_loop_too_long_to_collapse_dropped_by_compression_ratio():
+    phrase = " and then we go back to the start of the whole thing again"  # longer than MAX_NGRAM
+    assert clean_segment(phrase * 4, None, **SPEECH) is None
+
+
+def test_repetition_filter_drops_consecutive_duplicates():
+    repeats = RepetitionFilter()
+    kept = repeats.filter([(0, 1, " Next item."), (1, 2, " next item"), (2, 3, " Done."), (3, 4, " Next item.")])
+    assert [segment[0] for segment in kept] == [0, 2, 3]
+    assert repeats.dropped == 1
@@ -0,0 +1,73 @@
+import pytest
+
+from api.services import wifi
+
+DOWN = {"connected": False, "ssid": None}
+UP = {"connected": True, "ssid": "Office"}
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """wifi with a fresh cache and a scripted OS status; returns the statuses listeners saw."""
+    monkeypatch.setattr(wifi, "_status", None)
+    monkeypatch.setattr(wifi, "_listeners", [])
+    monkeypatch.setattr(wifi, "_networks", [])
+    monkeypatch.setattr(wifi, "_scanned_at", 0.0)
+    monkeypatch.setattr(wifi, "_scan_wanted", wifi.threading.Event())
+    os_status = [DOWN]
+    monkeypatch.setattr(wifi, "wifi_status", lambda: dict(os_status[0]))
+    seen = []
+    wifi.add_status_listener(seen.append)
+    return os_status, seen
+
+
+def test_listeners_hear_only_changes(monitor):
+    os_status, seen = monitor
+
+    wifi.refresh_status()
+    wifi.refresh_status()
+    os_status[0] = UP
+    wifi.refresh_status()
+    wifi.refresh_status()
+    os_status[0] = {"connected": True, "ssid": "Guest"}
+    wifi.refresh_status()
+    os_status[0] = DOWN
+    wifi.refresh_status()
+
+    assert seen == [DOWN, UP, {"connected": True, "ssid": "Guest"}, DOWN]
+
+
+def test_a_failing_listener_does_not_stop_the_others(monitor):
+    os_status, seen = monitor
+    wifi._listeners.insert(0, lambda status: 1 / 0)
+    os_status[0] = UP
+
+    wifi.refresh_status()
+
+    assert seen == [UP]
+
+
+def test_cached_status_queries_the_os_only_when_nothing_is_cached(monitor):
+    os_status, _ = monitor
+    assert wifi.cached_status() == DOWN
+
+    os_status[0] = UP  # not seen until the monitor refreshes
+
+    assert wifi.cached_status() == DOWN
+    wifi.refresh_status()
+    assert wifi.cached_status() == UP
+
+
+def test_stale_scan_results_are_returned_while_a_rescan_is_requested(monitor, monkeypatch):
+    networks = [{"ssid": "Office", "signal": 70, "secure": True}]
+    monkeypatch.setattr(wifi, "_monitor_started", True)
+    monkeypatch.setattr(wifi, "_networks", networks)
+    monkeypatch.setattr(wifi, "_scanned_at", wifi.time.monotonic())
+
+    assert wifi.cached_scan() == networks
+    assert not wifi._scan_wanted.is_set()
+
+    monkeypatch.setattr(wifi, "_scanned_at", wifi.time.monotonic() - wifi.WIFI_SCAN_MAX_AGE_SECONDS - 1)
+
+    assert wifi.cached_scan() == networks
+    assert wifi._scan_wanted.is_set()
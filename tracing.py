@@ -0,0 +1,113 @@
+"""Timing spans for the recording -> notes pipeline.
+
+    with tracing.job(job_id):              # collects spans for one processing job
+        with tracing.span("stt.transcribe", audioSeconds=30):
+            ...
+
+Spans inside a job are handed to the sink (SQLite, registered by the API) when the job ends.
+Every span, in a job or not, also feeds in-process histograms exported in Prometheus text
+format. Thread pools don't inherit the current job: submit tracing.bind(fn) instead of fn.
+"""
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+# Histogram buckets (seconds) for span durations: from a DB write to a long Whisper tail
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+class Trace:
+    def __init__(self, job_id: str, meeting_id: str | None = None):
+        self.job_id = job_id
+        self.meeting_id = meeting_id
+        self.spans: list[dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, started_at: float, duration: float, attrs: dict) -> None:
+        with self._lock:
+            self.spans.append({"name": name, "startedAt": started_at, "durationMs": duration * 1000, "attrs": attrs})
+
+
+_current: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("trace", default=None)
+_sink: Optional[Callable[[Trace], None]] = None
+
+_metrics_lock = threading.Lock()
+_metrics: dict[str, list] = {}  # name -> [count, sum_seconds, per-bucket counts]
+
+
+def set_sink(sink: Callable[[Trace], None]) -> None:
+    """Called with each finished job's Trace (the API stores them in SQLite)."""
+    global _sink
+    _sink = sink
+
+
+def current() -> Optional[Trace]:
+    return _current.get()
+
+
+@contextmanager
+def job(job_id: str, meeting_id: str | None = None):
+    """Collect spans for job_id until the block exits, then pass them to the sink."""
+    trace = Trace(job_id, meeting_id)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        if _sink is not None and trace.spans:
+            try:
+                _sink(trace)
+            except Exception as e:
+                print(f"Could not store timings for {job_id}: {e}")
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the block; attrs can be added to (e.g. token counts) before it exits."""
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        duration = time.perf_counter() - start
+        _observe(name, duration)
+        trace = _current.get()
+        if trace is not None:
+            trace.add(name, started_at, duration, attrs)
+
+
+def bind(fn: Callable) -> Callable:
+    """fn wrapped to run in a copy of the current context (so pool threads see the job)."""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+def _observe(name: str, seconds: float) -> None:
+    with _metrics_lock:
+        entry = _metrics.get(name)
+        if entry is None:
+            entry = _metrics[name] = [0, 0.0, [0] * len(BUCKETS)]
+        entry[0] += 1
+        entry[1] += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                entry[2][i] += 1
+
+
+def prometheus_text() -> str:
+    """All span histograms since process start, in Prometheus text exposition format."""
+    with _metrics_lock:
+        snapshot = {name: (count, total, list(buckets)) for name, (count, total, buckets) in _metrics.items()}
+    lines = [
+        "# HELP safescribe_span_seconds Duration of pipeline stages.",
+        "# TYPE safescribe_span_seconds histogram",
+    ]
+    for name, (count, total, buckets) in sorted(snapshot.items()):
+        for bound, n in zip(BUCKETS, buckets):
+            lines.append(f'safescribe_span_seconds_bucket{{span="{name}",le="{bound}"}} {n}')
+        lines.append(f'safescribe_span_seconds_bucket{{span="{name}",le="+Inf"}} {count}')
+        lines.append(f'safescribe_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        lines.append(f'safescribe_span_seconds_count{{span="{name}"}} {count}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,109 @@
+"""Drop Whisper hallucinations before they reach the transcript (and every LLM prompt).
+
+On silence or noise Whisper emits boilerplate ("Thank you.", "Thanks for watching!") or loops
+on a phrase. Checks, cheapest first:
+
+- per segment, Whisper's own confidence: a segment it thinks is silence (high no_speech_prob
+  with a low avg_logprob) is dropped, and so is known silence boilerplate at a lower bar;
+- within a segment, a phrase of up to MAX_NGRAM words repeated back to back more than
+  MAX_REPEATS times is kept once; what is left is dropped if it still compresses like a loop;
+- across segments (RepetitionFilter), a segment repeating the previous one word for word.
+"""
+import re
+import zlib
+from typing import Optional
+
+NO_SPEECH_THRESHOLD = 0.6          # with LOGPROB_THRESHOLD: Whisper's own silence rule
+LOGPROB_THRESHOLD = -1.0
+BOILERPLATE_NO_SPEECH = 0.3        # boilerplate phrases are dropped from this no_speech_prob up
+COMPRESSION_RATIO_THRESHOLD = 2.4  # zlib ratio above which text is a loop (Whisper's default)
+MAX_NGRAM = 8
+MAX_REPEATS = 2                    # "no, no" is speech; a third time in a row is a loop
+
+BOILERPLATE = {
+    "thank you", "thanks", "thank you very much", "thank you so much", "thanks for watching",
+    "thank you for watching", "please subscribe", "subscribe to my channel", "bye", "you",
+    "subtitles by the amaraorg community", "ill see you next time", "see you next time",
+}
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_NON_WORD.sub("", text.lower()).split())
+
+
+def compression_ratio(text: str) -> float:
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data)) if data else 0.0
+
+
+def collapse_repeats(tokens: list[str]) -> list[int]:
+    """Indices of the tokens to keep once runs of a repeated phrase are cut to one occurrence."""
+    keys = [_normalize(t) for t in tokens]
+    keep = []
+    i = 0
+    while i < len(keys):
+        size, reps = _repeat_at(keys, i)
+        keep.extend(range(i, i + size))
+        i += size * reps
+    return keep
+
+
+def _repeat_at(keys: list[str], i: int) -> tuple[int, int]:
+    """(phrase length, times in a row) of the shortest phrase looping from keys[i], else (1, 1)."""
+    for size in range(1, min(MAX_NGRAM, len(keys) - i) + 1):
+        phrase = keys[i:i + size]
+        reps = 1
+        while keys[i + reps * size:i + (reps + 1) * size] == phrase:
+            reps += 1
+        if reps > MAX_REPEATS:
+            return size, reps
+    return 1, 1
+
+
+def clean_segment(
+    text: str, words: Optional[list], no_speech_prob: float, avg_logprob: float
+) -> Optional[tuple[str, Optional[list]]]:
+    """(text, words) of a Whisper segment with loops collapsed, or None to drop it.
+
+    words are (start, end, word) with Whisper's leading spaces, or None if not timestamped.
+    """
+    if no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOGPROB_THRESHOLD:
+        return None
+    if words:
+        keep = collapse_repeats([w[2] for w in words])
+        if len(keep) < len(words):
+            words = [words[i] for i in keep]
+            text = "".join(w[2] for w in words)
+    else:
+        tokens = text.split()
+        keep = collapse_repeats(tokens)
+        if len(keep) < len(tokens):
+            text = " " + " ".join(tokens[i] for i in keep)
+    if not text.strip() or compression_ratio(text) > COMPRESSION_RATIO_THRESHOLD:
+        return None
+    # After collapsing, so "Thank you. Thank you. Thank you." counts as the boilerplate it is
+    if no_speech_prob > BOILERPLATE_NO_SPEECH and _normalize(text) in BOILERPLATE:
+        return None
+    return text, words
+
+
+class RepetitionFilter:
+    """Drops segments repeating the previous one word for word (a loop spanning chunks)."""
+
+    def __init__(self):
+        self._last = ""
+        self.dropped = 0
+
+    def filter(self, segments: list) -> list:
+        """Segments as (start, end, text, ...); returns those kept, in order."""
+        kept = []
+        for segment in segments:
+            key = _normalize(segment[2])
+            if key and key == self._last:
+                self.dropped += 1
+                continue
+            self._last = key
+            kept.append(segment)
+        return kept